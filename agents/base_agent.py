@@ -3,13 +3,23 @@ Base agent class for all specialized agents
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from typing import Dict, Any, Tuple
 
 
 class BaseAgent(ABC):
-    """Abstract base class for security agents"""
+    """
+    Abstract base class for security agents
     
-    def __init__(self, name: str, memory_manager):
+    Subclasses declare the agents whose output they consume in ``depends_on``;
+    the orchestrator runs agents without a dependency path between them
+    concurrently. ``max_concurrency`` caps how many instances of an agent type
+    execute at once across all running investigations.
+    """
+    
+    depends_on: Tuple[str, ...] = ()
+    max_concurrency: int = 4
+    
+    def __init__(self, name: str, memory_manager=None):
         self.name = name
         self.memory = memory_manager
     
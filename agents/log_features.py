@@ -0,0 +1,309 @@
+"""
+Vectorized feature extraction over pages of log events
+"""
+
+import math
+import warnings
+from datetime import datetime, timezone
+from operator import itemgetter
+from typing import Dict, Any, AsyncIterator, List, Optional, Tuple
+
+import numpy as np
+
+_NAT = np.datetime64("NaT", "ms").astype(np.int64)
+# Beyond this, epoch milliseconds no longer fit a datetime64[ms]
+_MAX_EPOCH_MS = 2 ** 62
+
+
+def _get_all(documents: List[Any], key: str) -> List[Any]:
+    """``document[key]`` for each document, None where it is missing or not a dict"""
+    try:
+        return list(map(itemgetter(key), documents))
+    except (KeyError, TypeError, IndexError):
+        return [document.get(key) if isinstance(document, dict) else None for document in documents]
+
+
+def _column(documents: List[Dict[str, Any]], path: str) -> List[Any]:
+    """Values of a dotted field across flat or nested documents, None where missing"""
+    parts = path.split(".")
+    values = documents
+    # One C-level pass per path level while every document has the field
+    for part in parts:
+        values = _get_all(values, part)
+    if len(parts) > 1:
+        # Flattened documents keep the dotted name as a single key
+        for i in [i for i, value in enumerate(values) if value is None]:
+            values[i] = documents[i].get(path)
+    return values
+
+
+def _strings(values: List[Any]) -> np.ndarray:
+    """String column of the present, non-empty values"""
+    if None in values:
+        values = [value for value in values if value is not None]
+    column = np.asarray(values, dtype=str)
+    return column[column != ""]
+
+
+def _parse_iso(value: str) -> Optional[int]:
+    """Parse one ISO-8601 string to epoch milliseconds, treating naive times as UTC"""
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return int(parsed.timestamp() * 1000)
+
+
+def _parse_iso_column(texts: List[str]) -> np.ndarray:
+    """Parse ISO-8601 strings to epoch milliseconds, NaT where unparseable"""
+    # numpy parses naive ISO-8601; Elasticsearch timestamps are UTC with a Z suffix
+    stripped = [text[:-1] if text.endswith("Z") else text for text in texts]
+    try:
+        with warnings.catch_warnings():
+            # numpy only warns about explicit UTC offsets, then ignores them
+            warnings.simplefilter("error")
+            return np.asarray(stripped, dtype="datetime64[ms]").astype(np.int64)
+    except (ValueError, TypeError, UserWarning, DeprecationWarning):
+        return np.asarray(
+            [_NAT if ms is None else ms for ms in map(_parse_iso, texts)], dtype=np.int64
+        )
+
+
+def _parse_timestamps(values: List[Any]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Convert ISO-8601 strings and epoch milliseconds to int64 epoch milliseconds
+
+    Pages holding one form are converted as a whole; otherwise each element
+    is parsed by its own type, so a page may mix both forms.
+
+    Returns:
+        Tuple of (milliseconds, valid mask); missing or unparseable values
+        are masked out rather than given a placeholder time
+    """
+    kinds = set(map(type, values))
+    if kinds == {str} and not any(map(str.isdigit, values)):
+        parsed = _parse_iso_column(values)
+        return parsed, parsed != _NAT
+    if kinds == {int}:
+        try:
+            parsed = np.asarray(values, dtype=np.int64)
+        except OverflowError:
+            pass
+        else:
+            return parsed, (parsed > -_MAX_EPOCH_MS) & (parsed < _MAX_EPOCH_MS)
+
+    parsed = np.zeros(len(values), dtype=np.int64)
+    valid = np.zeros(len(values), dtype=bool)
+    strings = []
+    for i, value in enumerate(values):
+        if isinstance(value, str) and value.isdigit():
+            value = int(value)
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            if math.isfinite(value) and abs(value) < _MAX_EPOCH_MS:
+                parsed[i] = int(value)
+                valid[i] = True
+        elif isinstance(value, str) and value:
+            strings.append(i)
+    if not strings:
+        return parsed, valid
+
+    converted = _parse_iso_column([values[i] for i in strings])
+    index = np.asarray(strings)
+    parsed[index] = converted
+    valid[index] = converted != _NAT
+    return parsed, valid
+
+
+def _zscores(counts: np.ndarray) -> np.ndarray:
+    """Z-score of each count against the whole distribution"""
+    std = counts.std()
+    if std == 0:
+        return np.zeros(len(counts))
+    return (counts - counts.mean()) / std
+
+
+class _ValueCounts:
+    """
+    Per-value totals of a column fed page by page
+
+    Pages are kept as arrays and folded into sorted (values, totals) arrays
+    with one sort once ``merge_rows`` values are pending, so no per-value
+    work happens in Python and memory stays bounded.
+    """
+
+    def __init__(self, merge_rows: int = 1 << 18):
+        self.merge_rows = merge_rows
+        self._values: Optional[np.ndarray] = None
+        self._totals: Optional[np.ndarray] = None
+        self._pending: List[np.ndarray] = []
+        self._pending_rows = 0
+
+    def add(self, values: np.ndarray):
+        """Count every element of ``values``"""
+        if not len(values):
+            return
+        self._pending.append(values)
+        self._pending_rows += len(values)
+        if self._pending_rows >= self.merge_rows:
+            self._merge()
+
+    def _merge(self):
+        """Fold pending pages into the running totals"""
+        if not self._pending:
+            return
+        values = np.concatenate(self._pending)
+        weights = np.ones(len(values), dtype=np.int64)
+        if self._values is not None:
+            values = np.concatenate((self._values, values))
+            weights = np.concatenate((self._totals, weights))
+        order = np.argsort(values)
+        values, weights = values[order], weights[order]
+        # Sum the weights of each run of equal values
+        starts = np.concatenate(([0], np.flatnonzero(values[1:] != values[:-1]) + 1))
+        self._values, self._totals = values[starts], np.add.reduceat(weights, starts)
+        self._pending, self._pending_rows = [], 0
+
+    def totals(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Sorted distinct values and how often each occurred"""
+        self._merge()
+        if self._values is None:
+            return np.asarray([]), np.zeros(0, dtype=np.int64)
+        return self._values, self._totals
+
+
+class LogFeatureExtractor:
+    """
+    Turns log event pages into a compact statistical summary
+
+    Each needed field of a page is pulled into a NumPy column with one
+    comprehension per path level; counting, time bucketing and z-scores
+    then run vectorized, with per-value totals merged by sorting in
+    batches rather than per page. Fetch pages with ``source``
+    limited to the extracted fields to keep that pass cheap. The summary
+    (top and rare IPs/users, a time histogram and z-score anomaly flags) is
+    what gets stored in memory and placed in prompts, never the raw events.
+
+    Events without a usable timestamp are counted in ``missing_timestamps``.
+    The histogram spans at most ``max_buckets`` buckets, placed where most
+    events fall, so one stray timestamp decades away cannot blow it up;
+    events outside that window are counted in ``outside_window``.
+    """
+
+    def __init__(
+        self,
+        ip_field: str = "source.ip",
+        user_field: str = "user.name",
+        timestamp_field: str = "@timestamp",
+        bucket_seconds: int = 60,
+        top_k: int = 10,
+        rare_threshold: int = 1,
+        zscore_threshold: float = 3.0,
+        max_buckets: int = 1440,
+    ):
+        self.ip_field = ip_field
+        self.user_field = user_field
+        self.timestamp_field = timestamp_field
+        self.bucket_ms = bucket_seconds * 1000
+        self.top_k = top_k
+        self.rare_threshold = rare_threshold
+        self.zscore_threshold = zscore_threshold
+        self.max_buckets = max_buckets
+        self.event_count = 0
+        self.missing_timestamps = 0
+        self.ip_counts = _ValueCounts()
+        self.user_counts = _ValueCounts()
+        self.bucket_counts = _ValueCounts()
+
+    def add_page(self, events: List[Dict[str, Any]]):
+        """Add a page of events (Elasticsearch hits or plain documents)"""
+        if not events:
+            return
+        sources = _get_all(events, "_source")
+        if None in sources:
+            sources = [event.get("_source", event) for event in events]
+        timestamps, valid = _parse_timestamps(_column(sources, self.timestamp_field))
+
+        self.ip_counts.add(_strings(_column(sources, self.ip_field)))
+        self.user_counts.add(_strings(_column(sources, self.user_field)))
+        self.bucket_counts.add(timestamps[valid] // self.bucket_ms)
+        self.missing_timestamps += len(events) - int(valid.sum())
+        self.event_count += len(events)
+
+    async def consume(self, pages: AsyncIterator[List[Dict[str, Any]]]):
+        """Add every page from an async page iterator, e.g. ``search_pages``"""
+        async for page in pages:
+            self.add_page(page)
+
+    def _value_stats(self, counts: _ValueCounts) -> Dict[str, Any]:
+        """Top, rare and outlier values for one field"""
+        values, totals = counts.totals()
+        if not len(values):
+            return {"distinct": 0, "top": [], "rare": [], "outliers": []}
+        order = np.argsort(-totals, kind="stable")[:self.top_k]
+        rare = np.flatnonzero(totals <= self.rare_threshold)[:self.top_k]
+        outliers = np.flatnonzero(_zscores(totals) > self.zscore_threshold)
+        outliers = outliers[np.argsort(-totals[outliers], kind="stable")][:self.top_k]
+        return {
+            "distinct": len(values),
+            "top": [{"value": str(values[i]), "count": int(totals[i])} for i in order],
+            "rare": [str(values[i]) for i in rare],
+            "outliers": [{"value": str(values[i]), "count": int(totals[i])} for i in outliers],
+        }
+
+    def _window(self, buckets: np.ndarray, counts: np.ndarray) -> Tuple[int, int]:
+        """Index range of sorted buckets for the ``max_buckets`` span holding most events"""
+        # Events in the span ending at each bucket, from prefix sums
+        prefix = np.concatenate(([0], np.cumsum(counts)))
+        starts = np.searchsorted(buckets, buckets - self.max_buckets + 1)
+        totals = prefix[1:] - prefix[starts]
+        # Latest span wins ties, as recent activity matters most
+        end = len(totals) - 1 - int(np.argmax(totals[::-1]))
+        return int(starts[end]), end
+
+    def _histogram(self) -> Dict[str, Any]:
+        """Dense time histogram with z-score spike detection"""
+        buckets, counts = self.bucket_counts.totals()
+        if not len(buckets):
+            return {
+                "bucket_seconds": self.bucket_ms // 1000,
+                "counts": [],
+                "anomalies": [],
+                "outside_window": 0,
+                "missing_timestamps": self.missing_timestamps,
+            }
+        low, high = self._window(buckets, counts)
+        first = int(buckets[low])
+        dense = np.zeros(int(buckets[high]) - first + 1, dtype=np.int64)
+        dense[buckets[low:high + 1] - first] = counts[low:high + 1]
+        spikes = np.flatnonzero(_zscores(dense) > self.zscore_threshold)
+        return {
+            "bucket_seconds": self.bucket_ms // 1000,
+            "start": self._iso(first * self.bucket_ms),
+            "counts": dense.tolist(),
+            "outside_window": int(counts.sum() - dense.sum()),
+            "missing_timestamps": self.missing_timestamps,
+            "anomalies": [
+                {"start": self._iso((first + int(i)) * self.bucket_ms), "count": int(dense[i])}
+                for i in spikes
+            ],
+        }
+
+    @staticmethod
+    def _iso(epoch_ms: int) -> str:
+        """Format epoch milliseconds as an ISO-8601 UTC string"""
+        return str(np.datetime64(epoch_ms, "ms")) + "Z"
+
+    def summary(self) -> Dict[str, Any]:
+        """Compact summary suitable for memory storage and prompts"""
+        return {
+            "event_count": self.event_count,
+            "ips": self._value_stats(self.ip_counts),
+            "users": self._value_stats(self.user_counts),
+            "timeline": self._histogram(),
+        }
+
+    def as_finding(self, agent: str, query: Optional[str] = None) -> Dict[str, Any]:
+        """Wrap the summary as a finding for ``store_finding``"""
+        return {"type": "log_summary", "agent": agent, "query": query, "summary": self.summary()}
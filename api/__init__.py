@@ -0,0 +1 @@
+"""HTTP API for submitting and following investigations"""
\ No newline at end of file
@@ -0,0 +1,54 @@
+"""
+FastAPI application for The Warden V2
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI
+
+from api.routes import investigations, reports
+from config.settings import install_reload_handler
+from core.work_queue import RedisStreamWorkQueue
+from memory.context_cache import CachedMemoryStore
+from memory.events import EventBroker
+from memory.redis_store import close_async_pool
+from reports.builder import ReportBuilder
+from reports.formatters.pdf import PDFJobQueue
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create shared clients on startup and release them on shutdown"""
+    install_reload_handler(asyncio.get_running_loop())
+    app.state.queue = RedisStreamWorkQueue()
+    app.state.memory = CachedMemoryStore()
+    app.state.events = EventBroker()
+    app.state.reports = ReportBuilder()
+    app.state.pdf = PDFJobQueue()
+    await app.state.memory.start()
+    await app.state.events.start()
+    await app.state.pdf.start()
+    try:
+        yield
+    finally:
+        await app.state.pdf.stop()
+        await app.state.events.stop()
+        await app.state.memory.stop()
+        await close_async_pool()
+
+
+def create_app() -> FastAPI:
+    """
+    Build the API application
+
+    Investigations are only enqueued here; worker processes run them and
+    publish progress, which the API relays to clients over SSE or WebSocket.
+    """
+    app = FastAPI(title="The Warden V2", lifespan=lifespan)
+    app.include_router(investigations.router)
+    app.include_router(reports.router)
+    return app
+
+
+app = create_app()
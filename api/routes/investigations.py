@@ -0,0 +1,138 @@
+"""
+Investigation submission, status and progress streaming endpoints
+"""
+
+import asyncio
+import json
+import uuid
+from typing import Dict, Any, AsyncIterator, Optional
+
+from fastapi import APIRouter, Header, HTTPException, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+
+from config.settings import settings
+from core.work_queue import validate_payload
+
+router = APIRouter(prefix="/investigations", tags=["investigations"])
+
+
+class InvestigationRequest(BaseModel):
+    """An investigation query, optionally with the raw alert that triggered it"""
+
+    query: str
+    alert: Dict[str, Any] = Field(default_factory=dict)
+
+
+async def _with_heartbeats(
+    events: AsyncIterator[Dict[str, Any]], interval: float
+) -> AsyncIterator[Optional[Dict[str, Any]]]:
+    """Yield events, or None whenever ``interval`` seconds pass without one"""
+    pending: Optional[asyncio.Future] = None
+    try:
+        while True:
+            if pending is None:
+                pending = asyncio.ensure_future(events.__anext__())
+            done, _ = await asyncio.wait({pending}, timeout=interval)
+            if not done:
+                yield None
+                continue
+            try:
+                event = pending.result()
+            except StopAsyncIteration:
+                return
+            pending = None
+            yield event
+    finally:
+        if pending is not None:
+            pending.cancel()
+        await events.aclose()
+
+
+@router.post("", status_code=202)
+async def submit_investigation(body: InvestigationRequest, request: Request) -> Dict[str, Any]:
+    """Queue an investigation and return where to follow its progress"""
+    investigation_id = uuid.uuid4().hex
+    payload = {**body.alert, "query": body.query, "investigation_id": investigation_id}
+    try:
+        validate_payload(payload)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    events = request.app.state.events
+    # Published first: a worker can take the job and report progress before put() returns
+    await events.publish(investigation_id, "status", {"status": "queued"})
+    try:
+        job_id = await asyncio.wait_for(
+            request.app.state.queue.put(payload), settings.api_enqueue_timeout
+        )
+    except asyncio.TimeoutError:
+        await events.publish(
+            investigation_id, "status", {"status": "failed", "error": "Investigation queue is full"}
+        )
+        raise HTTPException(status_code=503, detail="Investigation queue is full")
+
+    return {
+        "investigation_id": investigation_id,
+        "job_id": job_id,
+        "events": f"{router.prefix}/{investigation_id}/events",
+    }
+
+
+@router.get("/{investigation_id}")
+async def get_investigation(investigation_id: str, request: Request) -> Dict[str, Any]:
+    """Investigation status and finding summary"""
+    memory = request.app.state.memory
+    metadata = await memory.get_metadata(investigation_id)
+    if not metadata:
+        raise HTTPException(status_code=404, detail="Investigation not found")
+    return {
+        "investigation_id": investigation_id,
+        "metadata": metadata,
+        "summary": await memory.get_summary(investigation_id),
+    }
+
+
+@router.get("/{investigation_id}/events")
+async def stream_events(
+    investigation_id: str,
+    request: Request,
+    last_event_id: Optional[str] = Header(None),
+) -> StreamingResponse:
+    """
+    Server-Sent Events stream of investigation progress
+
+    Replays stored events, then streams live ones until the investigation
+    completes. Reconnecting clients resume after ``Last-Event-ID``.
+    """
+    events = request.app.state.events.subscribe(investigation_id, last_event_id)
+
+    async def body():
+        async for event in _with_heartbeats(events, settings.api_heartbeat_interval):
+            if event is None:
+                yield ": keep-alive\n\n"
+                continue
+            data = json.dumps(event["data"], separators=(",", ":"))
+            yield f"id: {event['id']}\nevent: {event['type']}\ndata: {data}\n\n"
+
+    return StreamingResponse(
+        body(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.websocket("/{investigation_id}/ws")
+async def websocket_events(
+    websocket: WebSocket, investigation_id: str, last_event_id: Optional[str] = None
+):
+    """WebSocket stream of investigation progress, one JSON message per event"""
+    await websocket.accept()
+    events = websocket.app.state.events.subscribe(investigation_id, last_event_id)
+    try:
+        async for event in events:
+            await websocket.send_json(event)
+    except WebSocketDisconnect:
+        return
+    finally:
+        await events.aclose()
+    await websocket.close()
@@ -0,0 +1,80 @@
+"""
+Investigation report endpoints
+"""
+
+import asyncio
+import os
+from typing import Dict, Any
+
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import FileResponse, StreamingResponse
+
+router = APIRouter(tags=["reports"])
+
+MEDIA_TYPES = {"markdown": "text/markdown; charset=utf-8", "html": "text/html; charset=utf-8"}
+
+
+async def _collect(request: Request, investigation_id: str) -> Dict[str, Any]:
+    """Report data for an investigation, or 404"""
+    report = await request.app.state.reports.collect(request.app.state.memory, investigation_id)
+    if report is None:
+        raise HTTPException(status_code=404, detail="Investigation not found")
+    return report
+
+
+@router.get("/investigations/{investigation_id}/report")
+async def get_report(
+    investigation_id: str,
+    request: Request,
+    fmt: str = Query("markdown", alias="format", pattern="^(markdown|html)$"),
+) -> StreamingResponse:
+    """Stream a Markdown or HTML report"""
+    report = await _collect(request, investigation_id)
+    # A sync iterator: Starlette renders it in its threadpool, off the event loop
+    return StreamingResponse(
+        request.app.state.reports.stream(report, fmt), media_type=MEDIA_TYPES[fmt]
+    )
+
+
+@router.post("/investigations/{investigation_id}/report/pdf", status_code=202)
+async def submit_pdf_report(investigation_id: str, request: Request) -> Dict[str, Any]:
+    """Queue a PDF report, or reuse one for unchanged content, and return where to poll for it"""
+    builder, pdf = request.app.state.reports, request.app.state.pdf
+    report = await _collect(request, investigation_id)
+    key = builder.fingerprint(report)
+    job = pdf.lookup(key)
+    if job is None:
+        html = await asyncio.to_thread(builder.render, report, "html")
+        try:
+            job = pdf.submit(investigation_id, html, key=key)
+        except asyncio.QueueFull:
+            raise HTTPException(status_code=503, detail="PDF queue is full")
+    return {"job_id": job.id, "status": job.status, "poll": f"/reports/{job.id}"}
+
+
+@router.get("/reports/{job_id}")
+async def get_pdf_job(job_id: str, request: Request) -> Dict[str, Any]:
+    """PDF job status"""
+    job = request.app.state.pdf.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Report job not found")
+    status = {
+        "job_id": job.id,
+        "investigation_id": job.investigation_id,
+        "status": job.status,
+        "error": job.error,
+    }
+    if job.status == "completed":
+        status["download"] = f"/reports/{job.id}/pdf"
+    return status
+
+
+@router.get("/reports/{job_id}/pdf")
+async def download_pdf(job_id: str, request: Request) -> FileResponse:
+    """Download a finished PDF report"""
+    job = request.app.state.pdf.get(job_id)
+    if job is None or job.status != "completed" or not os.path.exists(job.path):
+        raise HTTPException(status_code=404, detail="Report not available")
+    return FileResponse(
+        job.path, media_type="application/pdf", filename=f"{job.investigation_id}.pdf"
+    )
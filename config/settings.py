@@ -1,37 +1,343 @@
 """
 Centralized configuration management using Pydantic Settings
+
+Configuration is read from ``.env`` and the environment on first access,
+not at import time, and held as an immutable snapshot. ``get_settings``
+returns the current snapshot and the module-level ``settings`` reads
+through to it. Worker processes receive the parent's snapshot via
+``configure`` instead of re-parsing, and ``install_reload_handler`` swaps
+in a freshly validated snapshot on SIGHUP. Objects that sized pools or
+queues from the old snapshot keep them; values read per call, such as
+timeouts and intervals, follow the reload.
 """
 
+import logging
+import signal
+import threading
+from functools import cached_property
+from typing import Callable, Dict, List, Optional
+
+from pydantic import BaseModel, ConfigDict, NonNegativeInt, PositiveFloat, PositiveInt
+from pydantic import model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+logger = logging.getLogger(__name__)
+
+
+class PoolSettings(BaseModel):
+    """Connection and process pool sizes"""
+
+    model_config = ConfigDict(frozen=True)
+
+    redis_connections: PositiveInt
+    intel_connections: PositiveInt
+    intel_keepalive: NonNegativeInt
+    worker_processes: PositiveInt
+    mcp_tool_processes: PositiveInt
+    report_pdf_processes: PositiveInt
+
+
+class CacheTTLSettings(BaseModel):
+    """Cache lifetimes in seconds"""
+
+    model_config = ConfigDict(frozen=True)
+
+    llm_response: PositiveInt
+    intel: PositiveInt
+    intel_negative: PositiveInt
+    intel_stale: NonNegativeInt
+    context: PositiveFloat
+    mcp_tool: PositiveFloat
+    report_fragment: PositiveFloat
+    report_job: PositiveFloat
+
+
+class ConcurrencySettings(BaseModel):
+    """In-flight work and queue bounds"""
+
+    model_config = ConfigDict(frozen=True)
+
+    llm_in_flight: PositiveInt
+    llm_queued: PositiveInt
+    worker_investigations: PositiveInt
+    intel_bulk: PositiveInt
+    queue_backlog: PositiveInt
+    api_event_queue: PositiveInt
+    report_pdf_queue: PositiveInt
+
 
 class Settings(BaseSettings):
-    """Application settings"""
+    """
+    Application settings
+
+    Fields stay flat so each maps to one environment variable; ``pools``,
+    ``ttls`` and ``concurrency`` group the performance limits into typed,
+    validated sections. Instances are frozen and picklable.
+    """
     
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
-        case_sensitive=False
+        case_sensitive=False,
+        frozen=True,
     )
     
     # LLM Configuration
     ollama_base_url: str = "http://localhost:11434"
     ollama_model: str = "llama3.2:latest"
+    ollama_embed_model: str = "nomic-embed-text"
+    ollama_timeout: float = 120.0
+    
+    # LLM gateway
+    llm_max_in_flight: int = 2
+    llm_max_queued: int = 256
+    llm_embed_batch_size: int = 32
+    llm_embed_batch_wait_ms: int = 10
+    
+    # LLM response cache
+    llm_cache_ttl: int = 86400
+    llm_cache_max_entries: int = 50000
+    llm_semantic_cache_enabled: bool = False
+    llm_semantic_threshold: float = 0.95
+    llm_semantic_max_entries: int = 2000
+    
+    # LLM prompt context
+    llm_context_budget: int = 2000
+    llm_context_recent_events: int = 20
+    llm_context_segment_size: int = 50
     
     # Redis
     redis_host: str = "localhost"
     redis_port: int = 6379
     redis_db: int = 0
     redis_password: str = ""
+    redis_pool_size: int = 50
+    redis_pool_timeout: float = 10.0
+    redis_socket_timeout: float = 5.0
+    
+    # Serialization of stored findings and timeline events
+    memory_codec: str = "json"
+    memory_compress_threshold: int = 0
+    memory_compress_level: int = 3
+    
+    # Archive of idle investigations on disk
+    archive_enabled: bool = True
+    archive_dir: str = "data/archive"
+    archive_idle_seconds: int = 86400
+    archive_sweep_interval: float = 300.0
+    archive_batch_size: int = 50
+    archive_segment_size: int = 67108864
+    
+    # Local context cache in front of Redis
+    context_cache_size: int = 1024
+    context_cache_ttl: float = 30.0
+    
+    # Alert work queue
+    queue_stream: str = "warden:alerts"
+    queue_group: str = "warden-workers"
+    queue_max_backlog: int = 10000
+    queue_max_retries: int = 3
+    queue_claim_idle_ms: int = 300000
+    worker_concurrency: int = 8
+    worker_processes: int = 1
+    
+    # Alert deduplication
+    dedup_key_fields: List[str] = ["source_ip", "rule", "host"]
+    dedup_window_seconds: int = 10
+    dedup_local_cache_size: int = 10000
+    
+    # Elasticsearch
+    elastic_host: str = "localhost"
+    elastic_port: int = 9200
+    elastic_username: str = "elastic"
+    elastic_password: str = ""
+    elastic_timeout: float = 30.0
+    elastic_page_size: int = 1000
+    elastic_pit_keep_alive: str = "1m"
+    
+    # Threat intel
+    abuseipdb_api_key: str = ""
+    threatfox_api_key: str = ""
+    intel_timeout: float = 5.0
+    intel_max_connections: int = 100
+    intel_max_keepalive: int = 20
+    intel_cache_ttl: int = 3600
+    intel_cache_ttls: Dict[str, int] = {"abuseipdb": 21600, "threatfox": 3600}
+    intel_negative_ttl: int = 300
+    intel_stale_ttl: int = 900
+    intel_local_cache_size: int = 10000
+    intel_rate_limit: PositiveFloat = 10.0
+    intel_rate_limits: Dict[str, PositiveFloat] = {"abuseipdb": 1.0, "threatfox": 5.0}
+    intel_bulk_concurrency: int = 50
+    feed_index_dir: str = "data/feeds"
+    feed_index_refresh_interval: float = 30.0
     
     # API
     api_host: str = "0.0.0.0"
     api_port: int = 8000
+    api_enqueue_timeout: float = 1.0
+    api_event_queue_size: int = 1000
+    api_heartbeat_interval: float = 15.0
+    
+    # Investigation progress events kept per investigation for replay
+    events_max_length: int = 1000
+    
+    # MCP tool runtime
+    mcp_tool_processes: int = 2
+    mcp_tool_cache_size: int = 4096
+    mcp_tool_cache_ttl: float = 300.0
+    
+    # Reports
+    report_dir: str = "data/reports"
+    report_max_findings: int = 50
+    report_scan_findings: int = 1000
+    report_timeline_events: int = 200
+    report_fragment_cache_size: int = 2048
+    report_fragment_ttl: float = 3600.0
+    report_pdf_processes: int = 2
+    report_pdf_queue_size: int = 100
+    report_job_ttl: float = 3600.0
     
     # Logging
     log_level: str = "INFO"
     log_file: str = "logs/warden.log"
+    
+    @cached_property
+    def pools(self) -> PoolSettings:
+        """Connection and process pool sizes"""
+        return PoolSettings(
+            redis_connections=self.redis_pool_size,
+            intel_connections=self.intel_max_connections,
+            intel_keepalive=self.intel_max_keepalive,
+            worker_processes=self.worker_processes,
+            mcp_tool_processes=self.mcp_tool_processes,
+            report_pdf_processes=self.report_pdf_processes,
+        )
+    
+    @cached_property
+    def ttls(self) -> CacheTTLSettings:
+        """Cache lifetimes in seconds"""
+        return CacheTTLSettings(
+            llm_response=self.llm_cache_ttl,
+            intel=self.intel_cache_ttl,
+            intel_negative=self.intel_negative_ttl,
+            intel_stale=self.intel_stale_ttl,
+            context=self.context_cache_ttl,
+            mcp_tool=self.mcp_tool_cache_ttl,
+            report_fragment=self.report_fragment_ttl,
+            report_job=self.report_job_ttl,
+        )
+    
+    @cached_property
+    def concurrency(self) -> ConcurrencySettings:
+        """In-flight work and queue bounds"""
+        return ConcurrencySettings(
+            llm_in_flight=self.llm_max_in_flight,
+            llm_queued=self.llm_max_queued,
+            worker_investigations=self.worker_concurrency,
+            intel_bulk=self.intel_bulk_concurrency,
+            queue_backlog=self.queue_max_backlog,
+            api_event_queue=self.api_event_queue_size,
+            report_pdf_queue=self.report_pdf_queue_size,
+        )
+    
+    @model_validator(mode="after")
+    def _validate_sections(self) -> "Settings":
+        # Build the sections up front so invalid limits fail at load, not on first use
+        _ = (self.pools, self.ttls, self.concurrency)
+        return self
+
+
+_current: Optional[Settings] = None
+# Reentrant: a plain SIGHUP handler reloads on whichever frame it interrupts,
+# which may be inside _load holding the lock
+_lock = threading.RLock()
+
+
+def get_settings() -> Settings:
+    """Current settings snapshot, loaded on first call"""
+    current = _current
+    if current is None:
+        current = _load()
+    return current
+
+
+def _load() -> Settings:
+    """Load settings once, even if several threads ask at the same time"""
+    global _current
+    with _lock:
+        if _current is None:
+            _current = Settings()
+        return _current
+
+
+def configure(snapshot: Settings):
+    """Install an already-loaded snapshot, e.g. one handed to a worker process"""
+    global _current
+    with _lock:
+        _current = snapshot
+
+
+def reload_settings() -> Settings:
+    """
+    Re-read ``.env`` and the environment and swap in the new snapshot
+
+    Raises:
+        pydantic.ValidationError: The new configuration is invalid; the
+            current snapshot stays in place
+    """
+    snapshot = Settings()
+    configure(snapshot)
+    logger.info("Settings reloaded")
+    return snapshot
+
+
+def install_reload_handler(
+    loop=None, on_reload: Optional[Callable[[Settings], None]] = None
+) -> bool:
+    """
+    Reload settings whenever the process receives SIGHUP
+
+    Args:
+        loop: Event loop to handle the signal on; without one a plain
+            signal handler is installed, which must be done from the main thread
+        on_reload: Called with the new snapshot after a successful reload
+
+    Returns:
+        False on platforms without SIGHUP
+    """
+    sighup = getattr(signal, "SIGHUP", None)
+    if sighup is None:
+        return False
+
+    def reload(*_):
+        try:
+            snapshot = reload_settings()
+        except Exception:
+            logger.exception("Settings reload failed, keeping the current settings")
+            return
+        if on_reload is not None:
+            on_reload(snapshot)
+
+    if loop is not None:
+        loop.add_signal_handler(sighup, reload)
+    else:
+        signal.signal(sighup, reload)
+    return True
+
+
+class _SettingsProxy:
+    """Reads attributes from the current snapshot, loading it on first use"""
+
+    __slots__ = ()
+
+    # __getattribute__ rather than __getattr__: skips the failed normal lookup first
+    def __getattribute__(self, name: str):
+        return getattr(get_settings(), name)
+
+    def __repr__(self) -> str:
+        return repr(get_settings())
 
 
-# Global settings instance
-settings = Settings()
+# Global settings access; prefer ``get_settings()`` to read several values consistently
+settings = _SettingsProxy()
@@ -0,0 +1,105 @@
+"""
+Alert deduplication and coalescing before investigations start
+"""
+
+import hashlib
+import json
+from typing import Dict, Any, Optional, List
+
+import redis.asyncio as aioredis
+
+from config.settings import settings
+from memory.redis_store import get_async_pool
+from utils.cache import LRUTTLCache
+
+
+DEDUP_KEY = "dedup:{fingerprint}"
+
+# Deletes a claim only if it still belongs to the given investigation
+RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+class AlertDeduplicator:
+    """
+    Maps alert fingerprints to the investigation already handling them
+
+    The first alert with a given fingerprint claims it in Redis with
+    ``SET NX EX``, so every worker shares one index and entries expire with
+    the dedup window. A bounded local LRU answers repeat duplicates without
+    a round trip. A claim whose investigation fails is released, so the
+    next matching alert starts a fresh investigation; other workers may
+    still coalesce onto the failed one until their local entry expires.
+    """
+
+    def __init__(
+        self,
+        key_fields: Optional[List[str]] = None,
+        window_seconds: Optional[int] = None,
+        local_cache_size: Optional[int] = None,
+        client: Optional[aioredis.Redis] = None,
+    ):
+        self.key_fields = key_fields or settings.dedup_key_fields
+        self.window_seconds = window_seconds or settings.dedup_window_seconds
+        self.client = client or aioredis.Redis(connection_pool=get_async_pool())
+        self.local = LRUTTLCache(
+            max_size=local_cache_size or settings.dedup_local_cache_size,
+            ttl=self.window_seconds,
+        )
+        self._release_script = self.client.register_script(RELEASE_SCRIPT)
+        self.duplicates = 0
+
+    def fingerprint(self, alert: Dict[str, Any]) -> Optional[str]:
+        """Hash the configured key fields, or None if the alert has none of them"""
+        values = [alert.get(field) for field in self.key_fields]
+        if all(value is None for value in values):
+            return None
+        encoded = json.dumps(values, sort_keys=True, default=str).encode()
+        return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+    async def claim(self, alert: Dict[str, Any], investigation_id: str) -> Optional[str]:
+        """
+        Claim an alert's fingerprint for a new investigation
+
+        Args:
+            alert: Incoming alert
+            investigation_id: ID the new investigation would use
+
+        Returns:
+            ID of the investigation already covering this alert, or None if
+            the caller should start ``investigation_id``
+        """
+        fingerprint = self.fingerprint(alert)
+        if fingerprint is None:
+            return None
+
+        existing = self.local.get(fingerprint)
+        if existing is None:
+            key = DEDUP_KEY.format(fingerprint=fingerprint)
+            async with self.client.pipeline(transaction=False) as pipe:
+                pipe.set(key, investigation_id, nx=True, ex=self.window_seconds)
+                pipe.get(key)
+                pipe.pttl(key)
+                _, existing, ttl_ms = await pipe.execute()
+            # Expire the local entry together with the shared one
+            if existing is not None and ttl_ms > 0:
+                self.local.set(fingerprint, existing, ttl=ttl_ms / 1000)
+
+        if existing is None or existing == investigation_id:
+            return None
+        self.duplicates += 1
+        return existing
+
+    async def release(self, alert: Dict[str, Any], investigation_id: str):
+        """Drop an alert's claim if ``investigation_id`` still holds it"""
+        fingerprint = self.fingerprint(alert)
+        if fingerprint is None:
+            return
+        self.local.pop(fingerprint)
+        await self._release_script(
+            keys=[DEDUP_KEY.format(fingerprint=fingerprint)], args=[investigation_id]
+        )
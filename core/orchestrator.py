@@ -2,7 +2,15 @@
 Main orchestration engine for The Warden V2
 """
 
-from typing import Dict, Any
+import asyncio
+import time
+import uuid
+from typing import Dict, Any, Optional
+
+from agents.base_agent import BaseAgent
+from core.scheduler import AgentScheduler
+from memory.context_cache import CachedMemoryStore
+from memory.redis_store import close_async_pool
 
 
 class Orchestrator:
@@ -10,24 +18,86 @@ class Orchestrator:
     Main orchestrator that coordinates agents, memory, and tools
     
     TODO: Implement LangGraph workflow
-    TODO: Add agent coordination
-    TODO: Integrate memory manager
     """
     
-    def __init__(self):
-        self.agents = {}
-        self.memory = None
+    def __init__(self, memory: Optional[CachedMemoryStore] = None):
+        self.agents: Dict[str, BaseAgent] = {}
+        # Defaults to a cached store on the process-wide pool shared with every agent
+        self.memory = memory or CachedMemoryStore()
         self.mcp_servers = {}
+        self.scheduler = AgentScheduler()
+        self._archiver: Optional[asyncio.Task] = None
+    
+    def register_agent(self, agent: BaseAgent):
+        """Register an agent, handing it the shared memory store if it has none"""
+        if agent.memory is None:
+            agent.memory = self.memory
+        self.agents[agent.name] = agent
+    
+    async def start(self):
+        """Start background services such as cache invalidation and archiving"""
+        await self.memory.start()
+        if self.memory.archive is not None and self._archiver is None:
+            # Every process runs a sweeper; a Redis lock lets one sweep at a time
+            self._archiver = asyncio.create_task(self.memory.run_archiver())
+    
+    async def close(self):
+        """Stop background services and release the shared Redis connection pool"""
+        if self._archiver is not None:
+            self._archiver.cancel()
+            await asyncio.gather(self._archiver, return_exceptions=True)
+            self._archiver = None
+        await self.memory.stop()
+        await close_async_pool()
     
-    async def investigate(self, query: str) -> Dict[str, Any]:
+    async def investigate(
+        self, query: str, investigation_id: Optional[str] = None
+    ) -> Dict[str, Any]:
         """
         Run an investigation based on the query
         
         Args:
             query: Investigation query or alert
+            investigation_id: Optional ID to use instead of a generated one
             
         Returns:
             Investigation results and report
         """
-        # TODO: Implement investigation workflow
-        raise NotImplementedError("Coming soon!")
+        investigation_id = investigation_id or uuid.uuid4().hex
+        started_at = time.time()
+        await self.memory.set_metadata(investigation_id, {
+            "query": query,
+            "status": "running",
+            "started_at": started_at,
+        })
+        
+        await self.memory.publish_event(investigation_id, "status", {"status": "running"})
+        
+        async def progress(agent: str, status: str):
+            await self.memory.publish_event(
+                investigation_id, "agent", {"agent": agent, "status": status}
+            )
+        
+        context = {"investigation_id": investigation_id, "query": query}
+        try:
+            results = await self.scheduler.run(self.agents, context, progress)
+        except Exception as e:
+            await self.memory.set_metadata(investigation_id, {"status": "failed"})
+            await self.memory.publish_event(
+                investigation_id, "status", {"status": "failed", "error": repr(e)}
+            )
+            raise
+        
+        duration = time.time() - started_at
+        await self.memory.set_metadata(investigation_id, {
+            "status": "completed",
+            "duration": duration,
+        })
+        await self.memory.publish_event(
+            investigation_id, "status", {"status": "completed", "duration": duration}
+        )
+        return {
+            "investigation_id": investigation_id,
+            "query": query,
+            "results": results,
+        }
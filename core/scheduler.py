@@ -0,0 +1,99 @@
+"""
+Dependency-aware parallel scheduler for investigation agents
+"""
+
+import asyncio
+from typing import Dict, Any, Awaitable, Callable, List, Optional
+
+from agents.base_agent import BaseAgent
+
+# Called with (agent name, status) as each agent starts and finishes
+ProgressCallback = Callable[[str, str], Awaitable[None]]
+
+
+class AgentScheduler:
+    """
+    Runs agents as a DAG built from their ``depends_on`` declarations
+
+    Each agent starts as soon as its upstream agents finish, so wall-clock
+    time per investigation tracks the critical path rather than the sum of
+    agent run times. A semaphore per agent type, shared across investigations,
+    bounds how many instances of that type run at once.
+    """
+
+    def __init__(self):
+        self._semaphores: Dict[type, asyncio.Semaphore] = {}
+
+    def plan(self, agents: Dict[str, BaseAgent]) -> List[str]:
+        """Return agent names in dependency order, rejecting unknown deps and cycles"""
+        order: List[str] = []
+        state: Dict[str, str] = {}
+
+        def visit(name: str, path: List[str]):
+            if state.get(name) == "done":
+                return
+            if state.get(name) == "visiting":
+                raise ValueError(f"Agent dependency cycle: {' -> '.join(path + [name])}")
+            state[name] = "visiting"
+            for dep in agents[name].depends_on:
+                if dep not in agents:
+                    raise ValueError(f"Agent '{name}' depends on unregistered agent '{dep}'")
+                visit(dep, path + [name])
+            state[name] = "done"
+            order.append(name)
+
+        for name in agents:
+            visit(name, [])
+        return order
+
+    def _semaphore(self, agent: BaseAgent) -> asyncio.Semaphore:
+        """Return the concurrency limit shared by all agents of the same type"""
+        agent_type = type(agent)
+        if agent_type not in self._semaphores:
+            self._semaphores[agent_type] = asyncio.Semaphore(agent.max_concurrency)
+        return self._semaphores[agent_type]
+
+    async def run(
+        self,
+        agents: Dict[str, BaseAgent],
+        context: Dict[str, Any],
+        progress: Optional[ProgressCallback] = None,
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Execute every agent once for an investigation
+
+        Args:
+            agents: Registered agents keyed by name
+            context: Base investigation context passed to every agent
+            progress: Optional callback notified as each agent starts and finishes
+
+        Returns:
+            Agent outputs keyed by agent name
+        """
+        tasks: Dict[str, asyncio.Task] = {}
+        async with asyncio.TaskGroup() as group:
+            # Dependency order guarantees upstream tasks exist before their consumers
+            for name in self.plan(agents):
+                agent = agents[name]
+                upstream = {dep: tasks[dep] for dep in agent.depends_on}
+                tasks[name] = group.create_task(
+                    self._run_agent(agent, upstream, context, progress)
+                )
+        return {name: task.result() for name, task in tasks.items()}
+
+    async def _run_agent(
+        self,
+        agent: BaseAgent,
+        upstream: Dict[str, asyncio.Task],
+        context: Dict[str, Any],
+        progress: Optional[ProgressCallback] = None,
+    ) -> Dict[str, Any]:
+        """Wait for upstream results, then execute the agent under its type limit"""
+        results = {dep: await task for dep, task in upstream.items()}
+        async with self._semaphore(agent):
+            if progress is not None:
+                await progress(agent.name, "started")
+            result = await agent.execute({**context, "upstream": results})
+        if progress is not None:
+            await progress(agent.name, "completed")
+        return result
@@ -0,0 +1,507 @@
+"""
+Alert ingestion queue and worker pool feeding the orchestrator
+"""
+
+import asyncio
+import json
+import logging
+import multiprocessing
+import multiprocessing.connection
+import os
+import signal
+import socket
+import time
+import uuid
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Dict, Any, Awaitable, Optional, List
+
+import redis.asyncio as aioredis
+from redis.exceptions import ResponseError
+
+from config.settings import (
+    Settings,
+    configure,
+    get_settings,
+    install_reload_handler,
+    settings,
+)
+from core.dedup import AlertDeduplicator
+from memory.redis_store import get_async_pool
+
+logger = logging.getLogger(__name__)
+
+# Longest wait between attempts to reach the queue after an error
+MAX_QUEUE_BACKOFF = 30.0
+
+# Pause before replacing a worker process that exited, so a crash loop does not spin
+WORKER_RESTART_DELAY = 1.0
+
+# Appends a job unless the stream already holds the backlog limit, so
+# concurrent producers cannot overshoot it between a length check and the add
+ENQUEUE_SCRIPT = """
+if redis.call('XLEN', KEYS[1]) >= tonumber(ARGV[1]) then
+    return false
+end
+return redis.call('XADD', KEYS[1], '*', 'payload', ARGV[2], 'attempts', ARGV[3])
+"""
+
+
+def validate_payload(payload: Dict[str, Any]):
+    """Raise ValueError unless an alert payload can be investigated"""
+    query = payload.get("query") if isinstance(payload, dict) else None
+    if not isinstance(query, str) or not query.strip():
+        raise ValueError("Alert payload needs a non-empty 'query' string")
+
+
+@dataclass
+class Job:
+    """A queued alert awaiting investigation"""
+
+    id: str
+    payload: Dict[str, Any]
+    attempts: int = 0
+    # Backend-specific handle needed to acknowledge the job
+    receipt: Any = field(default=None, repr=False)
+
+
+class WorkQueue(ABC):
+    """Abstract alert queue with acknowledgement and retry"""
+
+    # Seconds between ``touch`` calls while a job runs, or None if not needed
+    heartbeat_interval: Optional[float] = None
+
+    def __init__(self, max_retries: Optional[int] = None):
+        self.max_retries = settings.queue_max_retries if max_retries is None else max_retries
+
+    @abstractmethod
+    async def put(self, payload: Dict[str, Any]) -> str:
+        """Enqueue an alert, waiting while the queue is full; see ``validate_payload``"""
+
+    @abstractmethod
+    async def get(self, timeout: float = 1.0) -> Optional[Job]:
+        """Take the next job, or None if none arrives within the timeout"""
+
+    @abstractmethod
+    async def ack(self, job: Job):
+        """Mark a job as done"""
+
+    async def touch(self, job: Job):
+        """Tell the queue a job is still being worked on"""
+
+    @abstractmethod
+    async def _requeue(self, job: Job):
+        """Put a failed job back with its attempt count incremented"""
+
+    @abstractmethod
+    async def _dead_letter(self, job: Job, error: str):
+        """Park a job that exhausted its retries"""
+
+    async def fail(self, job: Job, error: str, retry: bool = True):
+        """Retry a failed job, or dead-letter it once retries are exhausted or not wanted"""
+        if retry and job.attempts < self.max_retries:
+            await self._requeue(job)
+        else:
+            logger.error("Job %s failed after %d attempts: %s", job.id, job.attempts + 1, error)
+            await self._dead_letter(job, error)
+
+
+class InMemoryWorkQueue(WorkQueue):
+    """
+    Single-process fallback queue
+
+    Bounded, so producers block once ``max_backlog`` alerts are waiting.
+    """
+
+    def __init__(self, max_backlog: Optional[int] = None, max_retries: Optional[int] = None):
+        super().__init__(max_retries)
+        self._queue: asyncio.Queue = asyncio.Queue(
+            max_backlog or settings.concurrency.queue_backlog
+        )
+        self._next_id = 0
+        self.dead_letters: List[Job] = []
+
+    async def put(self, payload: Dict[str, Any]) -> str:
+        """Enqueue an alert, waiting while the queue is full"""
+        validate_payload(payload)
+        self._next_id += 1
+        job = Job(id=str(self._next_id), payload=payload)
+        await self._queue.put(job)
+        return job.id
+
+    async def get(self, timeout: float = 1.0) -> Optional[Job]:
+        """Take the next job, or None if none arrives within the timeout"""
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def ack(self, job: Job):
+        """Mark a job as done"""
+        self._queue.task_done()
+
+    async def _requeue(self, job: Job):
+        """Put a failed job back with its attempt count incremented"""
+        self._queue.task_done()
+        await self._queue.put(Job(id=job.id, payload=job.payload, attempts=job.attempts + 1))
+
+    async def _dead_letter(self, job: Job, error: str):
+        """Park a job that exhausted its retries"""
+        self._queue.task_done()
+        self.dead_letters.append(job)
+
+
+class RedisStreamWorkQueue(WorkQueue):
+    """
+    Queue backed by a Redis Stream consumer group
+
+    Every worker process in every container joins the same group, so each
+    alert is delivered to exactly one consumer. Jobs stay in the group's
+    pending list until acknowledged; jobs left pending by a crashed consumer
+    for longer than ``claim_idle_ms`` are reclaimed by a later ``get``, at
+    most once every half ``claim_idle_ms`` per queue, and retried as failed
+    attempts. Workers ``touch`` the jobs they are running so long
+    investigations are not mistaken for abandoned ones.
+    """
+
+    def __init__(
+        self,
+        stream: Optional[str] = None,
+        group: Optional[str] = None,
+        consumer: Optional[str] = None,
+        max_backlog: Optional[int] = None,
+        max_retries: Optional[int] = None,
+        claim_idle_ms: Optional[int] = None,
+        client: Optional[aioredis.Redis] = None,
+    ):
+        super().__init__(max_retries)
+        self.stream = stream or settings.queue_stream
+        self.group = group or settings.queue_group
+        self.consumer = consumer or f"{socket.gethostname()}-{os.getpid()}"
+        self.max_backlog = max_backlog or settings.concurrency.queue_backlog
+        self.claim_idle_ms = claim_idle_ms or settings.queue_claim_idle_ms
+        self.heartbeat_interval = self.claim_idle_ms / 3000
+        self.reclaim_interval = self.claim_idle_ms / 2000
+        self.dead_letter_stream = f"{self.stream}:dead"
+        self.client = client or aioredis.Redis(connection_pool=get_async_pool())
+        self._enqueue_script = self.client.register_script(ENQUEUE_SCRIPT)
+        self._group_ready = False
+        self._next_reclaim = 0.0
+
+    async def _ensure_group(self):
+        """Create the consumer group and stream if they do not exist"""
+        if self._group_ready:
+            return
+        try:
+            await self.client.xgroup_create(self.stream, self.group, id="0", mkstream=True)
+        except ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+        self._group_ready = True
+
+    async def put(self, payload: Dict[str, Any]) -> str:
+        """Enqueue an alert, waiting while the stream backlog is full"""
+        validate_payload(payload)
+        await self._ensure_group()
+        data = json.dumps(payload)
+        while True:
+            entry_id = await self._enqueue_script(
+                keys=[self.stream], args=[self.max_backlog, data, 0]
+            )
+            if entry_id is not None:
+                return entry_id
+            await asyncio.sleep(0.1)
+
+    def _to_job(self, entry_id: str, fields: Dict[str, str]) -> Job:
+        """Build a job from a stream entry"""
+        return Job(
+            id=entry_id,
+            payload=json.loads(fields["payload"]),
+            attempts=int(fields.get("attempts", 0)),
+            receipt=entry_id,
+        )
+
+    async def _reclaim(self):
+        """
+        Fail jobs left pending by a consumer that stopped responding
+
+        A delivery that was never acknowledged counts as a failed attempt:
+        the job is requeued with its attempt count incremented, or
+        dead-lettered once retries are exhausted, so a job that keeps
+        crashing its worker does not circulate forever.
+        """
+        _, claimed, *_ = await self.client.xautoclaim(
+            self.stream, self.group, self.consumer, self.claim_idle_ms, count=10
+        )
+        for entry_id, fields in claimed:
+            if not fields:
+                continue
+            pending = await self.client.xpending_range(
+                self.stream, self.group, min=entry_id, max=entry_id, count=1
+            )
+            if not pending:
+                continue
+            job = self._to_job(entry_id, fields)
+            # Deliveries before this claim, the last of which is the one being failed now
+            job.attempts += pending[0]["times_delivered"] - 2
+            logger.warning("Reclaimed job %s from a consumer that stopped", job.id)
+            await self.fail(job, "worker stopped before finishing the job")
+
+    async def get(self, timeout: float = 1.0) -> Optional[Job]:
+        """Take the next job, reclaiming stale pending jobs first when due"""
+        await self._ensure_group()
+
+        if time.monotonic() >= self._next_reclaim:
+            # Every worker coroutine calls get(), so sweep on a timer rather than each call
+            self._next_reclaim = time.monotonic() + self.reclaim_interval
+            await self._reclaim()
+
+        response = await self.client.xreadgroup(
+            self.group, self.consumer, {self.stream: ">"}, count=1, block=int(timeout * 1000)
+        )
+        for _, entries in response or []:
+            for entry_id, fields in entries:
+                return self._to_job(entry_id, fields)
+        return None
+
+    def _queue_remove(self, pipe, job: Job):
+        """Queue acknowledgement and deletion of a job's stream entry"""
+        pipe.xack(self.stream, self.group, job.receipt)
+        pipe.xdel(self.stream, job.receipt)
+
+    async def touch(self, job: Job):
+        """Reset a job's idle time so other consumers do not reclaim it"""
+        await self.client.xclaim(
+            self.stream, self.group, self.consumer, 0, [job.receipt], justid=True
+        )
+
+    async def ack(self, job: Job):
+        """Acknowledge and delete a finished job"""
+        async with self.client.pipeline(transaction=True) as pipe:
+            self._queue_remove(pipe, job)
+            await pipe.execute()
+
+    async def _requeue(self, job: Job):
+        """Re-add a failed job with its attempt count incremented"""
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.xadd(
+                self.stream,
+                {"payload": json.dumps(job.payload), "attempts": job.attempts + 1},
+            )
+            self._queue_remove(pipe, job)
+            await pipe.execute()
+
+    async def _dead_letter(self, job: Job, error: str):
+        """Move a job that exhausted its retries to the dead-letter stream"""
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.xadd(
+                self.dead_letter_stream,
+                {"payload": json.dumps(job.payload), "attempts": job.attempts + 1, "error": error},
+            )
+            self._queue_remove(pipe, job)
+            await pipe.execute()
+
+
+class WorkerPool:
+    """
+    Pool of worker coroutines pulling alerts and running investigations
+
+    ``concurrency`` workers each hold at most one investigation, which bounds
+    in-flight investigations per process. Scale out by running more worker
+    processes or containers against the same Redis stream. With a
+    deduplicator, alerts matching a recent alert's fingerprint are attached
+    to that alert's investigation instead of starting a new one.
+    """
+
+    def __init__(
+        self,
+        orchestrator,
+        queue: WorkQueue,
+        concurrency: Optional[int] = None,
+        deduplicator: Optional[AlertDeduplicator] = None,
+    ):
+        self.orchestrator = orchestrator
+        self.queue = queue
+        self.concurrency = concurrency or settings.concurrency.worker_investigations
+        self.deduplicator = deduplicator
+        self.processed = 0
+        self.coalesced = 0
+        self.failed = 0
+        self._stopping = asyncio.Event()
+
+    async def run(self):
+        """Run workers until ``stop`` is called"""
+        async with asyncio.TaskGroup() as group:
+            for _ in range(self.concurrency):
+                group.create_task(self._worker())
+
+    def stop(self):
+        """Ask workers to exit after their current job"""
+        self._stopping.set()
+
+    async def _worker(self):
+        """Pull and process jobs until stopped, backing off while the queue is unreachable"""
+        backoff = 0.0
+        while not self._stopping.is_set():
+            try:
+                job = await self.queue.get()
+            except Exception:
+                backoff = min(backoff * 2 or 0.5, MAX_QUEUE_BACKOFF)
+                logger.exception("Could not take a job, retrying in %.1fs", backoff)
+                await asyncio.sleep(backoff)
+                continue
+            backoff = 0.0
+            if job is not None:
+                await self._handle(job)
+
+    async def _handle(self, job: Job):
+        """Process one job and acknowledge or fail it"""
+        try:
+            validate_payload(job.payload)
+        except ValueError as e:
+            # Retrying cannot fix the payload, so skip straight to the dead letters
+            self.failed += 1
+            logger.error("Job %s is malformed: %s", job.id, e)
+            await self._settle(job, self.queue.fail(job, str(e), retry=False))
+            return
+
+        heartbeat = None
+        if self.queue.heartbeat_interval is not None:
+            heartbeat = asyncio.create_task(self._heartbeat(job))
+        try:
+            await self._process(job)
+        except Exception as e:
+            self.failed += 1
+            logger.exception("Investigation for job %s failed", job.id)
+            settle = self.queue.fail(job, repr(e))
+        else:
+            settle = self.queue.ack(job)
+        finally:
+            if heartbeat is not None:
+                heartbeat.cancel()
+        await self._settle(job, settle)
+
+    async def _settle(self, job: Job, settle: Awaitable[None]):
+        """Wait for a job's acknowledgement or failure to be recorded"""
+        try:
+            await settle
+        except Exception:
+            # Still pending, so it is reclaimed once idle and counted as a failed attempt
+            logger.exception("Could not settle job %s", job.id)
+
+    async def _heartbeat(self, job: Job):
+        """Keep a long-running job from looking abandoned"""
+        while True:
+            await asyncio.sleep(self.queue.heartbeat_interval)
+            try:
+                await self.queue.touch(job)
+            except Exception:
+                logger.warning("Could not refresh job %s", job.id, exc_info=True)
+
+    async def _process(self, job: Job):
+        """Coalesce a duplicate alert or run a new investigation for it"""
+        # Pinned on the payload so a retried job reclaims its own fingerprint
+        investigation_id = job.payload.setdefault("investigation_id", uuid.uuid4().hex)
+        if self.deduplicator is not None:
+            existing = await self.deduplicator.claim(job.payload, investigation_id)
+            if existing is not None:
+                await self.orchestrator.memory.attach_alert(existing, job.payload)
+                await self.orchestrator.memory.publish_event(
+                    investigation_id, "status", {"status": "merged", "investigation_id": existing}
+                )
+                self.coalesced += 1
+                return
+
+        try:
+            await self.orchestrator.investigate(
+                job.payload["query"], investigation_id=investigation_id
+            )
+        except Exception:
+            if self.deduplicator is not None:
+                await self._release_claim(job, investigation_id)
+            raise
+        self.processed += 1
+
+    async def _release_claim(self, job: Job, investigation_id: str):
+        """Stop coalescing new alerts onto a failed investigation"""
+        try:
+            await self.deduplicator.release(job.payload, investigation_id)
+        except Exception:
+            # The claim then lapses with the dedup window
+            logger.warning("Could not release dedup claim for job %s", job.id, exc_info=True)
+
+
+async def run_worker(concurrency: Optional[int] = None):
+    """Run a worker pool against the Redis queue until cancelled"""
+    from core.orchestrator import Orchestrator
+
+    install_reload_handler(asyncio.get_running_loop())
+    orchestrator = Orchestrator()
+    await orchestrator.start()
+    try:
+        pool = WorkerPool(
+            orchestrator,
+            RedisStreamWorkQueue(),
+            concurrency,
+            deduplicator=AlertDeduplicator(),
+        )
+        await pool.run()
+    finally:
+        await orchestrator.close()
+
+
+def _process_main(concurrency: Optional[int], snapshot: Optional[Settings] = None):
+    """Entry point for a worker process"""
+    if snapshot is not None:
+        # Use the parent's settings as-is rather than parsing them again
+        configure(snapshot)
+    asyncio.run(run_worker(concurrency))
+
+
+def main(processes: Optional[int] = None, concurrency: Optional[int] = None):
+    """
+    Run one worker pool per process to use every core
+
+    Workers are spawned rather than forked, so none inherits this
+    process's event loop, Redis connections or signal handlers, and start
+    from this process's settings snapshot. A SIGHUP here reloads the
+    settings and is passed on to every worker, which reloads its own
+    without restarting. Worker processes that exit are replaced.
+    """
+    snapshot = get_settings()
+    processes = processes or snapshot.pools.worker_processes
+    if processes == 1:
+        _process_main(concurrency)
+        return
+
+    context = multiprocessing.get_context("spawn")
+
+    def spawn() -> multiprocessing.Process:
+        # Restarted workers get the latest snapshot, including reloads
+        worker = context.Process(
+            target=_process_main, args=(concurrency, get_settings()), daemon=True
+        )
+        worker.start()
+        return worker
+
+    workers = [spawn() for _ in range(processes)]
+
+    def forward(_snapshot: Settings):
+        for worker in workers:
+            if worker.is_alive():
+                os.kill(worker.pid, signal.SIGHUP)
+
+    install_reload_handler(on_reload=forward)
+    while True:
+        multiprocessing.connection.wait([worker.sentinel for worker in workers])
+        for index, worker in enumerate(workers):
+            if not worker.is_alive():
+                logger.error(
+                    "Worker process %d exited with code %s, restarting", worker.pid, worker.exitcode
+                )
+                time.sleep(WORKER_RESTART_DELAY)
+                workers[index] = spawn()
+
+
+if __name__ == "__main__":
+    main()
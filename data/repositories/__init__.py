@@ -0,0 +1 @@
+"""Package: data/repositories"""
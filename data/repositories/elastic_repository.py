@@ -0,0 +1,144 @@
+"""
+Elasticsearch log repository with streaming pagination
+"""
+
+from typing import Dict, Any, AsyncIterator, List, Optional
+
+from elasticsearch import AsyncElasticsearch
+
+from config.settings import settings
+
+
+class ElasticLogRepository:
+    """
+    Read access to log indices in Elasticsearch
+
+    ``search`` pages through results with a point-in-time and
+    ``search_after``, holding only one page in memory at a time however many
+    hits match. Counting and grouping are pushed down to Elasticsearch with
+    ``aggregate`` so agents never pull raw hits just to tally them.
+    """
+
+    def __init__(
+        self,
+        client: Optional[AsyncElasticsearch] = None,
+        page_size: Optional[int] = None,
+        keep_alive: Optional[str] = None,
+    ):
+        basic_auth = None
+        if settings.elastic_password:
+            basic_auth = (settings.elastic_username, settings.elastic_password)
+        self.client = client or AsyncElasticsearch(
+            f"http://{settings.elastic_host}:{settings.elastic_port}",
+            basic_auth=basic_auth,
+            request_timeout=settings.elastic_timeout,
+        )
+        self.page_size = page_size or settings.elastic_page_size
+        self.keep_alive = keep_alive or settings.elastic_pit_keep_alive
+
+    async def close(self):
+        """Close the Elasticsearch connection pool"""
+        await self.client.close()
+
+    async def search_pages(
+        self,
+        index: str,
+        query: Dict[str, Any],
+        sort: Optional[List[Dict[str, Any]]] = None,
+        source: Optional[List[str]] = None,
+        max_hits: Optional[int] = None,
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Yield pages of hits matching a query
+
+        Args:
+            index: Index or index pattern to search
+            query: Elasticsearch query DSL
+            sort: Sort order; ``_shard_doc`` is appended as a tiebreaker
+            source: Source fields to return, or None for all
+            max_hits: Stop after this many hits
+
+        Yields:
+            Lists of hit documents, at most ``page_size`` long
+        """
+        sort = list(sort or [{"@timestamp": "asc"}]) + [{"_shard_doc": "asc"}]
+        pit = await self.client.open_point_in_time(index=index, keep_alive=self.keep_alive)
+        pit_id = pit["id"]
+        search_after = None
+        returned = 0
+        try:
+            while max_hits is None or returned < max_hits:
+                size = self.page_size
+                if max_hits is not None:
+                    size = min(size, max_hits - returned)
+                response = await self.client.search(
+                    query=query,
+                    sort=sort,
+                    size=size,
+                    source=source if source is not None else True,
+                    pit={"id": pit_id, "keep_alive": self.keep_alive},
+                    search_after=search_after,
+                    track_total_hits=False,
+                )
+                # The PIT ID can change between requests
+                pit_id = response.get("pit_id", pit_id)
+                hits = response["hits"]["hits"]
+                if not hits:
+                    break
+                yield hits
+                returned += len(hits)
+                search_after = hits[-1]["sort"]
+                if len(hits) < size:
+                    break
+        finally:
+            await self.client.close_point_in_time(id=pit_id)
+
+    async def search(
+        self,
+        index: str,
+        query: Dict[str, Any],
+        sort: Optional[List[Dict[str, Any]]] = None,
+        source: Optional[List[str]] = None,
+        max_hits: Optional[int] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Yield matching hits one at a time; see ``search_pages``"""
+        async for page in self.search_pages(index, query, sort, source, max_hits):
+            for hit in page:
+                yield hit
+
+    async def count(self, index: str, query: Dict[str, Any]) -> int:
+        """Count matching documents without fetching them"""
+        response = await self.client.count(index=index, query=query)
+        return response["count"]
+
+    async def aggregate(
+        self, index: str, query: Dict[str, Any], aggs: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Run aggregations server-side and return only the aggregation results"""
+        response = await self.client.search(
+            index=index, query=query, aggs=aggs, size=0, track_total_hits=True
+        )
+        return response["aggregations"]
+
+    async def top_terms(
+        self, index: str, query: Dict[str, Any], field: str, size: int = 10
+    ) -> List[Dict[str, Any]]:
+        """Most frequent values of a field, e.g. source IPs or user names"""
+        aggs = await self.aggregate(
+            index, query, {"top": {"terms": {"field": field, "size": size}}}
+        )
+        return [
+            {"value": bucket["key"], "count": bucket["doc_count"]}
+            for bucket in aggs["top"]["buckets"]
+        ]
+
+    async def histogram(
+        self, index: str, query: Dict[str, Any], interval: str = "1m", field: str = "@timestamp"
+    ) -> List[Dict[str, Any]]:
+        """Event counts per time bucket"""
+        histogram = {"date_histogram": {"field": field, "fixed_interval": interval}}
+        aggs = await self.aggregate(index, query, {"timeline": histogram})
+        return [
+            {"timestamp": bucket["key_as_string"], "count": bucket["doc_count"]}
+            for bucket in aggs["timeline"]["buckets"]
+        ]
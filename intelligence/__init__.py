@@ -0,0 +1 @@
+"""Threat intelligence providers and indicator enrichment"""
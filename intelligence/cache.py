@@ -0,0 +1,179 @@
+"""
+Two-tier indicator enrichment cache with negative caching and request coalescing
+"""
+
+import asyncio
+import json
+import logging
+import time
+from typing import Dict, Any, Awaitable, Callable, Optional, Set, Tuple
+
+import redis.asyncio as aioredis
+from redis.exceptions import RedisError
+
+from config.settings import settings
+from memory.redis_store import get_async_pool
+from utils.cache import LRUTTLCache
+
+logger = logging.getLogger(__name__)
+
+CACHE_KEY = "intel:{provider}:{indicator_type}:{value}"
+
+LookupOutcome = Tuple[Optional[Dict[str, Any]], Optional[str]]
+
+
+class EnrichmentCache:
+    """
+    Caches provider lookups per provider and normalized indicator
+
+    Entries live in an in-process LRU in front of Redis, which is shared by
+    every worker. Hits use the provider's TTL; misses (nothing found) and
+    errors use a short negative TTL so they are retried soon without
+    hammering the provider. Once an entry expires it is still served for
+    ``stale_ttl`` seconds while a single background refresh runs, and
+    concurrent lookups of the same key share one upstream call.
+
+    Redis is an optimisation only: if it is unreachable, lookups fall back
+    to the local tier and then to the provider, and the error is logged.
+    """
+
+    def __init__(
+        self,
+        client: Optional[aioredis.Redis] = None,
+        ttls: Optional[Dict[str, int]] = None,
+        default_ttl: Optional[int] = None,
+        negative_ttl: Optional[int] = None,
+        stale_ttl: Optional[int] = None,
+        local_size: Optional[int] = None,
+    ):
+        self.client = client or aioredis.Redis(connection_pool=get_async_pool())
+        self.ttls = settings.intel_cache_ttls if ttls is None else ttls
+        self.default_ttl = default_ttl or settings.ttls.intel
+        self.negative_ttl = negative_ttl or settings.ttls.intel_negative
+        self.stale_ttl = settings.ttls.intel_stale if stale_ttl is None else stale_ttl
+        self.local = LRUTTLCache(max_size=local_size or settings.intel_local_cache_size)
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._refreshes: Set[asyncio.Task] = set()
+
+    @staticmethod
+    def _key(provider: str, indicator_type: str, value: str) -> str:
+        """Redis key for a provider lookup"""
+        return CACHE_KEY.format(provider=provider, indicator_type=indicator_type, value=value)
+
+    def _ttl(self, provider: str, outcome: LookupOutcome) -> int:
+        """TTL for an outcome: the provider TTL for hits, the negative TTL otherwise"""
+        result, error = outcome
+        if error is not None or not (result or {}).get("found"):
+            return self.negative_ttl
+        return self.ttls.get(provider, self.default_ttl)
+
+    async def _read(self, key: str) -> Optional[Dict[str, Any]]:
+        """Read an entry from the local tier, falling back to Redis"""
+        entry = self.local.get(key)
+        if entry is None:
+            try:
+                raw = await self.client.get(key)
+            except RedisError as e:
+                logger.warning("Enrichment cache read failed for %s: %s", key, e)
+                return None
+            if raw is None:
+                return None
+            entry = json.loads(raw)
+            remaining = entry["stale_until"] - time.time()
+            if remaining > 0:
+                self.local.set(key, entry, ttl=remaining)
+        return entry
+
+    async def _write(self, key: str, provider: str, outcome: LookupOutcome):
+        """Store an outcome in both tiers"""
+        ttl = self._ttl(provider, outcome)
+        now = time.time()
+        entry = {
+            "result": outcome[0],
+            "error": outcome[1],
+            "expires_at": now + ttl,
+            "stale_until": now + ttl + self.stale_ttl,
+        }
+        self.local.set(key, entry, ttl=ttl + self.stale_ttl)
+        await self.client.set(key, json.dumps(entry), ex=ttl + self.stale_ttl)
+
+    async def _fetch(
+        self, key: str, provider: str, fetch: Callable[[], Awaitable[LookupOutcome]]
+    ) -> LookupOutcome:
+        """Call upstream once per key, sharing the result with concurrent callers"""
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._fetch_and_store(key, provider, fetch))
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(future)
+
+    async def _fetch_and_store(
+        self, key: str, provider: str, fetch: Callable[[], Awaitable[LookupOutcome]]
+    ) -> LookupOutcome:
+        """Fetch an outcome and cache it"""
+        outcome = await fetch()
+        try:
+            await self._write(key, provider, outcome)
+        except Exception:
+            logger.exception("Failed to cache enrichment for %s", key)
+        return outcome
+
+    def _refresh_in_background(
+        self, key: str, provider: str, fetch: Callable[[], Awaitable[LookupOutcome]]
+    ):
+        """Start a refresh for a stale entry unless one is already running"""
+        if key in self._inflight:
+            return
+        task = asyncio.ensure_future(self._fetch(key, provider, fetch))
+        self._refreshes.add(task)
+        task.add_done_callback(self._refreshes.discard)
+
+    async def get_or_fetch(
+        self,
+        provider: str,
+        indicator_type: str,
+        value: str,
+        fetch: Callable[[], Awaitable[LookupOutcome]],
+    ) -> LookupOutcome:
+        """
+        Return a cached lookup outcome, fetching it on a miss
+
+        Args:
+            provider: Provider name
+            indicator_type: Normalized indicator type
+            value: Normalized indicator value
+            fetch: Coroutine factory performing the upstream lookup
+
+        Returns:
+            Tuple of (result, error) as produced by ``fetch``
+        """
+        key = self._key(provider, indicator_type, value)
+        entry = await self._read(key)
+        if entry is not None:
+            now = time.time()
+            if now < entry["expires_at"]:
+                return entry["result"], entry["error"]
+            if now < entry["stale_until"]:
+                self._refresh_in_background(key, provider, fetch)
+                return entry["result"], entry["error"]
+        return await self._fetch(key, provider, fetch)
+
+    async def peek(
+        self, provider: str, indicator_type: str, value: str
+    ) -> Optional[LookupOutcome]:
+        """Return a fresh cached outcome without fetching"""
+        entry = await self._read(self._key(provider, indicator_type, value))
+        if entry is None or time.time() >= entry["expires_at"]:
+            return None
+        return entry["result"], entry["error"]
+
+    async def store(
+        self, provider: str, indicator_type: str, value: str, outcome: LookupOutcome
+    ):
+        """Cache an outcome obtained outside ``get_or_fetch``, e.g. from a bulk call"""
+        key = self._key(provider, indicator_type, value)
+        try:
+            await self._write(key, provider, outcome)
+        except RedisError as e:
+            logger.warning("Failed to cache enrichment for %s: %s", key, e)
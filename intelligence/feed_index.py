@@ -0,0 +1,367 @@
+"""
+Offline threat-feed index backed by memory-mapped sorted arrays
+"""
+
+import bisect
+import csv
+import hashlib
+import ipaddress
+import json
+import mmap
+import os
+import shutil
+import sys
+import time
+from array import array
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from config.settings import settings
+from intelligence.indicators import normalize_indicator
+
+
+CURRENT_FILE = "CURRENT"
+IPV4_STARTS = "ipv4_starts.bin"
+IPV4_ENDS = "ipv4_ends.bin"
+IPV6_RANGES = "ipv6_ranges.bin"
+DOMAINS = "domains.bin"
+HASHES = "hashes.bin"
+META = "meta.json"
+
+# Index versions kept on disk so readers mid-swap can finish with the old one
+KEEP_VERSIONS = 2
+
+
+def _digest(value: str) -> int:
+    """64-bit digest used for domain and file-hash membership"""
+    return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), "little")
+
+
+def _merge_ranges(starts: np.ndarray, ends: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Sort uint32 ranges and merge overlapping or adjacent ones"""
+    if not len(starts):
+        return starts, ends
+    # One uint64 key per range sorts by (start, end) in place; the halves are then
+    # read back as strided uint32 views so no further full-size copies are made
+    keys = starts.astype(np.uint64)
+    keys <<= np.uint64(32)
+    keys |= ends
+    keys.sort()
+    halves = keys.view(np.uint32).reshape(-1, 2)
+    high, low = (1, 0) if sys.byteorder == "little" else (0, 1)
+    starts, ends = halves[:, high], halves[:, low]
+
+    reach = np.maximum.accumulate(ends)
+    # A range opens a new group when it starts more than one past everything so far;
+    # the subtraction wraps where start <= reach, but those are masked out first
+    opens = np.empty(len(starts), dtype=bool)
+    opens[0] = True
+    np.greater(starts[1:], reach[:-1], out=opens[1:])
+    opens[1:] &= (starts[1:] - reach[:-1]) > 1
+    closes = np.empty_like(opens)
+    closes[:-1] = opens[1:]
+    closes[-1] = True
+    return starts[opens], reach[closes]
+
+
+def _merge_sorted(ranges: Iterable[Tuple[int, int]]) -> Iterator[Tuple[int, int]]:
+    """Merge overlapping or adjacent ranges that arrive sorted by start"""
+    current: Optional[Tuple[int, int]] = None
+    for start, end in ranges:
+        if current is not None and start <= current[1] + 1:
+            if end > current[1]:
+                current = (current[0], end)
+            continue
+        if current is not None:
+            yield current
+        current = (start, end)
+    if current is not None:
+        yield current
+
+
+class FeedIndexBuilder:
+    """
+    Collects feed entries and writes a new index version
+
+    IPv4 ranges are stored as two parallel sorted uint32 arrays, IPv6 ranges
+    as sorted 32-byte big-endian (start, end) records, and domains and file
+    hashes as sorted arrays of 64-bit digests. ``build`` writes a fresh
+    version directory and then atomically repoints ``CURRENT`` at it.
+
+    Entries are collected in the same packed layouts rather than as Python
+    ints, so a 10M-entry feed needs tens of megabytes while building instead
+    of gigabytes, and sorting and merging run in NumPy.
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = Path(directory or settings.feed_index_dir)
+        self.ipv4_starts = array("I")
+        self.ipv4_ends = array("I")
+        self.ipv6 = bytearray()
+        self.domains = array("Q")
+        self.hashes = array("Q")
+        self.skipped = 0
+
+    def add(self, value: str):
+        """Add one indicator or CIDR block"""
+        value = value.strip()
+        if "/" in value and "://" not in value:
+            try:
+                network = ipaddress.ip_network(value, strict=False)
+            except ValueError:
+                self.skipped += 1
+                return
+            self._add_range(
+                network.version, int(network.network_address), int(network.broadcast_address)
+            )
+            return
+
+        # ip:port entries, as found in ThreatFox exports
+        host, sep, port = value.rpartition(":")
+        if sep and port.isdigit() and host.count(":") == 0:
+            value = host
+
+        try:
+            indicator_type, normalized = normalize_indicator(value)
+        except ValueError:
+            self.skipped += 1
+            return
+        if indicator_type in ("ipv4", "ipv6"):
+            address = ipaddress.ip_address(normalized)
+            self._add_range(address.version, int(address), int(address))
+        elif indicator_type == "domain":
+            self.domains.append(_digest(normalized))
+        elif indicator_type in ("md5", "sha1", "sha256"):
+            self.hashes.append(_digest(normalized))
+        else:
+            self.skipped += 1
+
+    def _add_range(self, version: int, start: int, end: int):
+        """Append an address range to the IPv4 arrays or the IPv6 records"""
+        if version == 4:
+            self.ipv4_starts.append(start)
+            self.ipv4_ends.append(end)
+        else:
+            self.ipv6 += start.to_bytes(16, "big") + end.to_bytes(16, "big")
+
+    def _ipv6_ranges(self) -> Iterator[Tuple[int, int]]:
+        """Merged IPv6 ranges in order"""
+        # Fixed-width big-endian records sort bytewise in numeric (start, end) order
+        records = np.unique(np.frombuffer(self.ipv6, dtype="S32"))
+        # NumPy drops trailing NUL bytes when converting back to bytes
+        records = (record.ljust(32, b"\0") for record in records.tolist())
+        return _merge_sorted(
+            (int.from_bytes(record[:16], "big"), int.from_bytes(record[16:], "big"))
+            for record in records
+        )
+
+    def add_many(self, values: Iterable[str]):
+        """Add indicators from an iterable"""
+        for value in values:
+            self.add(value)
+
+    def ingest_file(self, path: str, column: Optional[int] = None, delimiter: str = ","):
+        """
+        Ingest a feed file
+
+        Args:
+            path: Feed file; blank lines and ``#`` comments are skipped
+            column: CSV column holding the indicator, or None for one per line
+            delimiter: CSV delimiter when ``column`` is given
+        """
+        with open(path, newline="", encoding="utf-8", errors="replace") as f:
+            lines = (line for line in f if line.strip() and not line.lstrip().startswith("#"))
+            if column is None:
+                self.add_many(lines)
+            else:
+                rows = csv.reader(lines, delimiter=delimiter, skipinitialspace=True)
+                self.add_many(row[column] for row in rows if len(row) > column)
+
+    def build(self) -> Path:
+        """Write a new index version and make it current"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        version = self.directory / f"index-{time.time_ns()}"
+        version.mkdir()
+
+        starts, ends = _merge_ranges(
+            np.frombuffer(self.ipv4_starts, dtype=np.uint32),
+            np.frombuffer(self.ipv4_ends, dtype=np.uint32),
+        )
+        starts.tofile(version / IPV4_STARTS)
+        ends.tofile(version / IPV4_ENDS)
+        with open(version / IPV6_RANGES, "wb") as f:
+            for start, end in self._ipv6_ranges():
+                f.write(start.to_bytes(16, "big") + end.to_bytes(16, "big"))
+        domains = np.unique(np.frombuffer(self.domains, dtype=np.uint64))
+        domains.tofile(version / DOMAINS)
+        hashes = np.unique(np.frombuffer(self.hashes, dtype=np.uint64))
+        hashes.tofile(version / HASHES)
+        (version / META).write_text(json.dumps({
+            "built_at": time.time(),
+            "ipv4_ranges": len(starts),
+            "domains": len(domains),
+            "hashes": len(hashes),
+            "skipped": self.skipped,
+        }))
+
+        pointer = self.directory / f"{CURRENT_FILE}.tmp"
+        pointer.write_text(version.name)
+        os.replace(pointer, self.directory / CURRENT_FILE)
+        self._prune(version.name)
+        return version
+
+    def _prune(self, current: str):
+        """Remove index versions older than the last ``KEEP_VERSIONS``"""
+        versions = sorted(p for p in self.directory.glob("index-*") if p.is_dir())
+        for old in versions[:-KEEP_VERSIONS]:
+            if old.name != current:
+                shutil.rmtree(old, ignore_errors=True)
+
+
+class _RangeRecords:
+    """Sequence view of 32-byte (start, end) records, indexed by start"""
+
+    def __init__(self, view: memoryview):
+        self.view = view
+
+    def __len__(self) -> int:
+        return len(self.view) // 32
+
+    def __getitem__(self, i: int) -> int:
+        return int.from_bytes(self.view[i * 32:i * 32 + 16], "big")
+
+    def end(self, i: int) -> int:
+        """End of the i-th range"""
+        return int.from_bytes(self.view[i * 32 + 16:i * 32 + 32], "big")
+
+
+class FeedIndex:
+    """
+    Read-only, memory-mapped view of the current feed index
+
+    The files are mapped read-only, so every worker process on the host
+    shares one copy through the page cache. Lookups are binary searches with
+    no network access. The index notices a newly built version at most every
+    ``refresh_interval`` seconds and switches to it.
+    """
+
+    def __init__(self, directory: Optional[str] = None, refresh_interval: Optional[float] = None):
+        self.directory = Path(directory or settings.feed_index_dir)
+        self.refresh_interval = (
+            settings.feed_index_refresh_interval if refresh_interval is None else refresh_interval
+        )
+        self.version: Optional[str] = None
+        self._maps: List[mmap.mmap] = []
+        self._exports: List[memoryview] = []
+        self._views: Dict[str, memoryview] = {}
+        self._checked_at = 0.0
+        self.refresh()
+
+    def _map(self, path: Path, fmt: str) -> memoryview:
+        """Memory-map a file and return a typed view of it"""
+        if path.stat().st_size == 0:
+            return memoryview(b"").cast(fmt)
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        base = memoryview(mapped)
+        view = base.cast(fmt)
+        self._maps.append(mapped)
+        self._exports.extend((view, base))
+        return view
+
+    @staticmethod
+    def _unmap(maps: List[mmap.mmap], exports: List[memoryview]):
+        """Release views before closing the maps they export"""
+        for view in exports:
+            view.release()
+        for mapped in maps:
+            mapped.close()
+
+    def refresh(self) -> bool:
+        """Switch to the current index version if it changed; returns True on switch"""
+        self._checked_at = time.monotonic()
+        try:
+            version = (self.directory / CURRENT_FILE).read_text().strip()
+        except FileNotFoundError:
+            return False
+        if version == self.version:
+            return False
+
+        old_maps, old_exports = self._maps, self._exports
+        self._maps, self._exports = [], []
+        path = self.directory / version
+        self._views = {
+            IPV4_STARTS: self._map(path / IPV4_STARTS, "I"),
+            IPV4_ENDS: self._map(path / IPV4_ENDS, "I"),
+            IPV6_RANGES: self._map(path / IPV6_RANGES, "B"),
+            DOMAINS: self._map(path / DOMAINS, "Q"),
+            HASHES: self._map(path / HASHES, "Q"),
+        }
+        self.version = version
+        self._unmap(old_maps, old_exports)
+        return True
+
+    def _maybe_refresh(self):
+        """Check for a new version once the refresh interval has passed"""
+        if time.monotonic() - self._checked_at >= self.refresh_interval:
+            self.refresh()
+
+    @staticmethod
+    def _contains_digest(view: memoryview, digest: int) -> bool:
+        """Binary search a sorted digest array"""
+        i = bisect.bisect_left(view, digest)
+        return i < len(view) and view[i] == digest
+
+    def contains_ip(self, address: str) -> bool:
+        """Whether an IP address falls inside any indexed range"""
+        self._maybe_refresh()
+        ip = ipaddress.ip_address(address)
+        value = int(ip)
+        if ip.version == 4:
+            starts, ends = self._views.get(IPV4_STARTS), self._views.get(IPV4_ENDS)
+            if not starts:
+                return False
+            i = bisect.bisect_right(starts, value) - 1
+            return i >= 0 and ends[i] >= value
+
+        view = self._views.get(IPV6_RANGES)
+        if not view:
+            return False
+        records = _RangeRecords(view)
+        i = bisect.bisect_right(records, value) - 1
+        return i >= 0 and records.end(i) >= value
+
+    def contains_domain(self, domain: str) -> bool:
+        """Whether a domain or any of its parent domains is indexed"""
+        self._maybe_refresh()
+        view = self._views.get(DOMAINS)
+        if not view:
+            return False
+        labels = domain.lower().rstrip(".").split(".")
+        return any(
+            self._contains_digest(view, _digest(".".join(labels[i:])))
+            for i in range(len(labels) - 1)
+        )
+
+    def contains_hash(self, file_hash: str) -> bool:
+        """Whether a file hash is indexed"""
+        self._maybe_refresh()
+        view = self._views.get(HASHES)
+        return bool(view) and self._contains_digest(view, _digest(file_hash.lower()))
+
+    def match(self, indicator_type: str, value: str) -> bool:
+        """Check a normalized indicator against the index"""
+        if indicator_type in ("ipv4", "ipv6"):
+            return self.contains_ip(value)
+        if indicator_type == "domain":
+            return self.contains_domain(value)
+        if indicator_type in ("md5", "sha1", "sha256"):
+            return self.contains_hash(value)
+        return False
+
+    def close(self):
+        """Unmap the index files"""
+        self._unmap(self._maps, self._exports)
+        self._views, self._maps, self._exports, self.version = {}, [], [], None
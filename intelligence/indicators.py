@@ -0,0 +1,47 @@
+"""
+Indicator classification and normalization
+"""
+
+import ipaddress
+import re
+from typing import Tuple
+from urllib.parse import urlsplit
+
+
+_HASH_TYPES = {32: "md5", 40: "sha1", 64: "sha256"}
+_HEX_RE = re.compile(r"^[0-9a-f]+$")
+_DOMAIN_RE = re.compile(r"^(?=.{1,253}$)([a-z0-9_](?:[a-z0-9_-]{0,61}[a-z0-9])?\.)+[a-z]{2,63}$")
+
+
+def normalize_indicator(value: str) -> Tuple[str, str]:
+    """
+    Classify an indicator and return it in canonical form
+
+    Args:
+        value: Raw indicator (IP, domain, URL or file hash)
+
+    Returns:
+        Tuple of (indicator type, normalized value)
+
+    Raises:
+        ValueError: If the value is not a recognised indicator
+    """
+    value = value.strip()
+    try:
+        address = ipaddress.ip_address(value.strip("[]"))
+        return ("ipv4" if address.version == 4 else "ipv6", address.compressed)
+    except ValueError:
+        pass
+
+    lowered = value.lower()
+    if "://" in lowered:
+        parts = urlsplit(value)
+        parts = parts._replace(scheme=parts.scheme.lower(), netloc=parts.netloc.lower())
+        return "url", parts.geturl()
+    if len(lowered) in _HASH_TYPES and _HEX_RE.match(lowered):
+        return _HASH_TYPES[len(lowered)], lowered
+
+    domain = lowered.rstrip(".")
+    if _DOMAIN_RE.match(domain):
+        return "domain", domain
+    raise ValueError(f"Unrecognised indicator: {value!r}")
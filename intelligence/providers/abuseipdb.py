@@ -0,0 +1,39 @@
+"""
+AbuseIPDB IP reputation provider
+"""
+
+from typing import Dict, Any
+
+import httpx
+
+from intelligence.providers.base import ThreatIntelProvider
+
+
+class AbuseIPDBProvider(ThreatIntelProvider):
+    """Looks up IP addresses with the AbuseIPDB ``check`` endpoint"""
+
+    name = "abuseipdb"
+    supported_types = frozenset({"ipv4", "ipv6"})
+    default_base_url = "https://api.abuseipdb.com/api/v2"
+    # Confidence score at or above which an address is reported as malicious
+    malicious_threshold = 50
+
+    async def lookup(
+        self, indicator_type: str, value: str, client: httpx.AsyncClient
+    ) -> Dict[str, Any]:
+        """Look up an IP address"""
+        response = await client.get(
+            f"{self.base_url or self.default_base_url}/check",
+            params={"ipAddress": value, "maxAgeInDays": 90},
+            headers={"Key": self.api_key or "", "Accept": "application/json"},
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        data = response.json()["data"]
+        score = data.get("abuseConfidenceScore", 0)
+        return {
+            "found": data.get("totalReports", 0) > 0,
+            "malicious": score >= self.malicious_threshold,
+            "score": score,
+            "details": data,
+        }
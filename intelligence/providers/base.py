@@ -0,0 +1,72 @@
+"""
+Base class for threat intelligence providers
+"""
+
+from abc import ABC, abstractmethod
+from typing import Dict, Any, FrozenSet, List, Optional
+
+import httpx
+
+from config.settings import settings
+
+
+class ThreatIntelProvider(ABC):
+    """
+    Abstract threat intel source
+
+    Providers are stateless apart from configuration; the registry owns the
+    shared HTTP client and passes it to every lookup so all providers reuse
+    one keep-alive connection pool.
+
+    Providers with a bulk endpoint set ``max_batch_size`` above 1 and
+    implement ``lookup_many``; the registry then sends batches instead of
+    one request per indicator.
+    """
+
+    name: str = ""
+    supported_types: FrozenSet[str] = frozenset()
+    max_batch_size: int = 1
+    # Whether results are worth keeping in the enrichment cache
+    cacheable: bool = True
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+        timeout: Optional[float] = None,
+        rate_limit: Optional[float] = None,
+    ):
+        self.api_key = api_key
+        self.base_url = base_url
+        self.timeout = timeout or settings.intel_timeout
+        # Requests per second allowed against the provider
+        self.rate_limit = rate_limit or settings.intel_rate_limits.get(
+            self.name, settings.intel_rate_limit
+        )
+
+    def supports(self, indicator_type: str) -> bool:
+        """Whether this provider can look up the given indicator type"""
+        return indicator_type in self.supported_types
+
+    @abstractmethod
+    async def lookup(
+        self, indicator_type: str, value: str, client: httpx.AsyncClient
+    ) -> Dict[str, Any]:
+        """
+        Look up a normalized indicator
+
+        Returns:
+            Dict with ``found``, ``malicious``, ``score`` and provider ``details``
+        """
+        pass
+
+    async def lookup_many(
+        self, indicator_type: str, values: List[str], client: httpx.AsyncClient
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Look up a batch of normalized indicators of one type in a single request
+
+        Returns:
+            Results keyed by indicator value, in the same shape as ``lookup``
+        """
+        raise NotImplementedError(f"{self.name} has no bulk endpoint")
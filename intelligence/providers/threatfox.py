@@ -0,0 +1,38 @@
+"""
+ThreatFox IOC provider
+"""
+
+from typing import Dict, Any
+
+import httpx
+
+from intelligence.providers.base import ThreatIntelProvider
+
+
+class ThreatFoxProvider(ThreatIntelProvider):
+    """Searches ThreatFox for IPs, domains, URLs and file hashes"""
+
+    name = "threatfox"
+    supported_types = frozenset({"ipv4", "ipv6", "domain", "url", "md5", "sha1", "sha256"})
+    default_base_url = "https://threatfox-api.abuse.ch/api/v1"
+
+    async def lookup(
+        self, indicator_type: str, value: str, client: httpx.AsyncClient
+    ) -> Dict[str, Any]:
+        """Search ThreatFox for an indicator"""
+        response = await client.post(
+            f"{self.base_url or self.default_base_url}/",
+            json={"query": "search_ioc", "search_term": value},
+            headers={"Auth-Key": self.api_key or ""},
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        body = response.json()
+        matches = body.get("data") if body.get("query_status") == "ok" else []
+        matches = matches if isinstance(matches, list) else []
+        return {
+            "found": bool(matches),
+            "malicious": bool(matches),
+            "score": max((m.get("confidence_level", 0) for m in matches), default=0),
+            "details": matches,
+        }
@@ -0,0 +1,67 @@
+"""
+Token bucket rate limiter for provider requests
+"""
+
+import asyncio
+import heapq
+import itertools
+import time
+from typing import List, Optional, Tuple
+
+
+class TokenBucket:
+    """
+    Async token bucket
+
+    Refills at ``rate`` tokens per second up to ``capacity``. Waiters are
+    served by ``priority`` (lower first) and then in arrival order, so a
+    burst of lookups is spread evenly over time instead of tripping the
+    provider's rate limit, and an urgent request never queues behind a bulk
+    backlog.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        if rate <= 0:
+            raise ValueError(f"Token bucket rate must be positive, got {rate}")
+        if capacity is None:
+            capacity = max(1.0, rate)
+        if capacity < 1:
+            raise ValueError(f"Token bucket capacity must be at least 1, got {capacity}")
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._seq = itertools.count()
+        self._waiters: List[Tuple[int, int, float, asyncio.Future]] = []
+        self._server: Optional[asyncio.Task] = None
+
+    def _refill(self):
+        """Add tokens earned since the last update"""
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, tokens: float = 1.0, priority: int = 0):
+        """Wait until ``tokens`` are available and take them"""
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), tokens, future))
+        if self._server is None or self._server.done():
+            self._server = asyncio.create_task(self._serve())
+        await future
+
+    async def _serve(self):
+        """Hand out tokens to waiters in priority order until none are left"""
+        while self._waiters:
+            _, _, tokens, future = self._waiters[0]
+            if future.done():
+                # Waiter was cancelled
+                heapq.heappop(self._waiters)
+                continue
+            self._refill()
+            if self._tokens >= tokens:
+                heapq.heappop(self._waiters)
+                self._tokens -= tokens
+                future.set_result(None)
+                continue
+            # A higher priority waiter arriving meanwhile is at the head on wake-up
+            await asyncio.sleep((tokens - self._tokens) / self.rate)
@@ -0,0 +1,327 @@
+"""
+Registry that fans indicator lookups out to every threat intel provider
+"""
+
+import asyncio
+import logging
+from pathlib import Path
+from typing import Dict, Any, AsyncIterator, Iterable, List, Optional, Tuple
+
+import httpx
+
+from config.settings import get_settings, settings
+from intelligence.cache import EnrichmentCache
+from intelligence.indicators import normalize_indicator
+from intelligence.providers.abuseipdb import AbuseIPDBProvider
+from intelligence.feed_index import CURRENT_FILE
+from intelligence.providers.base import ThreatIntelProvider
+from intelligence.providers.local_feed import LocalFeedProvider
+from intelligence.providers.threatfox import ThreatFoxProvider
+from intelligence.rate_limit import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+# Token bucket priorities: interactive lookups are served before bulk enrichment
+LOOKUP_PRIORITY = 0
+BULK_PRIORITY = 1
+
+
+class ProviderRegistry:
+    """
+    Looks up one indicator across all registered providers concurrently
+
+    Every provider shares a single ``httpx.AsyncClient`` so connections are
+    pooled and kept alive across lookups. Each provider runs under its own
+    timeout; a slow or failing provider is reported in ``errors`` while the
+    others still return, so enrichment latency is bounded by the slowest
+    provider's timeout rather than the sum of all providers. With a cache,
+    repeat lookups are answered from ``EnrichmentCache`` instead.
+
+    Upstream requests to each provider are paced by a per-provider token
+    bucket, shared by single and bulk lookups in this process. Single
+    lookups take tokens ahead of any ``enrich_many`` backlog, and their wait
+    counts against the provider timeout so the latency bound still holds.
+    """
+
+    def __init__(
+        self,
+        providers: Optional[List[ThreatIntelProvider]] = None,
+        client: Optional[httpx.AsyncClient] = None,
+        cache: Optional[EnrichmentCache] = None,
+    ):
+        self.providers: Dict[str, ThreatIntelProvider] = {}
+        self.buckets: Dict[str, TokenBucket] = {}
+        self.cache = cache
+        self.client = client or httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=settings.pools.intel_connections,
+                max_keepalive_connections=settings.pools.intel_keepalive,
+            ),
+            timeout=settings.intel_timeout,
+        )
+        for provider in providers or []:
+            self.register(provider)
+
+    def register(self, provider: ThreatIntelProvider):
+        """Add a provider to the registry"""
+        self.providers[provider.name] = provider
+        self.buckets[provider.name] = TokenBucket(provider.rate_limit)
+
+    async def close(self):
+        """Close the shared HTTP connection pool"""
+        await self.client.aclose()
+
+    async def _lookup_one(
+        self, provider: ThreatIntelProvider, indicator_type: str, value: str, bulk: bool = False
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """Run one provider lookup through the cache, returning (result, error)"""
+        if self.cache is None or not provider.cacheable:
+            return await self._fetch(provider, indicator_type, value, bulk)
+        return await self.cache.get_or_fetch(
+            provider.name,
+            indicator_type,
+            value,
+            lambda: self._fetch(provider, indicator_type, value, bulk),
+        )
+
+    async def _fetch(
+        self, provider: ThreatIntelProvider, indicator_type: str, value: str, bulk: bool = False
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """
+        Query a provider upstream, returning (result, error)
+
+        Single lookups wait for their token within the provider timeout;
+        bulk lookups queue behind them without a deadline and then get the
+        full timeout for the request itself.
+        """
+        bucket = self.buckets[provider.name]
+        if bulk:
+            await bucket.acquire(priority=BULK_PRIORITY)
+
+        async def request() -> Dict[str, Any]:
+            if not bulk:
+                await bucket.acquire(priority=LOOKUP_PRIORITY)
+            return await provider.lookup(indicator_type, value, self.client)
+
+        try:
+            result = await asyncio.wait_for(request(), provider.timeout)
+            return result, None
+        except (asyncio.TimeoutError, httpx.TimeoutException):
+            return None, "timeout"
+        except Exception as e:
+            logger.warning("Provider %s failed for %s: %s", provider.name, value, e)
+            return None, str(e) or type(e).__name__
+
+    async def lookup(self, indicator: str) -> Dict[str, Any]:
+        """
+        Enrich an indicator from every provider that supports its type
+
+        Args:
+            indicator: Raw indicator value
+
+        Returns:
+            Dict with the normalized ``indicator``, its ``type``, per-provider
+            ``results`` and per-provider ``errors``
+        """
+        indicator_type, value = normalize_indicator(indicator)
+        providers = [p for p in self.providers.values() if p.supports(indicator_type)]
+        outcomes = await asyncio.gather(
+            *(self._lookup_one(provider, indicator_type, value) for provider in providers)
+        )
+
+        results, errors = {}, {}
+        for provider, (result, error) in zip(providers, outcomes):
+            if error is None:
+                results[provider.name] = result
+            else:
+                errors[provider.name] = error
+        return {"indicator": value, "type": indicator_type, "results": results, "errors": errors}
+
+    async def enrich_many(
+        self, indicators: Iterable[str], concurrency: Optional[int] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Enrich many indicators, yielding each result as soon as it is complete
+
+        Input is normalized and deduplicated first; unrecognised values are
+        yielded immediately with an ``invalid`` error. Providers with a bulk
+        endpoint receive batches, the rest get one request per indicator with
+        at most ``concurrency`` requests per provider waiting on its bucket.
+
+        Args:
+            indicators: Raw indicator values
+            concurrency: Per-provider cap on outstanding single lookups
+
+        Yields:
+            Dicts in the same shape as ``lookup``
+        """
+        concurrency = concurrency or settings.concurrency.intel_bulk
+        by_type: Dict[str, List[str]] = {}
+        seen = set()
+        for raw in indicators:
+            try:
+                indicator_type, value = normalize_indicator(raw)
+            except ValueError:
+                yield {"indicator": raw, "type": None, "results": {}, "errors": {"*": "invalid"}}
+                continue
+            if value not in seen:
+                seen.add(value)
+                by_type.setdefault(indicator_type, []).append(value)
+
+        records: Dict[str, Dict[str, Any]] = {}
+        remaining: Dict[str, int] = {}
+        for indicator_type, values in by_type.items():
+            count = sum(1 for p in self.providers.values() if p.supports(indicator_type))
+            for value in values:
+                records[value] = {
+                    "indicator": value,
+                    "type": indicator_type,
+                    "results": {},
+                    "errors": {},
+                }
+                remaining[value] = count
+                if count == 0:
+                    yield records.pop(value)
+
+        completed: asyncio.Queue = asyncio.Queue()
+        tasks: Dict[asyncio.Task, Tuple[str, List[str]]] = {}
+        for provider in self.providers.values():
+            for indicator_type, values in by_type.items():
+                if provider.supports(indicator_type):
+                    task = asyncio.create_task(self._enrich_provider(
+                        provider, indicator_type, values, concurrency, completed
+                    ))
+                    tasks[task] = (provider.name, values)
+
+        def settle(value: str, provider_name: str, outcome) -> Optional[Dict[str, Any]]:
+            """Record a provider outcome, returning the record once every provider answered"""
+            record = records.get(value)
+            if record is None or provider_name in record["results"] or (
+                provider_name in record["errors"]
+            ):
+                return None
+            result, error = outcome
+            if error is None:
+                record["results"][provider_name] = result
+            else:
+                record["errors"][provider_name] = error
+            remaining[value] -= 1
+            if remaining[value] == 0:
+                return records.pop(value)
+            return None
+
+        running = set(tasks)
+        getter: Optional[asyncio.Future] = None
+        try:
+            while records:
+                if getter is None:
+                    getter = asyncio.ensure_future(completed.get())
+                # Watch the provider tasks too, so one that crashes cannot leave us waiting
+                done, _ = await asyncio.wait(
+                    running | {getter}, return_when=asyncio.FIRST_COMPLETED
+                )
+                outcomes = []
+                if getter in done:
+                    outcomes.append(getter.result())
+                    getter = None
+                while not completed.empty():
+                    outcomes.append(completed.get_nowait())
+                for task in done & running:
+                    running.discard(task)
+                    if task.exception() is not None:
+                        provider_name, values = tasks[task]
+                        logger.warning(
+                            "Bulk enrichment with %s failed: %s", provider_name, task.exception()
+                        )
+                        error = str(task.exception()) or type(task.exception()).__name__
+                        # Values the provider already answered are skipped by settle()
+                        outcomes.extend((value, provider_name, (None, error)) for value in values)
+
+                for value, provider_name, outcome in outcomes:
+                    record = settle(value, provider_name, outcome)
+                    if record is not None:
+                        yield record
+        finally:
+            if getter is not None:
+                getter.cancel()
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _enrich_provider(
+        self,
+        provider: ThreatIntelProvider,
+        indicator_type: str,
+        values: List[str],
+        concurrency: int,
+        completed: asyncio.Queue,
+    ):
+        """Look up every value with one provider, reporting outcomes on ``completed``"""
+        if provider.max_batch_size > 1:
+            await self._enrich_bulk(provider, indicator_type, values, completed)
+            return
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def one(value: str):
+            async with semaphore:
+                outcome = await self._lookup_one(provider, indicator_type, value, bulk=True)
+            completed.put_nowait((value, provider.name, outcome))
+
+        async with asyncio.TaskGroup() as group:
+            for value in values:
+                group.create_task(one(value))
+
+    async def _enrich_bulk(
+        self,
+        provider: ThreatIntelProvider,
+        indicator_type: str,
+        values: List[str],
+        completed: asyncio.Queue,
+    ):
+        """Look up values through a provider's bulk endpoint, skipping cached ones"""
+        cache = self.cache if provider.cacheable else None
+        uncached = []
+        for value in values:
+            cached = None
+            if cache is not None:
+                cached = await cache.peek(provider.name, indicator_type, value)
+            if cached is None:
+                uncached.append(value)
+            else:
+                completed.put_nowait((value, provider.name, cached))
+
+        for start in range(0, len(uncached), provider.max_batch_size):
+            batch = uncached[start:start + provider.max_batch_size]
+            await self.buckets[provider.name].acquire(priority=BULK_PRIORITY)
+            try:
+                found = await asyncio.wait_for(
+                    provider.lookup_many(indicator_type, batch, self.client), provider.timeout
+                )
+                outcomes = {
+                    value: (found[value], None) if value in found else (None, "missing")
+                    for value in batch
+                }
+            except (asyncio.TimeoutError, httpx.TimeoutException):
+                outcomes = {value: (None, "timeout") for value in batch}
+            except Exception as e:
+                logger.warning("Bulk lookup with %s failed: %s", provider.name, e)
+                outcomes = {value: (None, str(e) or type(e).__name__) for value in batch}
+
+            for value, outcome in outcomes.items():
+                if cache is not None:
+                    await cache.store(provider.name, indicator_type, value, outcome)
+                completed.put_nowait((value, provider.name, outcome))
+
+
+def default_registry() -> ProviderRegistry:
+    """Build a registry with the local feed index, if built, and every configured API provider"""
+    config = get_settings()
+    registry = ProviderRegistry(cache=EnrichmentCache())
+    if (Path(config.feed_index_dir) / CURRENT_FILE).exists():
+        registry.register(LocalFeedProvider())
+    if config.abuseipdb_api_key:
+        registry.register(AbuseIPDBProvider(api_key=config.abuseipdb_api_key))
+    if config.threatfox_api_key:
+        registry.register(ThreatFoxProvider(api_key=config.threatfox_api_key))
+    return registry
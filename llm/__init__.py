@@ -0,0 +1 @@
+"""LLM clients, response caching and prompt templates"""
@@ -0,0 +1,285 @@
+"""
+Persistent response cache for LLM calls
+"""
+
+import hashlib
+import json
+import time
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+import redis.asyncio as aioredis
+
+from config.settings import settings
+from llm.gateway import LLMGateway, Priority
+from llm.prompt_templates.base import PromptTemplate
+from memory.redis_store import get_async_pool
+
+
+ENTRY_KEY = "llm:cache:{digest}"
+INDEX_KEY = "llm:cache:index"
+VECTORS_KEY = "llm:cache:vectors:{scope}"
+STATS_KEY = "llm:stats:{investigation_id}"
+
+
+def _unit(vector: List[float]) -> Optional[np.ndarray]:
+    """Vector scaled to unit length, or None for a zero vector"""
+    array = np.asarray(vector, dtype=np.float32)
+    norm = np.linalg.norm(array)
+    return array / norm if norm else None
+
+
+class _VectorIndex:
+    """
+    Ring of unit-length prompt embeddings for one semantic scope
+
+    Rows live in one preallocated matrix, so a lookup is a single
+    matrix-vector product; once full, each new vector overwrites the oldest.
+    """
+
+    def __init__(self, capacity: int, dimensions: int):
+        self.matrix = np.zeros((capacity, dimensions), dtype=np.float32)
+        self.digests: List[Optional[str]] = [None] * capacity
+        self.slots: Dict[str, int] = {}
+        self._next = 0
+
+    def add(self, digest: str, vector: np.ndarray) -> Optional[str]:
+        """Store a unit vector, returning the digest of the one it displaced"""
+        if digest in self.slots:
+            slot = self.slots[digest]
+        else:
+            slot = self._next
+            self._next = (slot + 1) % len(self.digests)
+        displaced = self.digests[slot]
+        if displaced is not None and displaced != digest:
+            del self.slots[displaced]
+        self.matrix[slot] = vector
+        self.digests[slot] = digest
+        self.slots[digest] = slot
+        return displaced if displaced != digest else None
+
+    def remove(self, digest: str):
+        """Forget a vector so it stops matching"""
+        slot = self.slots.pop(digest, None)
+        if slot is not None:
+            self.matrix[slot] = 0
+            self.digests[slot] = None
+
+    def best(self, vector: np.ndarray, threshold: float) -> Optional[str]:
+        """Digest of the most similar stored vector at or above ``threshold``"""
+        if not self.slots or vector.shape[0] != self.matrix.shape[1]:
+            return None
+        # Rows and query are unit length, so dot products are cosine similarities
+        scores = self.matrix @ vector
+        slot = int(np.argmax(scores))
+        return self.digests[slot] if scores[slot] >= threshold else None
+
+
+class LLMCache:
+    """
+    Redis-backed cache of LLM responses
+
+    The exact tier is keyed on model, template name and version, and the
+    rendered prompt. Entries expire after ``ttl`` seconds, and a sorted set of
+    last-access times evicts the least recently used entries once there are
+    more than ``max_entries``.
+
+    The optional semantic tier keeps prompt embeddings per model/template
+    scope and reuses the response of the most similar cached prompt above
+    ``threshold`` cosine similarity. Vectors are persisted in Redis and
+    loaded on first use of a scope into a NumPy matrix, so a lookup
+    compares against every cached prompt in one matrix-vector product.
+    """
+
+    def __init__(
+        self,
+        client: Optional[aioredis.Redis] = None,
+        ttl: Optional[int] = None,
+        max_entries: Optional[int] = None,
+        threshold: Optional[float] = None,
+        max_vectors: Optional[int] = None,
+    ):
+        self.client = client or aioredis.Redis(connection_pool=get_async_pool())
+        self.ttl = ttl or settings.ttls.llm_response
+        self.max_entries = max_entries or settings.llm_cache_max_entries
+        self.threshold = threshold or settings.llm_semantic_threshold
+        self.max_vectors = max_vectors or settings.llm_semantic_max_entries
+        self._vectors: Dict[str, Optional[_VectorIndex]] = {}
+
+    @staticmethod
+    def key(model: str, template: PromptTemplate, prompt: str) -> str:
+        """Digest identifying an exact prompt"""
+        material = f"{model}\x00{template.name}:{template.version}\x00{prompt}"
+        return hashlib.sha256(material.encode()).hexdigest()
+
+    @staticmethod
+    def scope(model: str, template: PromptTemplate) -> str:
+        """Semantic tier partition; only prompts from the same template are compared"""
+        return f"{model}:{template.name}:{template.version}"
+
+    async def get(self, digest: str) -> Optional[Dict[str, Any]]:
+        """Fetch a cached entry and refresh its recency"""
+        async with self.client.pipeline(transaction=False) as pipe:
+            pipe.get(ENTRY_KEY.format(digest=digest))
+            pipe.zadd(INDEX_KEY, {digest: time.time()}, xx=True)
+            raw, _ = await pipe.execute()
+        return json.loads(raw) if raw else None
+
+    async def set(
+        self,
+        digest: str,
+        entry: Dict[str, Any],
+        scope: Optional[str] = None,
+        vector: Optional[List[float]] = None,
+    ):
+        """Store an entry, evicting the least recently used beyond ``max_entries``"""
+        now = time.time()
+        async with self.client.pipeline(transaction=False) as pipe:
+            pipe.set(ENTRY_KEY.format(digest=digest), json.dumps(entry), ex=self.ttl)
+            pipe.zadd(INDEX_KEY, {digest: now})
+            # Index members whose entry has already expired
+            pipe.zremrangebyscore(INDEX_KEY, "-inf", now - self.ttl)
+            pipe.zcard(INDEX_KEY)
+            if vector is not None:
+                pipe.hset(VECTORS_KEY.format(scope=scope), digest, json.dumps(vector))
+            results = await pipe.execute()
+
+        overflow = results[3] - self.max_entries
+        if overflow > 0:
+            evicted = [member for member, _ in await self.client.zpopmin(INDEX_KEY, overflow)]
+            if evicted:
+                await self.client.delete(*(ENTRY_KEY.format(digest=d) for d in evicted))
+
+        unit = _unit(vector) if vector is not None else None
+        if unit is not None:
+            index = await self._load_vectors(scope)
+            if index is None or index.matrix.shape[1] != unit.shape[0]:
+                # First vector in the scope, or the embedding model changed
+                index = self._vectors[scope] = _VectorIndex(self.max_vectors, unit.shape[0])
+            displaced = index.add(digest, unit)
+            if displaced is not None:
+                await self.client.hdel(VECTORS_KEY.format(scope=scope), displaced)
+
+    async def _load_vectors(self, scope: str) -> Optional[_VectorIndex]:
+        """Return the in-process index for a scope, loading it from Redis once"""
+        if scope not in self._vectors:
+            stored = await self.client.hgetall(VECTORS_KEY.format(scope=scope))
+            index = None
+            for digest, raw in list(stored.items())[-self.max_vectors:]:
+                unit = _unit(json.loads(raw))
+                if unit is None:
+                    continue
+                if index is None:
+                    index = _VectorIndex(self.max_vectors, unit.shape[0])
+                if unit.shape[0] == index.matrix.shape[1]:
+                    index.add(digest, unit)
+            self._vectors[scope] = index
+        return self._vectors[scope]
+
+    async def find_similar(self, scope: str, vector: List[float]) -> Optional[Dict[str, Any]]:
+        """Return the cached entry for the most similar prompt above the threshold"""
+        index = await self._load_vectors(scope)
+        query = _unit(vector)
+        if index is None or query is None:
+            return None
+
+        best_digest = index.best(query, self.threshold)
+        if best_digest is None:
+            return None
+
+        entry = await self.get(best_digest)
+        if entry is None:
+            # Expired or evicted; forget the vector so it stops matching
+            index.remove(best_digest)
+            await self.client.hdel(VECTORS_KEY.format(scope=scope), best_digest)
+        return entry
+
+    async def record(
+        self, investigation_id: Optional[str], outcome: str, saved_ms: float = 0.0
+    ):
+        """Count a cache outcome (``hits``, ``semantic_hits`` or ``misses``) for an investigation"""
+        if investigation_id is None:
+            return
+        key = STATS_KEY.format(investigation_id=investigation_id)
+        async with self.client.pipeline(transaction=False) as pipe:
+            pipe.hincrby(key, outcome, 1)
+            if saved_ms:
+                pipe.hincrbyfloat(key, "saved_ms", saved_ms)
+            pipe.expire(key, self.ttl)
+            await pipe.execute()
+
+    async def get_stats(self, investigation_id: str) -> Dict[str, float]:
+        """Return hit counts, hit rate and saved milliseconds for an investigation"""
+        raw = await self.client.hgetall(STATS_KEY.format(investigation_id=investigation_id))
+        stats = {
+            "hits": int(raw.get("hits", 0)),
+            "semantic_hits": int(raw.get("semantic_hits", 0)),
+            "misses": int(raw.get("misses", 0)),
+            "saved_ms": float(raw.get("saved_ms", 0.0)),
+        }
+        total = stats["hits"] + stats["semantic_hits"] + stats["misses"]
+        stats["hit_rate"] = (stats["hits"] + stats["semantic_hits"]) / total if total else 0.0
+        return stats
+
+
+class CachedLLMClient:
+    """LLM gateway client that answers repeated prompts from ``LLMCache``"""
+
+    def __init__(
+        self,
+        client: Optional[LLMGateway] = None,
+        cache: Optional[LLMCache] = None,
+        semantic: Optional[bool] = None,
+    ):
+        self.client = client or LLMGateway()
+        self.cache = cache or LLMCache()
+        self.semantic = settings.llm_semantic_cache_enabled if semantic is None else semantic
+
+    async def generate(
+        self,
+        template: PromptTemplate,
+        variables: Dict[str, Any],
+        investigation_id: Optional[str] = None,
+        model: Optional[str] = None,
+        priority: Priority = Priority.BACKGROUND,
+    ) -> str:
+        """
+        Render a template and generate a response, reusing cached answers
+
+        Args:
+            template: Prompt template to render
+            variables: Template variables
+            investigation_id: Investigation to attribute cache statistics to
+            model: Model override; defaults to the client model
+            priority: Gateway scheduling priority on a cache miss
+
+        Returns:
+            Generated (or cached) response text
+        """
+        model = model or self.client.model
+        prompt = template.render(**variables)
+        digest = LLMCache.key(model, template, prompt)
+
+        entry = await self.cache.get(digest)
+        if entry is not None:
+            await self.cache.record(investigation_id, "hits", entry["duration_ms"])
+            return entry["response"]
+
+        scope = vector = None
+        if self.semantic:
+            scope = LLMCache.scope(model, template)
+            vector = (await self.client.embed([prompt], priority=priority))[0]
+            entry = await self.cache.find_similar(scope, vector)
+            if entry is not None:
+                await self.cache.record(investigation_id, "semantic_hits", entry["duration_ms"])
+                return entry["response"]
+
+        result = await self.client.generate(prompt, model=model, priority=priority)
+        await self.cache.set(
+            digest,
+            {"response": result["response"], "duration_ms": result["duration_ms"]},
+            scope=scope,
+            vector=vector,
+        )
+        await self.cache.record(investigation_id, "misses")
+        return result["response"]
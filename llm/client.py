@@ -0,0 +1,55 @@
+"""
+Ollama client used by all agents
+"""
+
+import time
+from typing import Dict, Any, AsyncIterator, List, Optional
+
+from ollama import AsyncClient
+
+from config.settings import settings
+
+
+class OllamaClient:
+    """Thin async wrapper over the Ollama API that records generation latency"""
+
+    def __init__(self, base_url: Optional[str] = None, model: Optional[str] = None):
+        self.model = model or settings.ollama_model
+        self.embed_model = settings.ollama_embed_model
+        self.client = AsyncClient(
+            host=base_url or settings.ollama_base_url,
+            timeout=settings.ollama_timeout,
+        )
+
+    async def generate(
+        self, prompt: str, model: Optional[str] = None, **options: Any
+    ) -> Dict[str, Any]:
+        """
+        Generate a completion
+
+        Returns:
+            Dict with ``response``, ``model`` and wall-clock ``duration_ms``
+        """
+        model = model or self.model
+        started = time.perf_counter()
+        result = await self.client.generate(model=model, prompt=prompt, options=options or None)
+        return {
+            "response": result["response"],
+            "model": model,
+            "duration_ms": (time.perf_counter() - started) * 1000,
+        }
+
+    async def stream(
+        self, prompt: str, model: Optional[str] = None, **options: Any
+    ) -> AsyncIterator[str]:
+        """Generate a completion, yielding response tokens as they arrive"""
+        parts = await self.client.generate(
+            model=model or self.model, prompt=prompt, options=options or None, stream=True
+        )
+        async for part in parts:
+            yield part["response"]
+
+    async def embed(self, texts: List[str], model: Optional[str] = None) -> List[List[float]]:
+        """Embed a batch of texts in a single request"""
+        result = await self.client.embed(model=model or self.embed_model, input=texts)
+        return [list(vector) for vector in result["embeddings"]]
@@ -0,0 +1,205 @@
+"""
+Token-budgeted prompt context built from investigation memory
+"""
+
+import json
+import re
+from collections import Counter
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple
+
+from config.settings import settings
+from llm.prompt_templates.base import PromptTemplate
+
+
+SEVERITY_WEIGHTS = {"critical": 5.0, "high": 4.0, "medium": 2.5, "low": 1.5, "info": 1.0}
+
+# Finding fields that vary between otherwise identical findings
+_VOLATILE_FIELDS = {"id", "timestamp", "agent", "created_at"}
+_WORD_RE = re.compile(r"[a-z0-9_.:-]{3,}")
+_SECTION_OVERHEAD = 24
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count for budget checks (about four characters per token)"""
+    return len(text) // 4 + 1
+
+
+def _compact(value: Any) -> str:
+    """Render a value as compact single-line JSON"""
+    return json.dumps(value, separators=(",", ":"), sort_keys=True, default=str)
+
+
+def _finding_text(finding: Dict[str, Any]) -> str:
+    """Short human-readable line for a finding"""
+    summary = finding.get("summary") or finding.get("description") or finding.get("title")
+    parts = [f"[{finding.get('severity', 'info')}]", str(finding.get("type", "finding"))]
+    if finding.get("indicator"):
+        parts.append(str(finding["indicator"]))
+    if summary:
+        parts.append(f"- {summary}")
+    else:
+        skip = _VOLATILE_FIELDS | {"severity", "type"}
+        parts.append(_compact({k: v for k, v in finding.items() if k not in skip}))
+    return " ".join(parts)
+
+
+def _event_text(event: Dict[str, Any]) -> str:
+    """Short human-readable line for a timeline event"""
+    label = event.get("type") or event.get("event") or "event"
+    detail = event.get("description") or event.get("summary")
+    if detail is None:
+        detail = _compact({k: v for k, v in event.items() if k not in ("timestamp", "type")})
+    return f"{event.get('timestamp', '?')} {label}: {detail}"
+
+
+class ContextBuilder:
+    """
+    Compacts an investigation context to fit a prompt's token budget
+
+    Duplicate findings are collapsed into one entry with a count, then
+    ranked by severity, overlap with the query and recency. The most recent
+    timeline events are kept verbatim while older ones are folded into
+    fixed-size segment summaries. The result never exceeds the template's
+    budget, keeping prompt size and generation time flat as investigations
+    grow.
+    """
+
+    def __init__(
+        self,
+        default_budget: Optional[int] = None,
+        recent_events: Optional[int] = None,
+        segment_size: Optional[int] = None,
+        findings_share: float = 0.6,
+        recency_half_life: int = 50,
+    ):
+        self.default_budget = default_budget or settings.llm_context_budget
+        self.recent_events = recent_events or settings.llm_context_recent_events
+        self.segment_size = segment_size or settings.llm_context_segment_size
+        self.findings_share = findings_share
+        self.recency_half_life = recency_half_life
+
+    def _collapse(self, findings: List[Dict[str, Any]]) -> List[Tuple[int, Dict[str, Any], int]]:
+        """Group identical findings, returning (latest position, finding, count)"""
+        groups: Dict[str, List[Any]] = {}
+        for position, finding in enumerate(findings):
+            key = _compact({k: v for k, v in finding.items() if k not in _VOLATILE_FIELDS})
+            if key in groups:
+                groups[key][0] = position
+                groups[key][1] = finding
+                groups[key][2] += 1
+            else:
+                groups[key] = [position, finding, 1]
+        return [tuple(group) for group in groups.values()]
+
+    def rank_findings(
+        self, findings: List[Dict[str, Any]], query: Optional[str] = None
+    ) -> List[Tuple[Dict[str, Any], int]]:
+        """Collapse duplicates and order findings by relevance, returning (finding, count)"""
+        query_terms = set(_WORD_RE.findall(query.lower())) if query else set()
+        latest = len(findings) - 1
+        scored = []
+        for position, finding, count in self._collapse(findings):
+            severity = SEVERITY_WEIGHTS.get(str(finding.get("severity", "info")).lower(), 1.0)
+            recency = 0.5 ** ((latest - position) / self.recency_half_life)
+            overlap = 0
+            if query_terms:
+                overlap = len(query_terms & set(_WORD_RE.findall(_compact(finding).lower())))
+            score = severity * (1.0 + overlap) * (0.5 + recency)
+            scored.append((score, position, finding, count))
+        scored.sort(key=lambda item: (item[0], item[1]), reverse=True)
+        return [(finding, count) for _, _, finding, count in scored]
+
+    @staticmethod
+    def _segment_summary(events: List[Dict[str, Any]]) -> str:
+        """One-line summary of a full timeline segment"""
+        counts = Counter(str(e.get("type") or e.get("event") or "event") for e in events)
+        top = ", ".join(f"{kind} x{count}" for kind, count in counts.most_common(5))
+        first, last = events[0].get("timestamp", "?"), events[-1].get("timestamp", "?")
+        return f"{first} .. {last}: {len(events)} events ({top})"
+
+    def _timeline_lines(
+        self, timeline: List[Dict[str, Any]]
+    ) -> Tuple[List[str], Iterator[str]]:
+        """
+        Recent events verbatim (newest first) and older segment summaries (newest first)
+
+        Summaries are produced lazily, so only the segments that fit the
+        budget are ever summarized.
+        """
+        cut = max(0, len(timeline) - self.recent_events)
+        recent = [_event_text(event) for event in reversed(timeline[cut:])]
+        # Only full segments are summarized; the partial tail rolls into the recent window
+        full = cut // self.segment_size
+        older = (
+            self._segment_summary(timeline[i * self.segment_size:(i + 1) * self.segment_size])
+            for i in range(full - 1, -1, -1)
+        )
+        partial = timeline[full * self.segment_size:cut]
+        if partial:
+            recent.extend(_event_text(event) for event in reversed(partial))
+        return recent, older
+
+    def build(
+        self,
+        context: Dict[str, Any],
+        query: Optional[str] = None,
+        template: Optional[PromptTemplate] = None,
+        budget: Optional[int] = None,
+    ) -> str:
+        """
+        Render an investigation context within a token budget
+
+        Args:
+            context: Context from ``get_context``
+            query: Current question, used to rank findings by relevance
+            template: Prompt template whose ``context_budget`` applies
+            budget: Explicit token budget, overriding the template's
+
+        Returns:
+            Prompt-ready context text
+        """
+        budget = budget or (template.context_budget if template else None) or self.default_budget
+        investigation_id = context.get("investigation_id", "")
+        metadata = context.get("metadata", {})
+        findings = context.get("findings", [])
+        timeline = context.get("timeline", [])
+
+        header = f"Investigation {investigation_id}: {metadata.get('query', '')}".strip()
+        lines = [header]
+        # Reserve room for the section headings and the omitted-findings note
+        used = estimate_tokens(header) + _SECTION_OVERHEAD
+
+        def take(candidates: Iterable[str], limit: int) -> List[str]:
+            nonlocal used
+            taken = []
+            for line in candidates:
+                cost = estimate_tokens(line) + 1
+                if used + cost > limit:
+                    break
+                taken.append(line)
+                used += cost
+            return taken
+
+        ranked = [
+            _finding_text(finding) + (f" (x{count})" if count > 1 else "")
+            for finding, count in self.rank_findings(findings, query or metadata.get("query"))
+        ]
+        recent, older = self._timeline_lines(timeline)
+
+        # Findings get their share first, the timeline gets the rest, then findings backfill
+        chosen = take(ranked, int(budget * self.findings_share))
+        recent_taken = take(recent, budget)
+        older_taken = take(older, budget) if len(recent_taken) == len(recent) else []
+        chosen += take(ranked[len(chosen):], budget)
+
+        if chosen:
+            omitted = len(ranked) - len(chosen)
+            lines.append(f"Findings ({len(chosen)} of {len(ranked)} shown):")
+            lines.extend(f"- {line}" for line in chosen)
+            if omitted:
+                lines.append(f"- ... {omitted} lower-priority findings omitted")
+        if older_taken or recent_taken:
+            lines.append("Timeline:")
+            lines.extend(f"- {line}" for line in reversed(older_taken))
+            lines.extend(f"- {line}" for line in reversed(recent_taken))
+        return "\n".join(lines)
@@ -0,0 +1,205 @@
+"""
+Concurrency-governed gateway in front of the Ollama client
+"""
+
+import asyncio
+import itertools
+from enum import IntEnum
+from typing import Dict, Any, AsyncIterator, Awaitable, Callable, List, Optional, Set, Tuple
+
+from config.settings import settings
+from llm.client import OllamaClient
+
+
+class Priority(IntEnum):
+    """Scheduling priority; lower values are dispatched first"""
+
+    INTERACTIVE = 0
+    BACKGROUND = 10
+
+
+_END = object()
+
+
+class LLMGateway:
+    """
+    Single entry point for LLM calls from every agent
+
+    At most ``max_in_flight`` requests reach Ollama at once; the rest wait in
+    a bounded priority queue so interactive investigations overtake
+    background enrichment and callers block instead of all timing out
+    together. Embedding requests arriving within ``embed_batch_wait_ms`` of
+    each other are merged into a single Ollama call.
+    """
+
+    def __init__(
+        self,
+        client: Optional[OllamaClient] = None,
+        max_in_flight: Optional[int] = None,
+        max_queued: Optional[int] = None,
+        embed_batch_size: Optional[int] = None,
+        embed_batch_wait_ms: Optional[int] = None,
+    ):
+        self.client = client or OllamaClient()
+        self.max_in_flight = max_in_flight or settings.concurrency.llm_in_flight
+        self.max_queued = max_queued or settings.concurrency.llm_queued
+        self.embed_batch_size = embed_batch_size or settings.llm_embed_batch_size
+        self.embed_batch_wait = (embed_batch_wait_ms or settings.llm_embed_batch_wait_ms) / 1000
+        self.in_flight = 0
+        self._seq = itertools.count()
+        self._queue: Optional[asyncio.PriorityQueue] = None
+        self._embed_queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._batches: Set[asyncio.Task] = set()
+
+    @property
+    def model(self) -> str:
+        """Default generation model"""
+        return self.client.model
+
+    def _ensure_started(self):
+        """Start dispatcher tasks on the running loop on first use"""
+        if self._tasks:
+            return
+        self._queue = asyncio.PriorityQueue(self.max_queued)
+        self._embed_queue = asyncio.Queue()
+        self._tasks = [asyncio.create_task(self._dispatch()) for _ in range(self.max_in_flight)]
+        self._tasks.append(asyncio.create_task(self._batch_embeddings()))
+
+    async def close(self):
+        """Cancel dispatcher tasks; queued requests are abandoned"""
+        tasks = self._tasks + list(self._batches)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks = []
+        self._batches.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Return current in-flight and queued request counts"""
+        return {
+            "in_flight": self.in_flight,
+            "queued": self._queue.qsize() if self._queue else 0,
+        }
+
+    async def _submit(self, priority: Priority, work: Callable[[], Awaitable[Any]]) -> Any:
+        """Queue work and wait for a dispatcher to run it"""
+        self._ensure_started()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((priority, next(self._seq), work, future))
+        return await future
+
+    async def _dispatch(self):
+        """Run queued work one item at a time, highest priority first"""
+        while True:
+            _, _, work, future = await self._queue.get()
+            if future.done():
+                # Caller gave up while queued
+                continue
+            self.in_flight += 1
+            try:
+                result = await work()
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+            else:
+                if not future.done():
+                    future.set_result(result)
+            finally:
+                self.in_flight -= 1
+
+    async def generate(
+        self,
+        prompt: str,
+        model: Optional[str] = None,
+        priority: Priority = Priority.BACKGROUND,
+        **options: Any,
+    ) -> Dict[str, Any]:
+        """Generate a completion once a slot is free"""
+        return await self._submit(
+            priority, lambda: self.client.generate(prompt, model=model, **options)
+        )
+
+    async def stream(
+        self,
+        prompt: str,
+        model: Optional[str] = None,
+        priority: Priority = Priority.INTERACTIVE,
+        **options: Any,
+    ) -> AsyncIterator[str]:
+        """Generate a completion, yielding tokens once a slot is free"""
+        tokens: asyncio.Queue = asyncio.Queue()
+        abandoned = asyncio.Event()
+
+        async def work():
+            try:
+                async for token in self.client.stream(prompt, model=model, **options):
+                    if abandoned.is_set():
+                        break
+                    tokens.put_nowait(token)
+            finally:
+                tokens.put_nowait(_END)
+
+        submitted = asyncio.ensure_future(self._submit(priority, work))
+        try:
+            while True:
+                token = await tokens.get()
+                if token is _END:
+                    break
+                yield token
+            # Surface errors raised by the generation
+            await submitted
+        finally:
+            abandoned.set()
+            if not submitted.done():
+                submitted.cancel()
+
+    async def embed(
+        self, texts: List[str], priority: Priority = Priority.BACKGROUND
+    ) -> List[List[float]]:
+        """Embed texts, batched with other concurrent embedding requests"""
+        self._ensure_started()
+        future = asyncio.get_running_loop().create_future()
+        await self._embed_queue.put((priority, texts, future))
+        return await future
+
+    async def _batch_embeddings(self):
+        """Collect embedding requests into batches and submit each as one call"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._embed_queue.get()]
+            size = len(batch[0][1])
+            deadline = loop.time() + self.embed_batch_wait
+            while size < self.embed_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._embed_queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                batch.append(item)
+                size += len(item[1])
+
+            # Keep collecting the next batch while this one waits for a slot
+            task = asyncio.create_task(self._run_embed_batch(batch))
+            self._batches.add(task)
+            task.add_done_callback(self._batches.discard)
+
+    async def _run_embed_batch(self, batch: List[Tuple[Priority, List[str], asyncio.Future]]):
+        """Embed a merged batch and hand each caller its slice of the vectors"""
+        texts = [text for _, item_texts, _ in batch for text in item_texts]
+        priority = min(item_priority for item_priority, _, _ in batch)
+        try:
+            vectors = await self._submit(priority, lambda: self.client.embed(texts))
+        except Exception as e:
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        offset = 0
+        for _, item_texts, future in batch:
+            if not future.done():
+                future.set_result(vectors[offset:offset + len(item_texts)])
+            offset += len(item_texts)
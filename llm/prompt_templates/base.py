@@ -0,0 +1,27 @@
+"""
+Versioned prompt template definition
+"""
+
+from dataclasses import dataclass
+from typing import Any, Optional
+
+
+@dataclass(frozen=True)
+class PromptTemplate:
+    """
+    A named prompt with an explicit version
+
+    Bump ``version`` whenever the template text changes meaning, so cached
+    responses rendered from the old wording are no longer reused.
+    ``context_budget`` caps the tokens of investigation context placed in
+    the prompt; None uses the ``llm_context_budget`` setting.
+    """
+
+    name: str
+    version: str
+    template: str
+    context_budget: Optional[int] = None
+
+    def render(self, **variables: Any) -> str:
+        """Fill the template with the given variables"""
+        return self.template.format(**variables)
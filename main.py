@@ -1,35 +1,174 @@
 #!/usr/bin/env python3
 """
 The Warden V2 - Main Entry Point
+
+Only click and the standard library are imported at module level; each
+command imports what it needs when it runs, so ``warden --help`` and
+argument errors stay fast however heavy the command's dependencies are.
 """
 
-import asyncio
-from rich.console import Console
-from rich.panel import Panel
+import json
+import sys
+from typing import Any, Coroutine, Optional, Tuple
 
-console = Console()
+import click
 
 
-async def main():
-    """Main entry point for The Warden V2"""
-    
-    console.print(Panel.fit(
-        "[bold cyan]The Warden V2[/bold cyan]\n"
-        "[yellow]AI-Powered Security Monitoring[/yellow]\n\n"
-        "[dim]Status: Under Development 🚧[/dim]",
-        border_style="cyan"
-    ))
-    
-    console.print("\n[yellow]⚠️  This is a placeholder. Implementation coming soon![/yellow]\n")
-    
-    # TODO: Initialize orchestrator
-    # TODO: Load configuration
-    # TODO: Start API server
-    # TODO: Begin monitoring
+def _echo_json(data: Any):
+    """Print a result as indented JSON"""
+    click.echo(json.dumps(data, indent=2, default=str))
 
 
-if __name__ == "__main__":
+def _run(coro: Coroutine) -> Any:
+    """Run a coroutine, exiting quietly on Ctrl-C"""
+    import asyncio
+
     try:
-        asyncio.run(main())
+        return asyncio.run(coro)
     except KeyboardInterrupt:
-        console.print("\n[yellow]Shutting down...[/yellow]")
+        click.echo("Shutting down...", err=True)
+        sys.exit(130)
+
+
+@click.group(context_settings={"help_option_names": ["-h", "--help"]})
+@click.version_option("2.0.0-alpha", prog_name="warden")
+def cli():
+    """The Warden V2 - AI-Powered Security Monitoring"""
+
+
+@cli.command()
+@click.argument("query")
+@click.option("--id", "investigation_id", help="Investigation ID to use instead of a new one.")
+@click.option("--enqueue", is_flag=True, help="Queue for a worker instead of running here.")
+def investigate(query: str, investigation_id: Optional[str], enqueue: bool):
+    """Investigate QUERY and print the results."""
+
+    async def run():
+        if enqueue:
+            import uuid
+
+            from core.work_queue import RedisStreamWorkQueue
+            from memory.redis_store import close_async_pool
+
+            payload = {"query": query, "investigation_id": investigation_id or uuid.uuid4().hex}
+            try:
+                job_id = await RedisStreamWorkQueue().put(payload)
+            finally:
+                await close_async_pool()
+            return {"investigation_id": payload["investigation_id"], "job_id": job_id}
+
+        from core.orchestrator import Orchestrator
+
+        orchestrator = Orchestrator()
+        await orchestrator.start()
+        try:
+            return await orchestrator.investigate(query, investigation_id=investigation_id)
+        finally:
+            await orchestrator.close()
+
+    _echo_json(_run(run()))
+
+
+@cli.command()
+@click.option("--host", help="Bind address [default: API_HOST].")
+@click.option("--port", type=int, help="Port [default: API_PORT].")
+@click.option("--workers", type=int, default=1, show_default=True, help="Server processes.")
+@click.option("--reload", is_flag=True, help="Restart on code changes (development).")
+def serve(host: Optional[str], port: Optional[int], workers: int, reload: bool):
+    """Run the HTTP API."""
+    import uvicorn
+
+    from config.settings import settings
+
+    uvicorn.run(
+        "api.app:app",
+        host=host or settings.api_host,
+        port=port or settings.api_port,
+        workers=workers,
+        reload=reload,
+        log_level=settings.log_level.lower(),
+    )
+
+
+@cli.command()
+@click.option("--processes", type=int, help="Worker processes [default: WORKER_PROCESSES].")
+@click.option("--concurrency", type=int,
+              help="Investigations per process [default: WORKER_CONCURRENCY].")
+def worker(processes: Optional[int], concurrency: Optional[int]):
+    """Run investigation workers against the Redis queue."""
+    from core.work_queue import main as run_workers
+
+    try:
+        run_workers(processes, concurrency)
+    except KeyboardInterrupt:
+        click.echo("Shutting down...", err=True)
+
+
+@cli.command()
+@click.argument("indicators", nargs=-1)
+@click.option("--file", "source", type=click.File("r"),
+              help="Read indicators from a file, one per line ('-' for stdin).")
+def enrich(indicators: Tuple[str, ...], source):
+    """Look up INDICATORS in every configured threat intel provider.
+
+    Prints one JSON object per indicator as soon as its lookups complete.
+    """
+    values = list(indicators)
+    if source is not None:
+        values += [line.strip() for line in source if line.strip()]
+    if not values:
+        raise click.UsageError("Give at least one indicator or --file.")
+
+    async def run():
+        from intelligence.registry import default_registry
+
+        registry = default_registry()
+        try:
+            async for result in registry.enrich_many(values):
+                click.echo(json.dumps(result, default=str))
+        finally:
+            await registry.close()
+
+    _run(run())
+
+
+@cli.command()
+@click.argument("investigation_id")
+@click.option("--format", "fmt", type=click.Choice(["markdown", "html", "pdf"]),
+              default="markdown", show_default=True)
+@click.option("--output", "-o", type=click.Path(dir_okay=False, writable=True),
+              help="Write to a file instead of stdout (required for PDF).")
+def report(investigation_id: str, fmt: str, output: Optional[str]):
+    """Render the report for INVESTIGATION_ID."""
+    if fmt == "pdf" and not output:
+        raise click.UsageError("PDF reports need --output.")
+
+    async def run():
+        import asyncio
+
+        from memory.redis_store import AsyncRedisMemoryStore, close_async_pool
+        from reports.builder import ReportBuilder
+
+        builder = ReportBuilder()
+        try:
+            data = await builder.collect(AsyncRedisMemoryStore(), investigation_id)
+        finally:
+            await close_async_pool()
+        if data is None:
+            raise click.ClickException(f"Investigation {investigation_id} not found")
+
+        if fmt == "pdf":
+            from reports.formatters.pdf import render_pdf
+
+            size = await asyncio.to_thread(render_pdf, builder.render(data, "html"), output)
+            click.echo(f"Wrote {output} ({size} bytes)", err=True)
+            return
+        with click.open_file(output or "-", "w") as stream:
+            for chunk in builder.stream(data, fmt):
+                stream.write(chunk)
+
+    _run(run())
+
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1 @@
+"""Package: mcp_servers"""
@@ -0,0 +1,232 @@
+"""
+Shared runtime keeping MCP tool handlers warm between calls
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, List, Optional, Sequence, Type
+
+from config.settings import settings
+from mcp_servers.tools.base import Tool
+from utils.cache import LRUTTLCache
+
+logger = logging.getLogger(__name__)
+
+
+def _prepare_process(tool_types: Sequence[Type[Tool]]):
+    """Process-pool initializer: preload every CPU-bound tool once per worker"""
+    for tool_type in tool_types:
+        tool_type.prepare_process()
+
+
+def _call_key(name: str, arguments: Dict[str, Any]) -> bytes:
+    """Fixed-size key for a tool call, a digest of its canonical arguments"""
+    encoded = json.dumps([name, arguments], sort_keys=True, separators=(",", ":"))
+    return hashlib.blake2b(encoded.encode(), digest_size=16).digest()
+
+
+def _ping() -> bool:
+    """No-op used to make sure pool workers have started"""
+    return True
+
+
+class ToolRuntime:
+    """
+    Long-lived host for tool handlers
+
+    Tools are set up once, so HTTP clients stay connected and indexes stay
+    loaded across calls. CPU-bound tools run in a process pool that is
+    started and warmed with the runtime, keeping them off the event loop
+    without paying process start-up per call. Results of cacheable tools
+    are memoized under a digest of the canonical argument set, so a call
+    carrying thousands of events costs 16 bytes of key, and identical
+    concurrent calls share one execution.
+    """
+
+    def __init__(
+        self,
+        tools: Optional[List[Tool]] = None,
+        processes: Optional[int] = None,
+        cache_size: Optional[int] = None,
+        cache_ttl: Optional[float] = None,
+    ):
+        self.tools: Dict[str, Tool] = {}
+        self.processes = processes or settings.pools.mcp_tool_processes
+        self.cache = LRUTTLCache(
+            max_size=cache_size or settings.mcp_tool_cache_size,
+            ttl=cache_ttl or settings.ttls.mcp_tool,
+        )
+        self.calls = 0
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._inflight: Dict[bytes, asyncio.Future] = {}
+        # Set only once every tool is set up and the pool is warm
+        self._started = False
+        self._start_lock = asyncio.Lock()
+        for tool in tools or []:
+            self.register(tool)
+
+    def register(self, tool: Tool):
+        """Add a tool; must be called before ``start``"""
+        if self._started or self._start_lock.locked():
+            raise RuntimeError("Tools must be registered before the runtime starts")
+        self.tools[tool.name] = tool
+
+    def list_tools(self) -> List[Dict[str, Any]]:
+        """Tool descriptions in MCP ``tools/list`` form"""
+        return [
+            {"name": tool.name, "description": tool.description, "inputSchema": tool.input_schema}
+            for tool in self.tools.values()
+        ]
+
+    async def start(self):
+        """
+        Set up every tool and start the process pool
+
+        Concurrent callers, including the first calls arriving before an
+        explicit ``start``, wait for the one start-up to finish. If start-up
+        fails, whatever was set up is closed again so a later call retries.
+        """
+        async with self._start_lock:
+            if self._started:
+                return
+            try:
+                await asyncio.gather(*(tool.setup() for tool in self.tools.values()))
+
+                cpu_tools = [type(tool) for tool in self.tools.values() if tool.cpu_bound]
+                if cpu_tools:
+                    self._pool = ProcessPoolExecutor(
+                        max_workers=self.processes,
+                        mp_context=multiprocessing.get_context("spawn"),
+                        initializer=_prepare_process,
+                        initargs=(cpu_tools,),
+                    )
+                    # Start every worker now rather than on the first calls
+                    loop = asyncio.get_running_loop()
+                    await asyncio.gather(
+                        *(loop.run_in_executor(self._pool, _ping) for _ in range(self.processes))
+                    )
+            except BaseException:
+                await self._shutdown()
+                raise
+            self._started = True
+
+    async def close(self):
+        """Close every tool and shut the process pool down"""
+        async with self._start_lock:
+            await self._shutdown()
+
+    async def _shutdown(self):
+        """Release tools and the pool; the caller holds the start lock"""
+        await asyncio.gather(
+            *(tool.close() for tool in self.tools.values()), return_exceptions=True
+        )
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+        self._started = False
+
+    async def _execute(self, tool: Tool, arguments: Dict[str, Any]) -> Any:
+        """Run a tool in the right place for its workload"""
+        self.calls += 1
+        if tool.cpu_bound:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._pool, type(tool).compute, arguments)
+        return await tool.run(arguments)
+
+    async def _execute_cached(self, key: bytes, tool: Tool, arguments: Dict[str, Any]) -> Any:
+        """Execute a cacheable call and memoize its result"""
+        result = await self._execute(tool, arguments)
+        self.cache.set(key, result, ttl=tool.cache_ttl)
+        return result
+
+    async def call(self, name: str, arguments: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        Invoke a tool
+
+        Args:
+            name: Registered tool name
+            arguments: Tool arguments
+
+        Returns:
+            The tool result; cached results are shared and must not be mutated
+        """
+        if not self._started:
+            await self.start()
+        tool = self.tools.get(name)
+        if tool is None:
+            raise KeyError(f"Unknown tool '{name}'")
+        arguments = arguments or {}
+        if not tool.cacheable:
+            return await self._execute(tool, arguments)
+
+        key = _call_key(name, arguments)
+        result = self.cache.get(key)
+        if result is not None:
+            return result
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._execute_cached(key, tool, arguments))
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(future)
+
+    def stats(self) -> Dict[str, Any]:
+        """Executed call count and result cache counters"""
+        return {"calls": self.calls, "cache": self.cache.stats()}
+
+
+def create_mcp_server(runtime: ToolRuntime, name: str = "warden"):
+    """Expose a runtime's tools through an MCP server"""
+    # Imported here so agents using the runtime in-process do not need the MCP SDK
+    import mcp.types as types
+    from mcp.server import Server
+
+    tools = [types.Tool(**tool) for tool in runtime.list_tools()]
+
+    async def list_tools(ctx, params) -> types.ListToolsResult:
+        return types.ListToolsResult(tools=tools)
+
+    async def call_tool(ctx, params: types.CallToolRequestParams) -> types.CallToolResult:
+        try:
+            result = await runtime.call(params.name, params.arguments)
+        except Exception as e:
+            logger.exception("Tool %s failed", params.name)
+            return types.CallToolResult(
+                content=[types.TextContent(type="text", text=str(e) or type(e).__name__)],
+                is_error=True,
+            )
+        text = json.dumps(result, default=str)
+        return types.CallToolResult(content=[types.TextContent(type="text", text=text)])
+
+    return Server(name, on_list_tools=list_tools, on_call_tool=call_tool)
+
+
+def default_runtime() -> ToolRuntime:
+    """Build a runtime with the built-in threat intel and log tools"""
+    from mcp_servers.tools.elastic import SearchLogsTool
+    from mcp_servers.tools.logs import LogSummaryTool
+    from mcp_servers.tools.threat_intel import EnrichIndicatorTool
+
+    return ToolRuntime([EnrichIndicatorTool(), SearchLogsTool(), LogSummaryTool()])
+
+
+async def serve_stdio(runtime: Optional[ToolRuntime] = None):
+    """Run the MCP server over stdio until the client disconnects"""
+    from mcp.server.stdio import stdio_server
+
+    runtime = runtime or default_runtime()
+    server = create_mcp_server(runtime)
+    await runtime.start()
+    try:
+        async with stdio_server() as (read_stream, write_stream):
+            await server.run(read_stream, write_stream, server.create_initialization_options())
+    finally:
+        await runtime.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(serve_stdio())
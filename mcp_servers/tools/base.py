@@ -0,0 +1,48 @@
+"""
+Base class for tools served by the MCP runtime
+"""
+
+from abc import ABC
+from typing import Dict, Any, Optional
+
+
+class Tool(ABC):
+    """
+    A tool exposed to agents and MCP clients
+
+    I/O-bound tools override ``run`` and keep their clients open between
+    calls: ``setup`` runs once when the runtime starts and ``close`` once
+    when it stops. CPU-bound tools set ``cpu_bound`` and implement
+    ``compute`` as a staticmethod instead, so the runtime can ship the call
+    to a process-pool worker; ``prepare_process`` runs once in each worker
+    to preload whatever ``compute`` needs.
+
+    Tools whose result depends only on their arguments set ``cacheable``
+    so the runtime memoizes results for ``cache_ttl`` seconds.
+    """
+
+    name: str = ""
+    description: str = ""
+    input_schema: Dict[str, Any] = {"type": "object"}
+    cpu_bound: bool = False
+    cacheable: bool = False
+    cache_ttl: Optional[float] = None
+
+    async def setup(self):
+        """Open clients and load indexes before the first call"""
+
+    async def close(self):
+        """Release anything opened in ``setup``"""
+
+    async def run(self, arguments: Dict[str, Any]) -> Any:
+        """Execute an I/O-bound tool call"""
+        raise NotImplementedError(f"{self.name} does not implement run")
+
+    @staticmethod
+    def compute(arguments: Dict[str, Any]) -> Any:
+        """Execute a CPU-bound tool call inside a process-pool worker"""
+        raise NotImplementedError
+
+    @classmethod
+    def prepare_process(cls):
+        """Preload per-process state in each process-pool worker"""
@@ -0,0 +1,45 @@
+"""
+Elasticsearch log search tool
+"""
+
+from typing import Dict, Any, Optional
+
+from data.repositories.elastic_repository import ElasticLogRepository
+from mcp_servers.tools.base import Tool
+
+
+class SearchLogsTool(Tool):
+    """Counts matching log events and returns the top values of a field"""
+
+    name = "search_logs"
+    description = "Count log events matching a query and list the most frequent values of a field"
+    input_schema = {
+        "type": "object",
+        "properties": {
+            "index": {"type": "string"},
+            "query": {"type": "object"},
+            "field": {"type": "string"},
+            "size": {"type": "integer", "default": 10},
+        },
+        "required": ["index", "query", "field"],
+    }
+
+    def __init__(self, repository: Optional[ElasticLogRepository] = None):
+        self.repository = repository
+
+    async def setup(self):
+        if self.repository is None:
+            self.repository = ElasticLogRepository()
+
+    async def close(self):
+        if self.repository is not None:
+            await self.repository.close()
+
+    async def run(self, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        index, query = arguments["index"], arguments["query"]
+        return {
+            "count": await self.repository.count(index, query),
+            "top": await self.repository.top_terms(
+                index, query, arguments["field"], arguments.get("size", 10)
+            ),
+        }
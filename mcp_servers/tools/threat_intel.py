@@ -0,0 +1,39 @@
+"""
+Threat intelligence enrichment tool
+"""
+
+from typing import Dict, Any, Optional
+
+from intelligence.registry import ProviderRegistry, default_registry
+from mcp_servers.tools.base import Tool
+
+
+class EnrichIndicatorTool(Tool):
+    """
+    Enriches an indicator from every configured provider
+
+    Not cacheable at the runtime level: the registry's enrichment cache
+    already applies per-provider and negative TTLs.
+    """
+
+    name = "enrich_indicator"
+    description = "Look up an IP, domain, URL or file hash in every configured threat intel feed"
+    input_schema = {
+        "type": "object",
+        "properties": {"indicator": {"type": "string"}},
+        "required": ["indicator"],
+    }
+
+    def __init__(self, registry: Optional[ProviderRegistry] = None):
+        self.registry = registry
+
+    async def setup(self):
+        if self.registry is None:
+            self.registry = default_registry()
+
+    async def close(self):
+        if self.registry is not None:
+            await self.registry.close()
+
+    async def run(self, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        return await self.registry.lookup(arguments["indicator"])
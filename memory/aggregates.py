@@ -0,0 +1,98 @@
+"""
+Finding aggregates, maintained incrementally or recomputed from findings
+"""
+
+from collections import Counter
+from typing import Dict, Any, Iterable, List, Tuple
+
+# Counter field prefixes in the per-investigation summary hash
+TOTAL_FIELD = "total"
+SEVERITY_PREFIX = "severity:"
+AGENT_PREFIX = "agent:"
+TYPE_PREFIX = "type:"
+MITRE_PREFIX = "mitre:"
+
+
+def _as_list(value: Any) -> List[str]:
+    """Normalize a missing, scalar or list field to a list of strings"""
+    if value is None:
+        return []
+    if isinstance(value, (list, tuple, set)):
+        return [str(v) for v in value if v is not None]
+    return [str(value)]
+
+
+def finding_counters(finding: Dict[str, Any]) -> Tuple[Counter, Counter]:
+    """
+    Counter increments contributed by a single finding
+
+    Reads ``severity`` (default ``info``), ``agent``, ``type``,
+    ``indicator``/``indicators`` and ``mitre_technique``/``mitre_techniques``.
+
+    Returns:
+        Tuple of (summary hash increments, indicator increments)
+    """
+    counters = Counter({TOTAL_FIELD: 1})
+    counters[SEVERITY_PREFIX + str(finding.get("severity") or "info").lower()] += 1
+    if finding.get("agent"):
+        counters[AGENT_PREFIX + str(finding["agent"])] += 1
+    if finding.get("type"):
+        counters[TYPE_PREFIX + str(finding["type"])] += 1
+    techniques = _as_list(finding.get("mitre_technique"))
+    techniques += _as_list(finding.get("mitre_techniques"))
+    for technique in set(techniques):
+        counters[MITRE_PREFIX + technique] += 1
+
+    indicators = _as_list(finding.get("indicator")) + _as_list(finding.get("indicators"))
+    return counters, Counter(set(indicators))
+
+
+def count_findings(findings: Iterable[Dict[str, Any]]) -> Tuple[Counter, Counter]:
+    """Summed counter increments for a batch of findings"""
+    counters, indicators = Counter(), Counter()
+    for finding in findings:
+        finding_count, finding_indicators = finding_counters(finding)
+        counters.update(finding_count)
+        indicators.update(finding_indicators)
+    return counters, indicators
+
+
+def build_summary(
+    counters: Dict[str, Any], top_indicators: List[Tuple[str, float]]
+) -> Dict[str, Any]:
+    """Shape raw summary counters and top indicators into a summary dict"""
+    summary: Dict[str, Any] = {
+        "total": int(counters.get(TOTAL_FIELD, 0)),
+        "severity": {},
+        "agents": {},
+        "types": {},
+        "mitre_techniques": {},
+        "top_indicators": [
+            {"value": value, "count": int(count)} for value, count in top_indicators
+        ],
+    }
+    sections = (
+        (SEVERITY_PREFIX, "severity"),
+        (AGENT_PREFIX, "agents"),
+        (TYPE_PREFIX, "types"),
+        (MITRE_PREFIX, "mitre_techniques"),
+    )
+    for field, count in counters.items():
+        for prefix, section in sections:
+            if field.startswith(prefix):
+                summary[section][field[len(prefix):]] = int(count)
+                break
+    return summary
+
+
+def summarize_findings(findings: Iterable[Dict[str, Any]], top_k: int = 10) -> Dict[str, Any]:
+    """
+    Recompute the finding summary from scratch
+
+    Produces the same shape and ordering as the incrementally maintained
+    summary, including Redis' tie-break of equal counts by descending
+    value, so the two can be compared directly.
+    """
+    counters, indicators = count_findings(findings)
+    top = sorted(indicators.items(), key=lambda item: (item[1], item[0]), reverse=True)
+    return build_summary(counters, top[:top_k])
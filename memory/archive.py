@@ -0,0 +1,176 @@
+"""
+Cold archive of idle investigations in compressed segment files on disk
+"""
+
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+from config.settings import settings
+from memory.codecs import FLAG_ZSTD, MAGIC, Serializer, get_serializer
+
+
+INDEX_FILE = "index.db"
+SEGMENT_FILE = "segment-{number:06d}.bin"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS investigations (
+    investigation_id TEXT PRIMARY KEY,
+    segment INTEGER NOT NULL,
+    offset INTEGER NOT NULL,
+    length INTEGER NOT NULL,
+    started_at REAL,
+    last_active REAL NOT NULL,
+    archived_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS investigations_last_active ON investigations (last_active);
+"""
+
+
+class InvestigationArchive:
+    """
+    Append-only segment files with a SQLite index
+
+    Each archived investigation is one record, encoded with the memory codec
+    and compressed once: by the serializer's zstd when its threshold applies,
+    otherwise with zlib. Records are appended to the current segment file; a
+    new segment starts once the current one passes ``segment_size`` bytes.
+    The index maps investigation IDs to (segment, offset, length) and
+    records start and last-activity times for time-range listing. Records
+    are fsynced before they are indexed, so an indexed record is always
+    readable.
+
+    Space from removed or re-archived records is not reclaimed. Only one
+    process may write at a time; ``AsyncRedisMemoryStore.archive_idle``
+    guards this with a Redis lock. Methods block, so async callers run them
+    in a thread.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        segment_size: Optional[int] = None,
+        serializer: Optional[Serializer] = None,
+    ):
+        self.directory = Path(directory or settings.archive_dir)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.segment_size = segment_size or settings.archive_segment_size
+        self.serializer = serializer or get_serializer()
+        self._db = sqlite3.connect(self.directory / INDEX_FILE, check_same_thread=False)
+        self._db.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+
+    def _segment_path(self, number: int) -> Path:
+        """Path of a segment file"""
+        return self.directory / SEGMENT_FILE.format(number=number)
+
+    def _current_segment(self) -> int:
+        """Segment to append to, rolling over once it is full"""
+        segments = sorted(self.directory.glob("segment-*.bin"))
+        if not segments:
+            return 1
+        number = int(segments[-1].stem.split("-")[1])
+        if segments[-1].stat().st_size >= self.segment_size:
+            number += 1
+        return number
+
+    def write(self, investigation_id: str, record: Dict[str, Any]):
+        """
+        Archive an investigation record, replacing any earlier one
+
+        Args:
+            investigation_id: Investigation ID
+            record: Record to store; ``context.metadata.started_at`` and
+                ``last_active`` are copied into the index
+        """
+        data = self.serializer.encode(record)
+        if not (data[0] == MAGIC and data[3] & FLAG_ZSTD):
+            data = zlib.compress(data)
+        metadata = record.get("context", {}).get("metadata", {})
+        with self._lock:
+            number = self._current_segment()
+            with open(self._segment_path(number), "ab") as f:
+                offset = f.tell()
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            with self._db:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO investigations VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        investigation_id,
+                        number,
+                        offset,
+                        len(data),
+                        metadata.get("started_at"),
+                        record.get("last_active") or time.time(),
+                        time.time(),
+                    ),
+                )
+
+    def load(self, investigation_id: str) -> Optional[Dict[str, Any]]:
+        """Read an archived record, or None if the investigation is not archived"""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT segment, offset, length FROM investigations WHERE investigation_id = ?",
+                (investigation_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        number, offset, length = row
+        with open(self._segment_path(number), "rb") as f:
+            f.seek(offset)
+            data = f.read(length)
+        # Serializer blobs start with a NUL byte, zlib streams never do
+        if data[0] != MAGIC:
+            data = zlib.decompress(data)
+        return self.serializer.decode(data)
+
+    def contains(self, investigation_id: str) -> bool:
+        """Whether an investigation is archived, from the index alone"""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT 1 FROM investigations WHERE investigation_id = ?", (investigation_id,)
+            ).fetchone()
+        return row is not None
+
+    def remove(self, investigation_id: str):
+        """Drop an investigation from the index"""
+        with self._lock, self._db:
+            self._db.execute(
+                "DELETE FROM investigations WHERE investigation_id = ?", (investigation_id,)
+            )
+
+    def list(
+        self, since: Optional[float] = None, until: Optional[float] = None, limit: int = 100
+    ) -> List[Dict[str, Any]]:
+        """List archived investigations by last activity, most recent first"""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT investigation_id, started_at, last_active, archived_at"
+                " FROM investigations WHERE last_active >= ? AND last_active <= ?"
+                " ORDER BY last_active DESC LIMIT ?",
+                (
+                    float("-inf") if since is None else since,
+                    float("inf") if until is None else until,
+                    limit,
+                ),
+            ).fetchall()
+        return [
+            {
+                "investigation_id": investigation_id,
+                "started_at": started_at,
+                "last_active": last_active,
+                "archived_at": archived_at,
+            }
+            for investigation_id, started_at, last_active, archived_at in rows
+        ]
+
+    def close(self):
+        """Close the index database"""
+        with self._lock:
+            self._db.close()
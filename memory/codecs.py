@@ -0,0 +1,154 @@
+"""
+Pluggable serialization for findings and timeline data stored in Redis
+"""
+
+import json
+import struct
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional, Type, Union
+
+from config.settings import settings
+
+try:
+    import msgpack
+except ImportError:  # Optional: only needed for the msgpack codec
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:  # Optional: only needed for compression
+    zstandard = None
+
+
+# Header: magic byte, format version, codec ID, flags. A leading NUL byte
+# never starts valid JSON text, so headerless blobs are read as legacy JSON.
+MAGIC = 0x00
+FORMAT_VERSION = 1
+FLAG_ZSTD = 0x01
+_HEADER = struct.Struct("BBBB")
+
+
+class Codec(ABC):
+    """Encodes values to bytes and back"""
+
+    codec_id: int
+    name: str
+
+    @abstractmethod
+    def dumps(self, value: Any) -> bytes:
+        """Encode a value"""
+
+    @abstractmethod
+    def loads(self, data: bytes) -> Any:
+        """Decode a value from a bytes-like object"""
+
+
+class JSONCodec(Codec):
+    """Compact UTF-8 JSON"""
+
+    codec_id = 1
+    name = "json"
+
+    def dumps(self, value: Any) -> bytes:
+        return json.dumps(value, separators=(",", ":")).encode()
+
+    def loads(self, data: bytes) -> Any:
+        return json.loads(bytes(data))
+
+
+class MsgpackCodec(Codec):
+    """MessagePack: smaller and faster than JSON for typical findings"""
+
+    codec_id = 2
+    name = "msgpack"
+
+    def __init__(self):
+        if msgpack is None:
+            raise ImportError("The msgpack codec requires the 'msgpack' package")
+
+    def dumps(self, value: Any) -> bytes:
+        return msgpack.packb(value, use_bin_type=True)
+
+    def loads(self, data: bytes) -> Any:
+        return msgpack.unpackb(data, raw=False)
+
+
+CODECS: Dict[str, Type[Codec]] = {codec.name: codec for codec in (JSONCodec, MsgpackCodec)}
+_CODECS_BY_ID: Dict[int, Type[Codec]] = {codec.codec_id: codec for codec in CODECS.values()}
+
+
+class Serializer:
+    """
+    Frames codec output with a version header and optional compression
+
+    Writes use the configured codec; reads dispatch on the header, so data
+    written with any codec, or as headerless JSON before headers existed,
+    stays readable after the codec setting changes. Payloads of at least
+    ``compress_threshold`` bytes are zstd-compressed when the threshold is
+    non-zero.
+    """
+
+    def __init__(
+        self,
+        codec: Optional[str] = None,
+        compress_threshold: Optional[int] = None,
+        compress_level: Optional[int] = None,
+    ):
+        name = codec or settings.memory_codec
+        if name not in CODECS:
+            raise ValueError(f"Unknown codec {name!r}, expected one of {sorted(CODECS)}")
+        self.codec = CODECS[name]()
+        self.compress_threshold = (
+            settings.memory_compress_threshold if compress_threshold is None
+            else compress_threshold
+        )
+        if self.compress_threshold and zstandard is None:
+            raise ImportError("Compression requires the 'zstandard' package")
+        level = compress_level or settings.memory_compress_level
+        self._compressor = zstandard.ZstdCompressor(level=level) if zstandard else None
+        self._decompressor = zstandard.ZstdDecompressor() if zstandard else None
+        self._decoders: Dict[int, Codec] = {self.codec.codec_id: self.codec}
+
+    def encode(self, value: Any) -> bytes:
+        """Serialize a value into a headed blob"""
+        payload = self.codec.dumps(value)
+        flags = 0
+        if self.compress_threshold and len(payload) >= self.compress_threshold:
+            payload = self._compressor.compress(payload)
+            flags |= FLAG_ZSTD
+        return _HEADER.pack(MAGIC, FORMAT_VERSION, self.codec.codec_id, flags) + payload
+
+    def _decoder(self, codec_id: int) -> Codec:
+        """Codec instance for a stored codec ID"""
+        decoder = self._decoders.get(codec_id)
+        if decoder is None:
+            if codec_id not in _CODECS_BY_ID:
+                raise ValueError(f"Unknown codec ID {codec_id}")
+            decoder = self._decoders[codec_id] = _CODECS_BY_ID[codec_id]()
+        return decoder
+
+    def decode(self, blob: Union[bytes, str]) -> Any:
+        """Deserialize a headed blob or a legacy JSON string"""
+        if isinstance(blob, str) or not blob or blob[0] != MAGIC:
+            return json.loads(blob)
+
+        _, version, codec_id, flags = _HEADER.unpack_from(blob)
+        if version > FORMAT_VERSION:
+            raise ValueError(f"Blob format version {version} is newer than supported")
+        payload = memoryview(blob)[_HEADER.size:]
+        if flags & FLAG_ZSTD:
+            if self._decompressor is None:
+                raise ImportError("Reading compressed data requires the 'zstandard' package")
+            payload = self._decompressor.decompress(payload)
+        return self._decoder(codec_id).loads(payload)
+
+
+_default: Optional[Serializer] = None
+
+
+def get_serializer() -> Serializer:
+    """Return the process-wide serializer built from settings"""
+    global _default
+    if _default is None:
+        _default = Serializer()
+    return _default
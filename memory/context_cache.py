@@ -0,0 +1,140 @@
+"""
+Read-through local cache in front of the Redis memory store
+"""
+
+import asyncio
+import logging
+from typing import Dict, Any, Optional, List, Iterable
+
+from config.settings import settings
+from memory.redis_store import AsyncRedisMemoryStore, INVALIDATION_CHANNEL
+from utils.cache import LRUTTLCache
+
+logger = logging.getLogger(__name__)
+
+
+class CachedMemoryStore:
+    """
+    Two-tier memory store: bounded in-process LRU/TTL cache over Redis
+
+    Repeated ``get_context`` calls for the same investigation are served from
+    process memory. Every write, local or from another worker, is published
+    on the invalidation channel and drops the cached entry, with the TTL as a
+    safety net if a notification is missed. Returned contexts are shared with
+    the cache and must be treated as read-only.
+    """
+
+    def __init__(
+        self,
+        store: Optional[AsyncRedisMemoryStore] = None,
+        max_size: Optional[int] = None,
+        ttl: Optional[float] = None,
+    ):
+        self.store = store or AsyncRedisMemoryStore()
+        self.cache = LRUTTLCache(
+            max_size=max_size or settings.context_cache_size,
+            ttl=settings.ttls.context if ttl is None else ttl,
+        )
+        # Investigation IDs with reads in flight -> [reader count, invalidation generation]
+        self._inflight: Dict[str, List[int]] = {}
+        self._listener: Optional[asyncio.Task] = None
+
+    def __getattr__(self, name: str):
+        # Delegate anything not cached (e.g. the Redis client) to the wrapped store
+        return getattr(self.store, name)
+
+    async def start(self):
+        """Subscribe to invalidation notifications from other workers"""
+        if self._listener is None:
+            self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self):
+        """Stop listening for invalidations"""
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+
+    def invalidate(self, investigation_id: str):
+        """Drop a cached context and mark every in-flight read as stale"""
+        self.cache.pop(investigation_id)
+        entry = self._inflight.get(investigation_id)
+        if entry is not None:
+            entry[1] += 1
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss/eviction counters for the local tier"""
+        return self.cache.stats()
+
+    async def _listen(self):
+        """Consume the invalidation channel until cancelled"""
+        while True:
+            pubsub = self.store.client.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(INVALIDATION_CHANNEL)
+                # Anything cached before the subscription was live may have missed updates
+                self.cache.clear()
+                async for message in pubsub.listen():
+                    # The store's connection pool returns raw bytes
+                    data = message["data"]
+                    self.invalidate(data.decode() if isinstance(data, bytes) else data)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Invalidation listener failed, resubscribing")
+                self.cache.clear()
+                await asyncio.sleep(1.0)
+            finally:
+                await pubsub.reset()
+
+    async def get_context(self, investigation_id: str) -> Optional[Dict[str, Any]]:
+        """Retrieve investigation context, from the local cache when possible"""
+        context = self.cache.get(investigation_id)
+        if context is not None:
+            return context
+
+        # Only cache the result if nothing was invalidated since this read started
+        entry = self._inflight.setdefault(investigation_id, [0, 0])
+        entry[0] += 1
+        generation = entry[1]
+        try:
+            context = await self.store.get_context(investigation_id)
+        finally:
+            entry[0] -= 1
+            if not entry[0]:
+                del self._inflight[investigation_id]
+        if entry[1] == generation and context is not None:
+            self.cache.set(investigation_id, context)
+        return context
+
+    async def store_finding(self, investigation_id: str, finding: Dict[str, Any]) -> str:
+        """Store a finding and invalidate the cached context"""
+        result = await self.store.store_finding(investigation_id, finding)
+        self.invalidate(investigation_id)
+        return result
+
+    async def store_findings_bulk(
+        self, investigation_id: str, findings: Iterable[Dict[str, Any]]
+    ) -> List[str]:
+        """Store several findings and invalidate the cached context"""
+        result = await self.store.store_findings_bulk(investigation_id, findings)
+        self.invalidate(investigation_id)
+        return result
+
+    async def add_timeline_event(self, investigation_id: str, event: Dict[str, Any]):
+        """Append a timeline event and invalidate the cached context"""
+        await self.store.add_timeline_event(investigation_id, event)
+        self.invalidate(investigation_id)
+
+    async def set_metadata(self, investigation_id: str, metadata: Dict[str, Any]):
+        """Merge metadata and invalidate the cached context"""
+        await self.store.set_metadata(investigation_id, metadata)
+        self.invalidate(investigation_id)
+
+    async def attach_alert(self, investigation_id: str, alert: Dict[str, Any]):
+        """Attach a duplicate alert and invalidate the cached context"""
+        await self.store.attach_alert(investigation_id, alert)
+        self.invalidate(investigation_id)
@@ -0,0 +1,212 @@
+"""
+Per-investigation event log with live fan-out to subscribers
+"""
+
+import asyncio
+import json
+import logging
+from typing import Dict, Any, AsyncIterator, Optional, Set, Tuple
+
+import redis.asyncio as aioredis
+
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+EVENTS_KEY = "investigation:{investigation_id}:events"
+EVENTS_CHANNEL = "investigation:events"
+
+# Appends an event to the investigation's capped stream and publishes it with
+# its stream ID, so live subscribers and replaying readers agree on IDs
+PUBLISH_SCRIPT = """
+local id = redis.call(
+    'XADD', KEYS[1], 'MAXLEN', '~', ARGV[1], '*', 'type', ARGV[2], 'data', ARGV[3]
+)
+redis.call('PUBLISH', ARGV[4], ARGV[5] .. '\\n' .. id .. '\\n' .. ARGV[2] .. '\\n' .. ARGV[3])
+return id
+"""
+
+# Statuses that end an investigation's event stream; "merged" means the alert
+# was attached to an existing investigation instead
+TERMINAL_STATUSES = ("completed", "failed", "merged")
+
+
+def _text(value) -> str:
+    """Decode a raw response value to text"""
+    return value.decode() if isinstance(value, bytes) else value
+
+
+def _stream_id(event_id: str) -> Tuple[int, int]:
+    """Sortable form of a stream entry ID"""
+    ms, _, seq = event_id.partition("-")
+    return int(ms), int(seq or 0)
+
+
+def queue_event(
+    pipe, script, investigation_id: str, event_type: str, data: Dict[str, Any]
+):
+    """Queue publishing an investigation event on a pipeline"""
+    pipe.scripts.add(script)
+    pipe.evalsha(
+        script.sha,
+        1,
+        EVENTS_KEY.format(investigation_id=investigation_id),
+        settings.events_max_length,
+        event_type,
+        json.dumps(data, separators=(",", ":"), default=str),
+        EVENTS_CHANNEL,
+        investigation_id,
+    )
+
+
+def is_terminal(event: Dict[str, Any]) -> bool:
+    """Whether an event marks the end of an investigation"""
+    return event["type"] == "status" and event["data"].get("status") in TERMINAL_STATUSES
+
+
+class _Subscription:
+    """Bounded queue of live events for one subscriber"""
+
+    def __init__(self, investigation_id: str, size: int):
+        self.investigation_id = investigation_id
+        self.queue: asyncio.Queue = asyncio.Queue(size)
+        self.overflowed = False
+
+    def deliver(self, event: Dict[str, Any]):
+        """Queue an event without blocking the dispatcher"""
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Too slow to keep up; the reader ends and the client resumes from its last ID
+            self.overflowed = True
+
+
+class EventBroker:
+    """
+    Fans investigation events out to in-process subscribers
+
+    Events are appended to a capped Redis Stream per investigation and
+    published on one shared channel. Each API process holds a single
+    subscription to that channel and hands events to local subscriber
+    queues, so Redis connections stay constant however many clients are
+    streaming. New subscribers first replay the stream, after an optional
+    last-seen ID, then continue with live events.
+    """
+
+    def __init__(self, client: Optional[aioredis.Redis] = None, queue_size: Optional[int] = None):
+        # Imported here: the memory store imports this module to publish events
+        from memory.redis_store import get_async_pool
+
+        self.client = client or aioredis.Redis(connection_pool=get_async_pool())
+        self.queue_size = queue_size or settings.concurrency.api_event_queue
+        self._script = self.client.register_script(PUBLISH_SCRIPT)
+        self._subscribers: Dict[str, Set[_Subscription]] = {}
+        self._listener: Optional[asyncio.Task] = None
+        self._ready = asyncio.Event()
+
+    @property
+    def subscriber_count(self) -> int:
+        """Number of connected subscribers"""
+        return sum(len(subs) for subs in self._subscribers.values())
+
+    async def start(self):
+        """Subscribe to the shared event channel"""
+        if self._listener is None:
+            self._listener = asyncio.create_task(self._listen())
+            await self._ready.wait()
+
+    async def stop(self):
+        """Stop dispatching events"""
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+
+    async def publish(self, investigation_id: str, event_type: str, data: Dict[str, Any]) -> str:
+        """Append and publish a single event, returning its ID"""
+        async with self.client.pipeline(transaction=False) as pipe:
+            queue_event(pipe, self._script, investigation_id, event_type, data)
+            return _text((await pipe.execute())[0])
+
+    async def _listen(self):
+        """Dispatch channel messages to local subscribers until cancelled"""
+        while True:
+            pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(EVENTS_CHANNEL)
+                self._ready.set()
+                async for message in pubsub.listen():
+                    investigation_id, event_id, event_type, data = (
+                        _text(message["data"]).split("\n", 3)
+                    )
+                    subscribers = self._subscribers.get(investigation_id)
+                    if not subscribers:
+                        continue
+                    event = {"id": event_id, "type": event_type, "data": json.loads(data)}
+                    for subscription in subscribers:
+                        subscription.deliver(event)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Event listener failed, resubscribing")
+                await asyncio.sleep(1.0)
+            finally:
+                await pubsub.reset()
+
+    async def _history(self, investigation_id: str, after: Optional[str]):
+        """Stored events after an ID, oldest first"""
+        entries = await self.client.xrange(
+            EVENTS_KEY.format(investigation_id=investigation_id),
+            min=f"({after}" if after else "-",
+        )
+        return [
+            {
+                "id": _text(entry_id),
+                "type": _text(fields.get("type", fields.get(b"type"))),
+                "data": json.loads(fields.get("data", fields.get(b"data"))),
+            }
+            for entry_id, fields in entries
+        ]
+
+    async def subscribe(
+        self, investigation_id: str, last_event_id: Optional[str] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield an investigation's events until it completes or fails
+
+        Args:
+            investigation_id: Investigation to follow
+            last_event_id: Resume after this event ID instead of replaying everything
+
+        Yields:
+            Events as ``{"id", "type", "data"}`` dicts
+        """
+        subscription = _Subscription(investigation_id, self.queue_size)
+        # Register before replaying so nothing published in between is missed
+        self._subscribers.setdefault(investigation_id, set()).add(subscription)
+        try:
+            seen = _stream_id(last_event_id) if last_event_id else (0, 0)
+            for event in await self._history(investigation_id, last_event_id):
+                seen = _stream_id(event["id"])
+                yield event
+                if is_terminal(event):
+                    return
+            while not subscription.overflowed or not subscription.queue.empty():
+                event = await subscription.queue.get()
+                if _stream_id(event["id"]) <= seen:
+                    continue
+                seen = _stream_id(event["id"])
+                yield event
+                if is_terminal(event):
+                    return
+        finally:
+            subscribers = self._subscribers.get(investigation_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[investigation_id]
@@ -2,29 +2,804 @@
 Redis-backed memory store for investigation context
 """
 
+import asyncio
+import functools
 import json
-from typing import Dict, Any, Optional
-import redis
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, Any, Optional, List, Iterable, Union, Callable, Awaitable
+import redis.asyncio as aioredis
 
+from config.settings import get_settings, settings
+from memory.aggregates import build_summary, count_findings
+from memory.archive import InvestigationArchive
+from memory.codecs import Serializer, get_serializer
+from memory.events import EVENTS_KEY, PUBLISH_SCRIPT, queue_event
+from utils.cache import LRUTTLCache
 
-class RedisMemoryStore:
+logger = logging.getLogger(__name__)
+
+FINDINGS_KEY = "investigation:{investigation_id}:findings"
+TIMELINE_KEY = "investigation:{investigation_id}:timeline"
+TIMELINE_EVENTS_KEY = "investigation:{investigation_id}:timeline:events"
+METADATA_KEY = "investigation:{investigation_id}:meta"
+ALERTS_KEY = "investigation:{investigation_id}:alerts"
+SUMMARY_KEY = "investigation:{investigation_id}:summary"
+INDICATORS_KEY = "investigation:{investigation_id}:indicators"
+REHYDRATE_LOCK_KEY = "investigation:{investigation_id}:rehydrating"
+
+# Last write time per investigation, used to find idle ones to archive
+ACTIVE_KEY = "investigations:active"
+ARCHIVE_LOCK_KEY = "investigations:archive:lock"
+
+# Every Redis key holding investigation state, removed once it is archived
+INVESTIGATION_KEYS = (
+    FINDINGS_KEY,
+    TIMELINE_KEY,
+    TIMELINE_EVENTS_KEY,
+    METADATA_KEY,
+    ALERTS_KEY,
+    SUMMARY_KEY,
+    INDICATORS_KEY,
+    EVENTS_KEY,
+)
+
+# Duplicate alerts kept per investigation; the counter in metadata keeps the full total
+MAX_RELATED_ALERTS = 1000
+
+# Writers publish the investigation ID here so other workers drop cached contexts
+INVALIDATION_CHANNEL = "investigation:invalidate"
+
+# Reads a score range of the timeline index and fetches the event bodies in
+# the same call. Unbounded reads (tails and pages) use rank ranges, which skip
+# to the offset in O(log n) where a score range walks past every skipped
+# event. HMGET is chunked to stay under Lua's unpack() stack limit.
+TIMELINE_SCRIPT = """
+local ids
+local offset, limit = tonumber(ARGV[3]), tonumber(ARGV[4])
+if limit == 0 then
+    return {}
+end
+if ARGV[1] == '-inf' and ARGV[2] == '+inf' then
+    local stop = -1
+    if limit > 0 then
+        stop = offset + limit - 1
+    end
+    if ARGV[5] == '1' then
+        ids = redis.call('ZREVRANGE', KEYS[1], offset, stop)
+    else
+        ids = redis.call('ZRANGE', KEYS[1], offset, stop)
+    end
+elseif ARGV[5] == '1' then
+    ids = redis.call('ZREVRANGEBYSCORE', KEYS[1], ARGV[2], ARGV[1], 'LIMIT', offset, limit)
+else
+    ids = redis.call('ZRANGEBYSCORE', KEYS[1], ARGV[1], ARGV[2], 'LIMIT', offset, limit)
+end
+local events = {}
+for i = 1, #ids, 1000 do
+    local chunk = redis.call('HMGET', KEYS[2], unpack(ids, i, math.min(i + 999, #ids)))
+    for _, event in ipairs(chunk) do
+        events[#events + 1] = event
+    end
+end
+return events
+"""
+
+# Drops an archived investigation from Redis unless it was written after
+# the snapshot (its activity score moved past the archived one)
+EVICT_SCRIPT = """
+local score = redis.call('ZSCORE', KEYS[1], ARGV[1])
+if score and tonumber(score) > tonumber(ARGV[2]) then
+    return 0
+end
+redis.call('ZREM', KEYS[1], ARGV[1])
+redis.call('UNLINK', unpack(KEYS, 2))
+return 1
+"""
+
+TimePoint = Union[int, float, str, datetime]
+
+# Shared async pools, keyed by whether responses are left as raw bytes
+_async_pools: Dict[bool, aioredis.BlockingConnectionPool] = {}
+
+
+def _key(template: str, investigation_id: str) -> str:
+    """Build a Redis key for an investigation"""
+    return template.format(investigation_id=investigation_id)
+
+
+def _dumps(value: Any) -> str:
+    """Serialize a value to compact JSON"""
+    return json.dumps(value, separators=(",", ":"))
+
+
+def _text(value: Union[bytes, str]) -> str:
+    """Decode a raw response value to text"""
+    return value.decode() if isinstance(value, bytes) else value
+
+
+def _timestamp_score(value: TimePoint) -> float:
+    """Convert epoch seconds, an ISO-8601 string or a datetime to an epoch score"""
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def _score_bound(value: Optional[TimePoint], default: str) -> Union[float, str]:
+    """Score range bound for a time point, open-ended when None"""
+    return default if value is None else _timestamp_score(value)
+
+
+def get_async_pool(binary: bool = False) -> aioredis.BlockingConnectionPool:
+    """
+    Return the process-wide async connection pool
+
+    The pool is created on first use and shared by the orchestrator and every
+    agent, so concurrent investigations wait for a free connection instead of
+    opening new ones. ``binary`` selects a separate pool that returns raw
+    bytes, used by the memory store for codec-encoded blobs.
+    """
+    pool = _async_pools.get(binary)
+    if pool is None:
+        pool = _async_pools[binary] = _new_async_pool(binary)
+    return pool
+
+
+def _new_async_pool(
+    binary: bool, host: Optional[str] = None, port: Optional[int] = None
+) -> aioredis.BlockingConnectionPool:
+    """Build an async connection pool from the current settings"""
+    config = get_settings()
+    return aioredis.BlockingConnectionPool(
+        host=host or config.redis_host,
+        port=port or config.redis_port,
+        db=config.redis_db,
+        password=config.redis_password or None,
+        max_connections=config.pools.redis_connections,
+        timeout=config.redis_pool_timeout,
+        socket_timeout=config.redis_socket_timeout,
+        decode_responses=not binary,
+    )
+
+
+async def close_async_pool():
+    """Disconnect and discard the shared async connection pools"""
+    pools = list(_async_pools.values())
+    _async_pools.clear()
+    for pool in pools:
+        await pool.disconnect()
+
+
+def _queue_changed(pipe, investigation_id: str):
+    """Queue recording activity on an investigation and invalidating cached copies"""
+    pipe.zadd(ACTIVE_KEY, {investigation_id: time.time()})
+    pipe.publish(INVALIDATION_CHANNEL, investigation_id)
+
+
+def _queue_findings(
+    pipe,
+    investigation_id: str,
+    findings: List[Dict[str, Any]],
+    max_findings: Optional[int],
+    serializer: Serializer,
+    aggregate: bool = True,
+):
+    """Queue XADD commands and aggregate counter updates for a batch of findings"""
+    key = _key(FINDINGS_KEY, investigation_id)
+    for finding in findings:
+        pipe.xadd(
+            key, {"data": serializer.encode(finding)}, maxlen=max_findings, approximate=True
+        )
+
+    if aggregate:
+        # One increment per distinct counter for the whole batch
+        counters, indicators = count_findings(findings)
+        summary_key = _key(SUMMARY_KEY, investigation_id)
+        for field, count in counters.items():
+            pipe.hincrby(summary_key, field, count)
+        indicators_key = _key(INDICATORS_KEY, investigation_id)
+        for indicator, count in indicators.items():
+            pipe.zincrby(indicators_key, count, indicator)
+    _queue_changed(pipe, investigation_id)
+
+
+def _queue_metadata(pipe, investigation_id: str, metadata: Dict[str, Any]):
+    """Queue an HSET merging metadata fields on a pipeline"""
+    pipe.hset(
+        _key(METADATA_KEY, investigation_id),
+        mapping={k: _dumps(v) for k, v in metadata.items()},
+    )
+    _queue_changed(pipe, investigation_id)
+
+
+def _queue_timeline_event(
+    pipe, investigation_id: str, event: Dict[str, Any], serializer: Serializer
+):
+    """Queue indexing a timeline event by its timestamp on a pipeline"""
+    if event.get("timestamp") is None:
+        event = {**event, "timestamp": datetime.now(timezone.utc).isoformat()}
+    _queue_timeline_index(pipe, investigation_id, event, serializer)
+    _queue_changed(pipe, investigation_id)
+
+
+def _queue_timeline_index(
+    pipe, investigation_id: str, event: Dict[str, Any], serializer: Serializer
+):
+    """Queue storing a timestamped event body and indexing it on a pipeline"""
+    # Time-ordered member so events sharing a timestamp keep insertion order
+    event_id = f"{time.time_ns()}-{os.urandom(4).hex()}"
+    pipe.hset(_key(TIMELINE_EVENTS_KEY, investigation_id), event_id, serializer.encode(event))
+    pipe.zadd(
+        _key(TIMELINE_KEY, investigation_id),
+        {event_id: _timestamp_score(event["timestamp"])},
+    )
+
+
+def _queue_timeline_range(
+    pipe,
+    script,
+    investigation_id: str,
+    start: Optional[TimePoint] = None,
+    end: Optional[TimePoint] = None,
+    offset: int = 0,
+    limit: Optional[int] = None,
+    newest_first: bool = False,
+):
+    """Queue a timeline range read on a pipeline"""
+    # What Script.__call__ does, without awaiting, so sync and async pipelines share it
+    pipe.scripts.add(script)
+    pipe.evalsha(
+        script.sha,
+        2,
+        _key(TIMELINE_KEY, investigation_id),
+        _key(TIMELINE_EVENTS_KEY, investigation_id),
+        _score_bound(start, "-inf"),
+        _score_bound(end, "+inf"),
+        offset,
+        -1 if limit is None else limit,
+        1 if newest_first else 0,
+    )
+
+
+def _parse_events(raw: List[Optional[bytes]], serializer: Serializer) -> List[Dict[str, Any]]:
+    """Decode timeline event bodies returned by the range script"""
+    return [serializer.decode(event) for event in raw if event]
+
+
+def _queue_related_alert(
+    pipe, investigation_id: str, alert: Dict[str, Any], serializer: Serializer
+):
+    """Queue attaching a duplicate alert to an investigation on a pipeline"""
+    key = _key(ALERTS_KEY, investigation_id)
+    pipe.rpush(key, serializer.encode(alert))
+    pipe.ltrim(key, -MAX_RELATED_ALERTS, -1)
+    pipe.hincrby(_key(METADATA_KEY, investigation_id), "duplicate_count", 1)
+    _queue_changed(pipe, investigation_id)
+
+
+def _queue_context(pipe, timeline_script, investigation_id: str):
+    """Queue the reads that make up an investigation context on a pipeline"""
+    pipe.xrange(_key(FINDINGS_KEY, investigation_id))
+    _queue_timeline_range(pipe, timeline_script, investigation_id)
+    pipe.hgetall(_key(METADATA_KEY, investigation_id))
+    pipe.lrange(_key(ALERTS_KEY, investigation_id), 0, -1)
+
+
+def _queue_summary(pipe, investigation_id: str, top_k: int):
+    """Queue the reads that make up a finding summary on a pipeline"""
+    pipe.hgetall(_key(SUMMARY_KEY, investigation_id))
+    pipe.zrevrange(_key(INDICATORS_KEY, investigation_id), 0, top_k - 1, withscores=True)
+
+
+def _queue_snapshot(pipe, timeline_script, investigation_id: str):
+    """Queue the reads that capture an investigation for archiving"""
+    pipe.zscore(ACTIVE_KEY, investigation_id)
+    _queue_context(pipe, timeline_script, investigation_id)
+    pipe.hgetall(_key(SUMMARY_KEY, investigation_id))
+    pipe.zrange(_key(INDICATORS_KEY, investigation_id), 0, -1, withscores=True)
+
+
+def _build_snapshot(
+    investigation_id: str, results: List[Any], serializer: Serializer
+) -> Optional[Dict[str, Any]]:
+    """Assemble pipelined snapshot reads into an archive record"""
+    last_active, counters, indicators = results[0], results[5], results[6]
+    context = _build_context(investigation_id, results[1:5], serializer)
+    if context is None:
+        return None
+    return {
+        "context": context,
+        "last_active": last_active,
+        "counters": {_text(field): int(count) for field, count in counters.items()},
+        "indicators": [[_text(value), score] for value, score in indicators],
+    }
+
+
+def _queue_restore(pipe, record: Dict[str, Any], serializer: Serializer):
+    """Queue writing an archived record back to Redis"""
+    context = record["context"]
+    investigation_id = context["investigation_id"]
+    _queue_findings(pipe, investigation_id, context["findings"], None, serializer, False)
+    if record["counters"]:
+        pipe.hset(_key(SUMMARY_KEY, investigation_id), mapping=record["counters"])
+    if record["indicators"]:
+        pipe.zadd(_key(INDICATORS_KEY, investigation_id), dict(record["indicators"]))
+    for event in context["timeline"]:
+        _queue_timeline_index(pipe, investigation_id, event, serializer)
+    if context["metadata"]:
+        _queue_metadata(pipe, investigation_id, context["metadata"])
+    if context["related_alerts"]:
+        pipe.rpush(
+            _key(ALERTS_KEY, investigation_id),
+            *(serializer.encode(alert) for alert in context["related_alerts"]),
+        )
+
+
+def _merge_records(archived: Dict[str, Any], record: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Combine an archived record with a later snapshot of the same investigation
+
+    The snapshot only holds what was written after the archived copy was
+    made, e.g. by a write that raced the sweep, so lists are concatenated,
+    counters added and metadata fields from the snapshot take precedence.
+    """
+    old, new = archived["context"], record["context"]
+    metadata = {**old["metadata"], **new["metadata"]}
+    duplicates = old["metadata"].get("duplicate_count", 0) + new["metadata"].get(
+        "duplicate_count", 0
+    )
+    if duplicates:
+        metadata["duplicate_count"] = duplicates
+    counters = dict(archived["counters"])
+    for field, count in record["counters"].items():
+        counters[field] = counters.get(field, 0) + count
+    indicators = dict(archived["indicators"])
+    for value, score in record["indicators"]:
+        indicators[value] = indicators.get(value, 0) + score
+    return {
+        "context": {
+            "investigation_id": new["investigation_id"],
+            "metadata": metadata,
+            "findings": old["findings"] + new["findings"],
+            "timeline": sorted(
+                old["timeline"] + new["timeline"],
+                key=lambda event: _timestamp_score(event["timestamp"]),
+            ),
+            "related_alerts": (old["related_alerts"] + new["related_alerts"])[
+                -MAX_RELATED_ALERTS:
+            ],
+        },
+        "last_active": record["last_active"],
+        "counters": counters,
+        "indicators": [[value, score] for value, score in indicators.items()],
+    }
+
+
+def _build_summary(results: List[Any]) -> Dict[str, Any]:
+    """Assemble pipelined summary reads into a summary dict"""
+    counters, top = results
+    return build_summary(
+        {_text(field): count for field, count in counters.items()},
+        [(_text(value), count) for value, count in top],
+    )
+
+
+def _build_context(
+    investigation_id: str, results: List[Any], serializer: Serializer
+) -> Optional[Dict[str, Any]]:
+    """Assemble pipelined context reads into a context dict"""
+    entries, timeline, metadata, alerts = results
+    if not (entries or timeline or metadata):
+        return None
+
+    return {
+        "investigation_id": investigation_id,
+        "metadata": {_text(k): json.loads(v) for k, v in metadata.items()},
+        "findings": [
+            serializer.decode(fields.get(b"data", fields.get("data"))) for _, fields in entries
+        ],
+        "timeline": _parse_events(timeline, serializer),
+        "related_alerts": [serializer.decode(alert) for alert in alerts],
+    }
+
+
+class AsyncRedisMemoryStore:
+    """
+    Async Redis implementation of persistent memory store
+
+    Findings are appended to a per-investigation Redis Stream, each entry
+    holding a single ``data`` field encoded by the configured codec (see
+    ``memory.codecs``); timeline events and related alerts use the same
+    codec, while metadata stays JSON. Timeline events are indexed in a
+    sorted set scored by event timestamp, with bodies in a hash, so appends
+    are O(log n) and range, page and tail reads cost O(log n + k) in one
+    script call. Writes and context reads are pipelined so a call costs one
+    round trip regardless of how many findings it touches.
+
+    Each finding write also updates the investigation's aggregates in the
+    same MULTI/EXEC block: severity, agent, type and MITRE technique
+    counters in a hash and indicator counts in a sorted set. Aggregates
+    cover every finding ever stored, including any trimmed from the
+    stream by ``max_findings``.
+
+    Investigations idle for ``archive_idle_seconds`` are moved to the disk
+    archive by ``archive_idle`` so Redis only holds active work. A read that
+    finds nothing in Redis, or a write to an investigation with no recent
+    activity, first restores the investigation from the archive, so callers
+    never see or extend a partial copy. Writers remember investigations
+    they found active for half the idle period, during which no sweep can
+    archive them, so only the first write in that period pays a ZSCORE
+    round trip, plus an archive index lookup if the investigation is new.
+
+    Findings and timeline events are also published as investigation events
+    (see ``memory.events``) for clients streaming progress.
     """
-    Redis implementation of persistent memory store
-    
-    TODO: Implement investigation context storage
-    TODO: Add timeline management
-    TODO: Implement finding aggregation
-    """
-    
-    def __init__(self, host: str = "localhost", port: int = 6379):
-        self.client = redis.Redis(host=host, port=port, decode_responses=True)
-    
-    def store_finding(self, investigation_id: str, finding: Dict[str, Any]):
+
+    def __init__(
+        self,
+        pool: Optional[aioredis.ConnectionPool] = None,
+        max_findings: Optional[int] = 10000,
+        serializer: Optional[Serializer] = None,
+        archive: Optional[InvestigationArchive] = None,
+    ):
+        self.client = aioredis.Redis(connection_pool=pool or get_async_pool(binary=True))
+        self.serializer = serializer or get_serializer()
+        self._timeline_script = self.client.register_script(TIMELINE_SCRIPT)
+        self._evict_script = self.client.register_script(EVICT_SCRIPT)
+        self._event_script = self.client.register_script(PUBLISH_SCRIPT)
+        # Approximate stream cap so a runaway investigation cannot grow unbounded
+        self.max_findings = max_findings
+        if archive is None and settings.archive_enabled:
+            archive = InvestigationArchive(serializer=self.serializer)
+        self.archive = archive
+        # Investigations known to be in Redis, so writes skip the archive check
+        self._active = LRUTTLCache(max_size=10000)
+
+    async def store_finding(self, investigation_id: str, finding: Dict[str, Any]) -> str:
         """Store a finding for an investigation"""
-        # TODO: Implement
-        raise NotImplementedError("Coming soon!")
-    
-    def get_context(self, investigation_id: str) -> Optional[Dict[str, Any]]:
-        """Retrieve full investigation context"""
-        # TODO: Implement
-        raise NotImplementedError("Coming soon!")
+        return (await self.store_findings_bulk(investigation_id, [finding]))[0]
+
+    async def store_findings_bulk(
+        self, investigation_id: str, findings: Iterable[Dict[str, Any]]
+    ) -> List[str]:
+        """Store several findings and update aggregates in one MULTI/EXEC round trip"""
+        findings = list(findings)
+        await self._restore_before_write(investigation_id)
+        async with self.client.pipeline(transaction=True) as pipe:
+            _queue_findings(pipe, investigation_id, findings, self.max_findings, self.serializer)
+            for finding in findings:
+                queue_event(pipe, self._event_script, investigation_id, "finding", finding)
+            return [_text(entry_id) for entry_id in (await pipe.execute())[:len(findings)]]
+
+    async def add_timeline_event(self, investigation_id: str, event: Dict[str, Any]):
+        """Append an event to the investigation timeline"""
+        await self._restore_before_write(investigation_id)
+        async with self.client.pipeline(transaction=False) as pipe:
+            _queue_timeline_event(pipe, investigation_id, event, self.serializer)
+            queue_event(pipe, self._event_script, investigation_id, "timeline", event)
+            await pipe.execute()
+
+    async def publish_event(self, investigation_id: str, event_type: str, data: Dict[str, Any]):
+        """Publish a progress event to clients following the investigation"""
+        async with self.client.pipeline(transaction=False) as pipe:
+            queue_event(pipe, self._event_script, investigation_id, event_type, data)
+            await pipe.execute()
+
+    async def set_metadata(self, investigation_id: str, metadata: Dict[str, Any]):
+        """Merge metadata fields into the investigation record"""
+        if not metadata:
+            return
+        await self._restore_before_write(investigation_id)
+        async with self.client.pipeline(transaction=False) as pipe:
+            _queue_metadata(pipe, investigation_id, metadata)
+            await pipe.execute()
+
+    async def attach_alert(self, investigation_id: str, alert: Dict[str, Any]):
+        """Attach a duplicate alert to an existing investigation"""
+        await self._restore_before_write(investigation_id)
+        async with self.client.pipeline(transaction=False) as pipe:
+            _queue_related_alert(pipe, investigation_id, alert, self.serializer)
+            await pipe.execute()
+
+    async def get_timeline(
+        self,
+        investigation_id: str,
+        start: Optional[TimePoint] = None,
+        end: Optional[TimePoint] = None,
+        offset: int = 0,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Read timeline events in chronological order
+
+        Args:
+            investigation_id: Investigation to read
+            start: Earliest timestamp (inclusive), or None for the beginning
+            end: Latest timestamp (inclusive), or None for the end
+            offset: Events to skip, for paging through a range
+            limit: Maximum events to return, or None for all
+
+        Returns:
+            Timeline events
+        """
+        async def read():
+            async with self.client.pipeline(transaction=False) as pipe:
+                _queue_timeline_range(
+                    pipe, self._timeline_script, investigation_id, start, end, offset, limit
+                )
+                return (await pipe.execute())[0]
+
+        return _parse_events(await self._read(investigation_id, read), self.serializer)
+
+    async def get_timeline_tail(self, investigation_id: str, count: int) -> List[Dict[str, Any]]:
+        """Read the last ``count`` timeline events in chronological order"""
+        async def read():
+            async with self.client.pipeline(transaction=False) as pipe:
+                _queue_timeline_range(
+                    pipe, self._timeline_script, investigation_id, limit=count, newest_first=True
+                )
+                return (await pipe.execute())[0]
+
+        return _parse_events(await self._read(investigation_id, read), self.serializer)[::-1]
+
+    async def get_recent_findings(
+        self, investigation_id: str, count: int
+    ) -> List[Dict[str, Any]]:
+        """Read the last ``count`` findings, newest first"""
+        entries = await self._read(
+            investigation_id,
+            lambda: self.client.xrevrange(_key(FINDINGS_KEY, investigation_id), count=count),
+        )
+        return [
+            self.serializer.decode(fields.get(b"data", fields.get("data"))) for _, fields in entries
+        ]
+
+    async def count_timeline(
+        self,
+        investigation_id: str,
+        start: Optional[TimePoint] = None,
+        end: Optional[TimePoint] = None,
+    ) -> int:
+        """Count timeline events in a time range"""
+        return await self._read(
+            investigation_id,
+            lambda: self.client.zcount(
+                _key(TIMELINE_KEY, investigation_id),
+                _score_bound(start, "-inf"),
+                _score_bound(end, "+inf"),
+            ),
+        )
+
+    async def get_metadata(self, investigation_id: str) -> Dict[str, Any]:
+        """Read the investigation record without loading findings or the timeline"""
+        metadata = await self._read(
+            investigation_id, lambda: self.client.hgetall(_key(METADATA_KEY, investigation_id))
+        )
+        return {_text(k): json.loads(v) for k, v in metadata.items()}
+
+    async def get_summary(self, investigation_id: str, top_k: int = 10) -> Dict[str, Any]:
+        """
+        Read the finding summary maintained by ``store_finding``
+
+        Cost is independent of the number of findings: one hash read plus
+        the top ``top_k`` indicators.
+
+        Returns:
+            Dict with total, severity, agents, types, mitre_techniques and
+            top_indicators
+        """
+        async def read():
+            async with self.client.pipeline(transaction=False) as pipe:
+                _queue_summary(pipe, investigation_id, top_k)
+                results = await pipe.execute()
+            # Empty counters mean no findings yet, or an archived investigation
+            return results if results[0] else None
+
+        return _build_summary(await self._read(investigation_id, read) or [{}, []])
+
+    async def get_context(self, investigation_id: str) -> Optional[Dict[str, Any]]:
+        """Retrieve full investigation context, restoring it from the archive if needed"""
+        async with self.client.pipeline(transaction=False) as pipe:
+            _queue_context(pipe, self._timeline_script, investigation_id)
+            context = _build_context(investigation_id, await pipe.execute(), self.serializer)
+        if context is None and self.archive is not None:
+            context = await self.rehydrate(investigation_id)
+        return context
+
+    async def _restore_archived(self, investigation_id: str) -> bool:
+        """
+        Rehydrate an investigation with no recent activity in Redis
+
+        Returns:
+            True if it was restored from the archive
+        """
+        if self.archive is None:
+            return False
+        if await self.client.zscore(ACTIVE_KEY, investigation_id) is not None:
+            return False
+        if not await asyncio.to_thread(self.archive.contains, investigation_id):
+            return False
+        return await self.rehydrate(investigation_id) is not None
+
+    async def _restore_before_write(self, investigation_id: str):
+        """Restore an archived investigation before writing, unless it was recently checked"""
+        if self.archive is None or investigation_id in self._active:
+            return
+        await self._restore_archived(investigation_id)
+        # A sweep only archives investigations idle for archive_idle_seconds
+        self._active.set(investigation_id, True, ttl=settings.archive_idle_seconds / 2)
+
+    async def _read(self, investigation_id: str, read: Callable[[], Awaitable[Any]]) -> Any:
+        """Run a read, restoring the investigation and reading again if it came back empty"""
+        result = await read()
+        if not result and await self._restore_archived(investigation_id):
+            result = await read()
+        return result
+
+    async def rehydrate(self, investigation_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Move an archived investigation back into Redis
+
+        Concurrent callers, in this or another worker, wait for the first
+        one to finish instead of restoring the same record twice.
+
+        Returns:
+            The restored context, or None if the investigation is not archived
+        """
+        lock = _key(REHYDRATE_LOCK_KEY, investigation_id)
+        if not await self.client.set(lock, 1, nx=True, ex=30):
+            for _ in range(300):
+                await asyncio.sleep(0.1)
+                if not await self.client.exists(lock):
+                    break
+            async with self.client.pipeline(transaction=False) as pipe:
+                _queue_context(pipe, self._timeline_script, investigation_id)
+                return _build_context(investigation_id, await pipe.execute(), self.serializer)
+
+        try:
+            record = await asyncio.to_thread(self.archive.load, investigation_id)
+            if record is None:
+                return None
+            async with self.client.pipeline(transaction=True) as pipe:
+                _queue_restore(pipe, record, self.serializer)
+                await pipe.execute()
+            await asyncio.to_thread(self.archive.remove, investigation_id)
+            return record["context"]
+        finally:
+            await self.client.delete(lock)
+
+    async def archive_idle(
+        self, idle_seconds: Optional[int] = None, limit: Optional[int] = None
+    ) -> int:
+        """
+        Move investigations idle for ``idle_seconds`` from Redis to the archive
+
+        Only one worker sweeps at a time. An investigation written to while
+        it is being archived stays in Redis and its archive record is dropped.
+        If the investigation is already archived, because a write raced an
+        earlier sweep, the Redis copy is merged into the archived record
+        rather than replacing it.
+
+        Returns:
+            Number of investigations archived
+        """
+        if self.archive is None:
+            return 0
+        idle_seconds = idle_seconds or settings.archive_idle_seconds
+        limit = limit or settings.archive_batch_size
+        if not await self.client.set(ARCHIVE_LOCK_KEY, os.getpid(), nx=True, ex=300):
+            return 0
+
+        archived = 0
+        try:
+            idle = await self.client.zrangebyscore(
+                ACTIVE_KEY, "-inf", time.time() - idle_seconds, start=0, num=limit
+            )
+            for investigation_id in map(_text, idle):
+                async with self.client.pipeline(transaction=False) as pipe:
+                    _queue_snapshot(pipe, self._timeline_script, investigation_id)
+                    record = _build_snapshot(
+                        investigation_id, await pipe.execute(), self.serializer
+                    )
+                if record is None:
+                    await self.client.zrem(ACTIVE_KEY, investigation_id)
+                    continue
+
+                previous = await asyncio.to_thread(self.archive.load, investigation_id)
+                if previous is not None:
+                    record = _merge_records(previous, record)
+                await asyncio.to_thread(self.archive.write, investigation_id, record)
+                evicted = await self._evict_script(
+                    keys=[ACTIVE_KEY] + [_key(k, investigation_id) for k in INVESTIGATION_KEYS],
+                    args=[investigation_id, record["last_active"]],
+                )
+                if evicted:
+                    self._active.pop(investigation_id)
+                    await self.client.publish(INVALIDATION_CHANNEL, investigation_id)
+                    archived += 1
+                elif previous is not None:
+                    await asyncio.to_thread(self.archive.write, investigation_id, previous)
+                else:
+                    await asyncio.to_thread(self.archive.remove, investigation_id)
+        finally:
+            await self.client.delete(ARCHIVE_LOCK_KEY)
+        return archived
+
+    async def run_archiver(self, interval: Optional[float] = None):
+        """Archive idle investigations every ``interval`` seconds until cancelled"""
+        while True:
+            try:
+                archived = await self.archive_idle()
+                if archived:
+                    logger.info("Archived %d idle investigations", archived)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Archive sweep failed")
+            # Read each time so a settings reload takes effect
+            await asyncio.sleep(interval or settings.archive_sweep_interval)
+
+
+class RedisMemoryStore:
+    """
+    Synchronous wrapper over ``AsyncRedisMemoryStore``
+
+    For scripts and tools that run outside the orchestrator event loop.
+    Each instance runs an ``AsyncRedisMemoryStore`` on a private event loop
+    in a daemon thread and blocks on its results, so the two stores share
+    one implementation: writes publish progress events, archived
+    investigations are restored, and so on. Every public method of the
+    async store is available here with the same arguments, returning the
+    result instead of a coroutine. Call ``close`` when done.
+    """
+
+    def __init__(
+        self,
+        host: Optional[str] = None,
+        port: Optional[int] = None,
+        max_findings: Optional[int] = 10000,
+        serializer: Optional[Serializer] = None,
+        archive: Optional[InvestigationArchive] = None,
+        pool: Optional[aioredis.ConnectionPool] = None,
+    ):
+        # Not the shared pool: its connections belong to the private loop
+        pool = pool or _new_async_pool(binary=True, host=host, port=port)
+        self._store = AsyncRedisMemoryStore(pool, max_findings, serializer, archive)
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name="redis-memory-store", daemon=True
+        )
+        self._thread.start()
+
+    def __getattr__(self, name: str):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        attr = getattr(self._store, name)
+        if not asyncio.iscoroutinefunction(attr):
+            return attr
+
+        @functools.wraps(attr)
+        def call(*args, **kwargs):
+            return self._run(attr(*args, **kwargs))
+
+        return call
+
+    def _run(self, coro: Awaitable[Any]) -> Any:
+        """Run a coroutine on the private loop and wait for its result"""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    def close(self):
+        """Disconnect from Redis and stop the private event loop"""
+        if self._loop.is_closed():
+            return
+        self._run(self._store.client.connection_pool.disconnect())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
@@ -0,0 +1 @@
+"""Investigation report rendering"""
@@ -0,0 +1,233 @@
+"""
+Investigation report builder with precompiled templates and streaming output
+"""
+
+import asyncio
+import hashlib
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Any, Callable, Iterator, List, Optional
+
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+from markupsafe import Markup
+
+from config.settings import settings
+from llm.context_builder import SEVERITY_WEIGHTS
+from reports.formatters.filters import FILTERS
+from utils.cache import LRUTTLCache
+
+TEMPLATE_DIR = Path(__file__).parent / "templates"
+
+# Output format -> (template directory, template suffix)
+FORMATS = {"markdown": ("markdown", ".md.j2"), "html": ("html", ".html.j2")}
+
+# Report sections in document order, each mapped to the subset of report data
+# its template reads; a section is only re-rendered when that subset changes
+SECTIONS: Dict[str, Callable[[Dict[str, Any]], Dict[str, Any]]] = {
+    "summary": lambda report: {
+        "metadata": {"analysis": report["metadata"].get("analysis")},
+        "summary": {k: v for k, v in report["summary"].items() if k != "top_indicators"},
+        "severity_counts": report["severity_counts"],
+        "findings": report["findings"],
+    },
+    "indicators": lambda report: {
+        "summary": {"top_indicators": report["summary"]["top_indicators"]},
+    },
+    "timeline": lambda report: {
+        "timeline": report["timeline"],
+        "timeline_total": report["timeline_total"],
+    },
+    "recommendations": lambda report: {
+        "recommendations": report["recommendations"],
+    },
+}
+
+# Metadata shown in the document header, outside any section
+HEADER_FIELDS = ("query", "status", "started_at")
+
+SEVERITY_ORDER = sorted(SEVERITY_WEIGHTS, key=SEVERITY_WEIGHTS.get, reverse=True)
+
+
+def _content_hash(data: Any) -> str:
+    """Stable digest of JSON-compatible data"""
+    encoded = json.dumps(data, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.blake2b(encoded.encode(), digest_size=16).hexdigest()
+
+
+def _recommendations(metadata: Dict[str, Any], findings: List[Dict[str, Any]]) -> List[str]:
+    """Recommendations from the investigation record and findings, without repeats"""
+    recommendations = list(metadata.get("recommendations") or [])
+    for finding in findings:
+        if finding.get("recommendation"):
+            recommendations.append(finding["recommendation"])
+    return list(dict.fromkeys(str(r) for r in recommendations))
+
+
+class ReportBuilder:
+    """
+    Renders investigation reports as Markdown or HTML
+
+    Every template is compiled once when the builder is created, so
+    rendering a report only executes already-compiled template code.
+    Reports are built from the aggregated finding summary, the most severe
+    of the latest findings and the tail of the timeline, never the full
+    finding log, so their cost stays flat as investigations grow. Output is
+    produced as a stream of chunks that can be written to a response
+    before the whole document has been rendered.
+
+    Each section is rendered on its own from only the data it shows, and
+    the fragment is cached under a hash of that data. Refreshing a report
+    after new findings arrive re-renders just the sections whose inputs
+    changed; the rest are reused as-is.
+    """
+
+    def __init__(
+        self,
+        template_dir: Optional[Path] = None,
+        max_findings: Optional[int] = None,
+        scan_findings: Optional[int] = None,
+        timeline_events: Optional[int] = None,
+        fragment_cache_size: Optional[int] = None,
+        fragment_ttl: Optional[float] = None,
+    ):
+        self.max_findings = max_findings or settings.report_max_findings
+        self.scan_findings = scan_findings or settings.report_scan_findings
+        self.timeline_events = timeline_events or settings.report_timeline_events
+        self.fragments = LRUTTLCache(
+            max_size=fragment_cache_size or settings.report_fragment_cache_size,
+            ttl=fragment_ttl or settings.ttls.report_fragment,
+        )
+        self.rendered_sections = 0
+        # Streams are consumed from threadpool workers; the cache is not thread-safe
+        self._lock = threading.Lock()
+        self.env = Environment(
+            loader=FileSystemLoader(str(template_dir or TEMPLATE_DIR)),
+            autoescape=select_autoescape(enabled_extensions=("html.j2",)),
+            trim_blocks=True,
+            lstrip_blocks=True,
+            auto_reload=False,
+            cache_size=-1,
+        )
+        self.env.filters.update(FILTERS)
+        # Compile every template now rather than on the first report
+        for name in self.env.list_templates(extensions=["j2"]):
+            self.env.get_template(name)
+
+    async def collect(self, memory, investigation_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Read the data a report is rendered from
+
+        Every call reads afresh: the summary, the latest ``scan_findings``
+        findings (1000 by default) and the last ``timeline_events`` events,
+        even if only one section changed since the last refresh. The
+        fragment cache saves the rendering, not these reads, whose cost is
+        bounded by those limits rather than by the investigation's size.
+
+        Args:
+            memory: Async memory store
+            investigation_id: Investigation to report on
+
+        Returns:
+            Report data, or None if the investigation does not exist
+        """
+        metadata, summary, recent, timeline, timeline_total = await asyncio.gather(
+            memory.get_metadata(investigation_id),
+            memory.get_summary(investigation_id),
+            memory.get_recent_findings(investigation_id, self.scan_findings),
+            memory.get_timeline_tail(investigation_id, self.timeline_events),
+            memory.count_timeline(investigation_id),
+        )
+        if not metadata and not summary["total"]:
+            return None
+        return self.prepare(investigation_id, metadata, summary, recent, timeline, timeline_total)
+
+    def prepare(
+        self,
+        investigation_id: str,
+        metadata: Dict[str, Any],
+        summary: Dict[str, Any],
+        recent_findings: List[Dict[str, Any]],
+        timeline: List[Dict[str, Any]],
+        timeline_total: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Shape raw memory reads into the data the templates render"""
+        # Most severe first; the sort is stable, so newest first within a severity
+        findings = sorted(
+            recent_findings,
+            key=lambda f: SEVERITY_WEIGHTS.get(str(f.get("severity", "info")).lower(), 1.0),
+            reverse=True,
+        )[:self.max_findings]
+        severity_counts = [
+            (severity, summary["severity"][severity])
+            for severity in SEVERITY_ORDER
+            if severity in summary["severity"]
+        ]
+        severity_counts += [
+            (severity, count)
+            for severity, count in summary["severity"].items()
+            if severity not in SEVERITY_WEIGHTS
+        ]
+        return {
+            "investigation_id": investigation_id,
+            "generated_at": time.time(),
+            "metadata": metadata,
+            "summary": summary,
+            "severity_counts": severity_counts,
+            "findings": findings,
+            "timeline": timeline,
+            "timeline_total": len(timeline) if timeline_total is None else timeline_total,
+            "recommendations": _recommendations(metadata, recent_findings),
+        }
+
+    def _fragment(self, fmt: str, section: str, report: Dict[str, Any]) -> Markup:
+        """Rendered section, reused while its inputs are unchanged"""
+        context = SECTIONS[section](report)
+        key = (fmt, section, _content_hash(context))
+        with self._lock:
+            fragment = self.fragments.get(key)
+        if fragment is None:
+            directory, suffix = FORMATS[fmt]
+            template = self.env.get_template(f"{directory}/{section}{suffix}")
+            # Already escaped where needed; Markup stops the document escaping it again
+            fragment = Markup(template.render(context))
+            with self._lock:
+                self.fragments.set(key, fragment)
+                self.rendered_sections += 1
+        return fragment
+
+    def fingerprint(self, report: Dict[str, Any]) -> str:
+        """
+        Hash of everything a rendered report shows apart from its generation time
+
+        Equal fingerprints mean identical documents, so a PDF already
+        produced for one can be reused for the other.
+        """
+        header = {field: report["metadata"].get(field) for field in HEADER_FIELDS}
+        sections = {name: SECTIONS[name](report) for name in SECTIONS}
+        return _content_hash([report["investigation_id"], header, sections])
+
+    def stream(self, report: Dict[str, Any], fmt: str = "markdown") -> Iterator[str]:
+        """
+        Render a report incrementally
+
+        Args:
+            report: Data from ``collect`` or ``prepare``
+            fmt: ``markdown`` or ``html``
+
+        Yields:
+            Chunks of the rendered document
+        """
+        if fmt not in FORMATS:
+            raise ValueError(f"Unsupported report format '{fmt}'")
+        directory, suffix = FORMATS[fmt]
+        # A generator, so each section renders only when the stream reaches it
+        fragments = (self._fragment(fmt, section, report) for section in SECTIONS)
+        return self.env.get_template(f"{directory}/report{suffix}").generate(
+            {**report, "fragments": fragments}
+        )
+
+    def render(self, report: Dict[str, Any], fmt: str = "markdown") -> str:
+        """Render a complete report"""
+        return "".join(self.stream(report, fmt))
@@ -0,0 +1,46 @@
+"""
+Jinja filters shared by the report templates
+"""
+
+import threading
+from datetime import datetime, timezone
+from typing import Any
+
+import markdown as _markdown
+from markupsafe import Markup, escape
+
+# Converters are reused across calls (``reset`` clears per-document state) but
+# are not thread-safe, and streamed reports render in threadpool workers
+_local = threading.local()
+
+
+def markdown_to_html(text: Any) -> Markup:
+    """Render Markdown text as HTML, escaping any raw HTML it contains"""
+    if not text:
+        return Markup("")
+    converter = getattr(_local, "converter", None)
+    if converter is None:
+        converter = _local.converter = _markdown.Markdown(extensions=["tables", "fenced_code"])
+    return Markup(converter.reset().convert(str(escape(text))))
+
+
+def format_timestamp(value: Any) -> str:
+    """Format epoch seconds, epoch milliseconds or an ISO string as UTC"""
+    if value is None or value == "":
+        return "-"
+    if isinstance(value, (int, float)):
+        seconds = value / 1000 if value > 1e11 else value
+        return datetime.fromtimestamp(seconds, timezone.utc).strftime("%Y-%m-%d %H:%M:%S UTC")
+    return str(value)
+
+
+def md_cell(value: Any) -> str:
+    """Make a value safe to place in a Markdown table cell"""
+    return str(value).replace("|", "\\|").replace("\n", " ")
+
+
+FILTERS = {
+    "markdown": markdown_to_html,
+    "timestamp": format_timestamp,
+    "md_cell": md_cell,
+}
@@ -0,0 +1,212 @@
+"""
+Background PDF rendering in a process pool
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, List, Optional
+
+from config.settings import settings
+from utils.cache import LRUTTLCache
+
+logger = logging.getLogger(__name__)
+
+# Longest wait, in seconds, between sweeps for expired jobs
+SWEEP_INTERVAL = 60.0
+
+
+def render_pdf(html: str, path: str) -> int:
+    """Convert an HTML document to a PDF file, returning its size in bytes"""
+    from weasyprint import HTML
+
+    HTML(string=html).write_pdf(path)
+    return os.path.getsize(path)
+
+
+def _warm_renderer(renderer: Callable[[str, str], int], directory: str):
+    """Process-pool initializer: load the renderer and its fonts before the first job"""
+    path = os.path.join(directory, f".warmup-{os.getpid()}.pdf")
+    try:
+        renderer("<p>warmup</p>", path)
+    except Exception:
+        logger.exception("PDF renderer warm-up failed")
+    finally:
+        if os.path.exists(path):
+            os.remove(path)
+
+
+@dataclass
+class PDFJob:
+    """A queued PDF conversion"""
+
+    id: str
+    investigation_id: str
+    path: str
+    status: str = "queued"
+    size: Optional[int] = None
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+    html: Optional[str] = field(default=None, repr=False)
+    done: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+
+
+class PDFJobQueue:
+    """
+    Converts report HTML to PDF without blocking the event loop
+
+    WeasyPrint is slow and CPU-bound, so conversions run in a pool of
+    worker processes that load it once at startup. Jobs wait in a bounded
+    queue; ``submit`` returns immediately with a job to poll or await, and
+    raises ``asyncio.QueueFull`` when the backlog is full so callers can
+    shed load. Finished jobs are remembered for ``report_job_ttl`` seconds.
+    Jobs submitted with a content key can be found again with ``lookup``,
+    so an unchanged report is never converted twice.
+
+    A job's PDF is deleted once the job is forgotten, whether it expires or
+    is evicted to make room; expired jobs are swept on a timer so their
+    files do not wait for the next lookup.
+    """
+
+    def __init__(
+        self,
+        processes: Optional[int] = None,
+        queue_size: Optional[int] = None,
+        output_dir: Optional[str] = None,
+        renderer: Callable[[str, str], int] = render_pdf,
+        job_ttl: Optional[float] = None,
+    ):
+        self.processes = processes or settings.pools.report_pdf_processes
+        self.output_dir = Path(output_dir or settings.report_dir)
+        self.renderer = renderer
+        job_ttl = job_ttl or settings.ttls.report_job
+        self.jobs = LRUTTLCache(max_size=10000, ttl=job_ttl, on_remove=self._forget)
+        self.jobs_by_key = LRUTTLCache(max_size=10000, ttl=job_ttl)
+        self.completed = 0
+        self.failed = 0
+        self._queue: asyncio.Queue = asyncio.Queue(queue_size or settings.concurrency.report_pdf_queue)
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._tasks: List[asyncio.Task] = []
+
+    async def start(self):
+        """Start the worker processes and dispatchers"""
+        if self._pool is not None:
+            return
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.processes,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_warm_renderer,
+            initargs=(self.renderer, str(self.output_dir)),
+        )
+        # One dispatcher per process keeps every worker busy without oversubscribing them
+        self._tasks = [asyncio.create_task(self._dispatch()) for _ in range(self.processes)]
+        self._tasks.append(asyncio.create_task(self._sweep()))
+
+    async def stop(self):
+        """Stop dispatching and shut the worker processes down"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+    def submit(self, investigation_id: str, html: str, key: Optional[str] = None) -> PDFJob:
+        """Queue a conversion and return its job, registered under ``key`` if given"""
+        job_id = uuid.uuid4().hex
+        job = PDFJob(
+            id=job_id,
+            investigation_id=investigation_id,
+            path=str(self.output_dir / f"{investigation_id}-{job_id}.pdf"),
+            html=html,
+        )
+        self._queue.put_nowait(job)
+        self.jobs.set(job_id, job)
+        if key is not None:
+            self.jobs_by_key.set(key, job)
+        return job
+
+    def lookup(self, key: str) -> Optional[PDFJob]:
+        """A queued, running or completed job for the same content, if any"""
+        job = self.jobs_by_key.get(key)
+        if job is None or job.status == "failed":
+            return None
+        if job.status == "completed" and not os.path.exists(job.path):
+            return None
+        return job
+
+    def get(self, job_id: str) -> Optional[PDFJob]:
+        """Look up a job by ID"""
+        return self.jobs.get(job_id)
+
+    async def wait(self, job: PDFJob, timeout: Optional[float] = None) -> PDFJob:
+        """Wait for a job to finish"""
+        await asyncio.wait_for(job.done.wait(), timeout)
+        return job
+
+    def prune(self) -> int:
+        """Forget expired jobs and delete their PDFs, returning how many were dropped"""
+        self.jobs_by_key.purge_expired()
+        return self.jobs.purge_expired()
+
+    @property
+    def backlog(self) -> int:
+        """Jobs waiting for a worker"""
+        return self._queue.qsize()
+
+    async def _dispatch(self):
+        """Hand queued jobs to the process pool one at a time"""
+        loop = asyncio.get_running_loop()
+        while True:
+            job = await self._queue.get()
+            job.status = "running"
+            try:
+                job.size = await loop.run_in_executor(
+                    self._pool, self.renderer, job.html, job.path
+                )
+                job.status = "completed"
+                self.completed += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.exception("PDF rendering for %s failed", job.investigation_id)
+                job.status = "failed"
+                job.error = str(e) or type(e).__name__
+                self.failed += 1
+            finally:
+                job.html = None
+                job.finished_at = time.time()
+                job.done.set()
+                # Dropped while queued or running, so nothing will remove its file later
+                if job.id not in self.jobs:
+                    self._remove_file(job)
+
+    async def _sweep(self):
+        """Prune expired jobs periodically"""
+        while True:
+            await asyncio.sleep(min(self.jobs.ttl, SWEEP_INTERVAL))
+            self.prune()
+
+    def _forget(self, job_id: str, job: PDFJob):
+        """Cache callback for an expired or evicted job"""
+        # An unfinished job's file is removed by its dispatcher once it finishes
+        if job.done.is_set():
+            self._remove_file(job)
+
+    @staticmethod
+    def _remove_file(job: PDFJob):
+        try:
+            os.remove(job.path)
+        except FileNotFoundError:
+            pass
+        except OSError:
+            logger.warning("Could not delete PDF report %s", job.path, exc_info=True)
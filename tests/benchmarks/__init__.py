@@ -0,0 +1 @@
+"""Package: tests/benchmarks"""
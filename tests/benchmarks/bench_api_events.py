@@ -0,0 +1,146 @@
+"""
+Investigation submission latency and SSE fan-out latency under many streaming clients
+
+Submits ``--investigations`` investigations through POST /investigations,
+opens ``--clients`` Server-Sent Events streams spread across them, then
+publishes ``--events`` progress events per investigation followed by a
+completed status. Reports POST latency, the time from publish to receipt
+at each client, and whether every client saw the full stream starting
+with "queued". The API runs under uvicorn in this process, against a
+fakeredis server over TCP unless a Redis host is given:
+
+    python -m tests.benchmarks.bench_api_events
+    python -m tests.benchmarks.bench_api_events --clients 1000 --host localhost
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import socket
+import statistics
+import time
+
+import httpx
+import redis.asyncio as aioredis
+import uvicorn
+from fastapi import FastAPI
+
+from api.routes import investigations
+from config.settings import Settings, configure
+from core.work_queue import RedisStreamWorkQueue
+from memory.events import EventBroker
+from tests.fixtures import fake_redis
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _percentile(values, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+async def _follow(client: httpx.AsyncClient, investigation_id: str, opened: asyncio.Event):
+    """Read one SSE stream to its end, returning statuses seen and receipt delays"""
+    statuses, delays, event_type = [], [], None
+    async with client.stream("GET", f"/investigations/{investigation_id}/events") as response:
+        opened.set()
+        async for line in response.aiter_lines():
+            if line.startswith("event: "):
+                event_type = line[7:]
+            elif line.startswith("data: "):
+                data = json.loads(line[6:])
+                if event_type == "status":
+                    statuses.append(data["status"])
+                elif "sent" in data:
+                    delays.append(time.time() - data["sent"])
+    return statuses, delays
+
+
+async def run(host: str, port: int, investigation_count: int, clients: int, events: int):
+    client = aioredis.Redis(host=host, port=port, decode_responses=True, max_connections=64)
+    broker = EventBroker(client=client)
+    app = FastAPI()
+    app.include_router(investigations.router)
+    app.state.events = broker
+    app.state.queue = RedisStreamWorkQueue(
+        stream="bench:alerts", group="bench", client=client, max_backlog=10**9
+    )
+    await broker.start()
+
+    api_port = _free_port()
+    server = uvicorn.Server(
+        uvicorn.Config(app, port=api_port, log_level="warning", lifespan="off")
+    )
+    serving = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+
+    limits = httpx.Limits(max_connections=clients + 10, max_keepalive_connections=clients + 10)
+    async with httpx.AsyncClient(
+        base_url=f"http://127.0.0.1:{api_port}", limits=limits, timeout=None
+    ) as http:
+        submit_latency, ids = [], []
+        for _ in range(investigation_count):
+            start = time.perf_counter()
+            response = await http.post("/investigations", json={"query": "bench"})
+            submit_latency.append(time.perf_counter() - start)
+            ids.append(response.json()["investigation_id"])
+
+        opened = [asyncio.Event() for _ in range(clients)]
+        followers = [
+            asyncio.create_task(_follow(http, ids[i % len(ids)], opened[i]))
+            for i in range(clients)
+        ]
+        await asyncio.gather(*(event.wait() for event in opened))
+        # Let every stream finish replaying before live events start
+        await asyncio.sleep(0.5)
+
+        for n in range(events):
+            for investigation_id in ids:
+                await broker.publish(investigation_id, "progress", {"n": n, "sent": time.time()})
+            await asyncio.sleep(0.01)
+        for investigation_id in ids:
+            await broker.publish(investigation_id, "status", {"status": "completed"})
+        results = await asyncio.gather(*followers)
+
+    server.should_exit = True
+    await serving
+    await broker.stop()
+    await client.aclose()
+
+    delays = [delay for _, follower_delays in results for delay in follower_delays]
+    complete = sum(
+        statuses == ["queued", "completed"] and len(follower_delays) == events
+        for statuses, follower_delays in results
+    )
+    print(f"POST /investigations: p50 {statistics.median(submit_latency) * 1000:.1f} ms, "
+          f"p95 {_percentile(submit_latency, 0.95) * 1000:.1f} ms")
+    print(f"fan-out to {clients} clients: p50 {statistics.median(delays) * 1000:.1f} ms, "
+          f"p95 {_percentile(delays, 0.95) * 1000:.1f} ms, max {max(delays) * 1000:.1f} ms")
+    print(f"clients that saw queued, all {events} events and completed: {complete}/{clients}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", help="Redis host; a fakeredis TCP server is started if omitted")
+    parser.add_argument("--port", type=int, default=6379)
+    parser.add_argument("--investigations", type=int, default=10)
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--events", type=int, default=20)
+    args = parser.parse_args()
+
+    configure(Settings(archive_enabled=False))
+    with contextlib.ExitStack() as stack:
+        host, port = args.host, args.port
+        if host is None:
+            host, port = stack.enter_context(fake_redis.tcp_server())
+        asyncio.run(run(host, port, args.investigations, args.clients, args.events))
+
+
+if __name__ == "__main__":
+    main()
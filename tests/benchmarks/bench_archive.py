@@ -0,0 +1,130 @@
+"""
+Write overhead of the archive check, sweep throughput and rehydrate latency
+
+Creates ``--investigations`` investigations of ``--findings`` findings and
+``--events`` timeline events, first through a store without an archive and
+then through one with it, reporting the per-write cost the archive check
+adds. It then sweeps them all to the disk archive, reports the record size
+on disk, and times restoring each one with ``get_context``. Runs against a
+fakeredis server over TCP unless a Redis host is given:
+
+    python -m tests.benchmarks.bench_archive
+    python -m tests.benchmarks.bench_archive --compress-threshold 1024 --host localhost
+"""
+
+import argparse
+import asyncio
+import contextlib
+import statistics
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+import redis.asyncio as aioredis
+
+from config.settings import Settings, configure
+from memory.archive import InvestigationArchive
+from memory.codecs import Serializer
+from memory.redis_store import ACTIVE_KEY, EVICT_SCRIPT, AsyncRedisMemoryStore
+from tests.fixtures import fake_redis
+
+BASE = 1_767_225_600
+
+
+def _finding(i: int) -> dict:
+    return {
+        "type": "ioc",
+        "agent": "threat_intel",
+        "severity": ("low", "medium", "high")[i % 3],
+        "indicator": f"10.0.{i // 256 % 256}.{i % 256}",
+        "summary": "Repeated failed logins from a known brute-force source",
+    }
+
+
+async def _populate(store: AsyncRedisMemoryStore, ids, findings: int, events: int):
+    """
+    Write every investigation one call at a time
+
+    Returns:
+        Mean seconds for the first write to each investigation and for the rest
+    """
+    first = later = 0.0
+    for investigation in ids:
+        start = time.perf_counter()
+        await store.set_metadata(investigation, {"query": "bench", "started_at": BASE})
+        first += time.perf_counter() - start
+        start = time.perf_counter()
+        for i in range(findings):
+            await store.store_finding(investigation, _finding(i))
+        for i in range(events):
+            await store.add_timeline_event(investigation, {"timestamp": BASE + i, "type": "dns"})
+        later += time.perf_counter() - start
+    return first / len(ids), later / (len(ids) * (findings + events))
+
+
+async def run(host: str, port: int, count: int, findings: int, events: int, threshold: int):
+    pool = aioredis.BlockingConnectionPool(host=host, port=port, max_connections=16)
+    serializer = Serializer(compress_threshold=threshold)
+    with tempfile.TemporaryDirectory() as directory:
+        archive = InvestigationArchive(directory, serializer=serializer)
+        plain = AsyncRedisMemoryStore(pool=pool, serializer=serializer, archive=None)
+        store = AsyncRedisMemoryStore(pool=pool, serializer=serializer, archive=archive)
+
+        without = await _populate(plain, [uuid.uuid4().hex for _ in range(count)], findings, events)
+        ids = [uuid.uuid4().hex for _ in range(count)]
+        with_archive = await _populate(store, ids, findings, events)
+        print(f"{'':<22} {'no archive':>10} {'archive':>10}   (mean us per call)")
+        for label, plain_time, archive_time in zip(
+            ("first write", "later writes"), without, with_archive
+        ):
+            print(f"{label:<22} {plain_time * 1e6:>10.0f} {archive_time * 1e6:>10.0f}")
+
+        await store.client.zadd(ACTIVE_KEY, {investigation: 0 for investigation in ids})
+        # fakeredis's TCP server drops the connection on the sweep's first EVALSHA miss
+        await store.client.script_load(EVICT_SCRIPT)
+        start = time.perf_counter()
+        archived = await store.archive_idle(idle_seconds=60, limit=count)
+        sweep = time.perf_counter() - start
+        size = sum(path.stat().st_size for path in Path(directory).glob("segment-*.bin"))
+        print(f"archive_idle {archived / sweep:>8.0f} investigations/s"
+              f"  ({size / archived / 1024:.1f} KiB each on disk)")
+
+        latencies = []
+        for investigation in ids:
+            start = time.perf_counter()
+            context = await store.get_context(investigation)
+            latencies.append(time.perf_counter() - start)
+            assert len(context["findings"]) == findings
+        print(f"rehydrate (get_context): p50 {statistics.median(latencies) * 1000:.2f} ms, "
+              f"max {max(latencies) * 1000:.2f} ms")
+        archive.close()
+    await pool.disconnect()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", help="Redis host; a fakeredis TCP server is started if omitted")
+    parser.add_argument("--port", type=int, default=6379)
+    parser.add_argument("--investigations", type=int, default=50)
+    parser.add_argument("--findings", type=int, default=20)
+    parser.add_argument("--events", type=int, default=40)
+    parser.add_argument(
+        "--compress-threshold", type=int, default=0,
+        help="Serializer zstd threshold; records are zlib-compressed by the archive when 0",
+    )
+    args = parser.parse_args()
+
+    configure(Settings(archive_enabled=False))
+    with contextlib.ExitStack() as stack:
+        host, port = args.host, args.port
+        if host is None:
+            host, port = stack.enter_context(fake_redis.tcp_server())
+        asyncio.run(run(
+            host, port, args.investigations, args.findings, args.events,
+            args.compress_threshold,
+        ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Encode/decode time and stored size per memory codec, with and without zstd
+
+Times ``Serializer.encode`` and ``Serializer.decode`` for a single
+finding, a log summary finding and a 500-finding context, for every codec
+with compression off and with the given threshold, plus the legacy
+headerless JSON that predates the header. Runs in-process:
+
+    python -m tests.benchmarks.bench_codecs
+    python -m tests.benchmarks.bench_codecs --threshold 512 --level 3
+"""
+
+import argparse
+import json
+import timeit
+
+from memory.codecs import CODECS, Serializer
+
+
+def _finding(i: int) -> dict:
+    return {
+        "type": "ioc",
+        "agent": "threat_intel",
+        "severity": ("low", "medium", "high")[i % 3],
+        "indicator": f"10.0.{i // 256 % 256}.{i % 256}",
+        "mitre_techniques": ["T1110"],
+        "summary": "Repeated failed logins from a known brute-force source",
+        "score": 42.5 + i,
+    }
+
+
+def _log_summary() -> dict:
+    return {
+        "type": "log_summary",
+        "agent": "log_investigator",
+        "summary": {
+            "event_count": 250_000,
+            "ips": {
+                "distinct": 4812,
+                "top": [{"value": f"10.0.0.{i}", "count": 9000 - i * 70} for i in range(10)],
+                "rare": [f"192.0.2.{i}" for i in range(10)],
+                "outliers": [{"value": "203.0.113.9", "count": 12_044}],
+            },
+            "timeline": {"bucket_seconds": 60, "counts": [170 + i % 13 for i in range(1440)]},
+        },
+    }
+
+
+PAYLOADS = {
+    "finding": _finding(0),
+    "log summary": _log_summary(),
+    "500 findings": {"findings": [_finding(i) for i in range(500)]},
+}
+
+
+# Calls per timing; the best of five timings is reported
+NUMBER = 200
+
+
+def _us(call) -> float:
+    return min(timeit.repeat(call, number=NUMBER, repeat=5)) / NUMBER * 1e6
+
+
+def _legacy_row(reader: Serializer, value) -> tuple:
+    """Headerless JSON as written before the header existed"""
+    legacy = json.dumps(value).encode()
+    return (
+        "legacy json", len(legacy),
+        _us(lambda: json.dumps(value).encode()), _us(lambda: reader.decode(legacy)),
+    )
+
+
+def _row(name: str, serializer: Serializer, value) -> tuple:
+    blob = serializer.encode(value)
+    assert serializer.decode(blob) == value
+    return (
+        name, len(blob),
+        _us(lambda: serializer.encode(value)), _us(lambda: serializer.decode(blob)),
+    )
+
+
+def run(threshold: int, level: int):
+    serializers = {
+        f"{name}{'+zstd' if compress else ''}": Serializer(
+            codec=name, compress_threshold=threshold if compress else 0, compress_level=level
+        )
+        for name in sorted(CODECS)
+        for compress in (False, True)
+    }
+    reader = serializers["json"]
+    print(f"{'payload':<14} {'format':<14} {'bytes':>9} {'encode us':>10} {'decode us':>10}")
+    for label, value in PAYLOADS.items():
+        rows = [_legacy_row(reader, value)]
+        rows += [_row(name, serializer, value) for name, serializer in serializers.items()]
+        for name, size, encode, decode in rows:
+            print(f"{label:<14} {name:<14} {size:>9,} {encode:>10.1f} {decode:>10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--threshold", type=int, default=1024, help="zstd threshold in bytes")
+    parser.add_argument("--level", type=int, default=3, help="zstd compression level")
+    args = parser.parse_args()
+    run(args.threshold, args.level)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Bulk indicator enrichment throughput against the stub intel server
+
+Enriches ``--indicators`` unique IPs with ``enrich_many`` through one
+single-lookup provider (AbuseIPDB, paced at ``--rate`` requests/s) and one
+bulk provider, then times plain ``lookup`` calls one at a time on a sample
+for comparison. ``--latency-ms`` adds a per-request delay on the stub to
+stand in for the round trip to a real provider:
+
+    python -m tests.benchmarks.bench_enrich_many --indicators 10000 --latency-ms 50
+"""
+
+import argparse
+import asyncio
+import time
+
+import httpx
+
+from config.settings import Settings, configure
+from intelligence.providers.abuseipdb import AbuseIPDBProvider
+from intelligence.registry import ProviderRegistry
+from tests.fixtures import stub_intel
+
+
+def _indicators(count: int):
+    return [f"10.{i // 65536 % 256}.{i // 256 % 256}.{i % 256}" for i in range(count)]
+
+
+async def run(url: str, args):
+    registry = ProviderRegistry([
+        AbuseIPDBProvider(base_url=f"{url}/abuseipdb", rate_limit=args.rate),
+        stub_intel.StubBulkProvider(base_url=url, rate_limit=args.rate),
+    ])
+    indicators = _indicators(args.indicators)
+    # Duplicates are dropped before any request is made
+    indicators += indicators[: args.indicators // 10]
+    async with httpx.AsyncClient(base_url=url) as http:
+        delay = {"delay_ms": args.latency_ms}
+        await http.post("/config", json={"abuseipdb": delay, "bulk": delay})
+
+    start = time.perf_counter()
+    records = errors = 0
+    async for record in registry.enrich_many(indicators):
+        records += 1
+        errors += bool(record["errors"])
+    elapsed = time.perf_counter() - start
+    async with httpx.AsyncClient() as http:
+        requests = (await http.get(f"{url}/stats")).json()["requests"]
+    print(
+        f"enrich_many  {records} indicators in {elapsed:.2f} s "
+        f"({records / elapsed:,.0f}/s), {errors} with errors, "
+        f"{requests['abuseipdb']} single + {requests['bulk']} bulk requests"
+    )
+
+    sample = _indicators(args.sample)
+    start = time.perf_counter()
+    for indicator in sample:
+        await registry.lookup(indicator)
+    elapsed = time.perf_counter() - start
+    rate = len(sample) / elapsed
+    print(
+        f"lookup loop  {len(sample)} indicators in {elapsed:.2f} s ({rate:,.0f}/s), "
+        f"{args.indicators / rate:.1f} s projected for {args.indicators}"
+    )
+    await registry.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--indicators", type=int, default=10000)
+    parser.add_argument("--sample", type=int, default=200)
+    parser.add_argument("--rate", type=float, default=2000.0, help="Provider requests/s")
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    args = parser.parse_args()
+
+    configure(Settings())
+    with stub_intel.serve() as url:
+        print(
+            f"{args.indicators} unique indicators, providers limited to {args.rate:.0f} req/s "
+            f"with {args.latency_ms:.0f} ms latency"
+        )
+        asyncio.run(run(url, args))
+
+
+if __name__ == "__main__":
+    main()
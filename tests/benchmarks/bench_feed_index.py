@@ -0,0 +1,101 @@
+"""
+Build time, peak RSS and lookup rate of the offline feed index
+
+Streams ``--entries`` synthetic feed lines (single IPv4 addresses, /24
+blocks and SHA-256 hashes) through ``FeedIndexBuilder`` in one child
+process, then memory-maps the result in another and runs random lookups,
+so each phase reports its own peak RSS:
+
+    python -m tests.benchmarks.bench_feed_index --entries 10000000
+"""
+
+import argparse
+import hashlib
+import multiprocessing
+import random
+import resource
+import tempfile
+import time
+
+
+def _feed(entries: int, seed: int):
+    """Synthetic feed: 80% addresses, 10% CIDR blocks, 10% file hashes"""
+    rng = random.Random(seed)
+    for i in range(entries):
+        kind = i % 10
+        if kind < 8:
+            address = rng.getrandbits(32)
+            yield f"{address >> 24}.{address >> 16 & 255}.{address >> 8 & 255}.{address & 255}"
+        elif kind == 8:
+            yield f"{rng.randrange(256)}.{rng.randrange(256)}.{rng.randrange(256)}.0/24"
+        else:
+            yield hashlib.sha256(i.to_bytes(8, "little")).hexdigest()
+
+
+def _peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _build(directory: str, entries: int, results):
+    from intelligence.feed_index import FeedIndexBuilder
+
+    start = time.perf_counter()
+    builder = FeedIndexBuilder(directory)
+    builder.add_many(_feed(entries, seed=1))
+    added = time.perf_counter() - start
+    added_rss = _peak_rss_mb()
+    builder.build()
+    results.put((added, added_rss, time.perf_counter() - start - added, _peak_rss_mb()))
+
+
+def _lookup(directory: str, lookups: int, results):
+    from intelligence.feed_index import FeedIndex
+
+    rng = random.Random(2)
+    addresses = [
+        f"{rng.randrange(256)}.{rng.randrange(256)}.{rng.randrange(256)}.{rng.randrange(256)}"
+        for _ in range(lookups)
+    ]
+    hashes = [hashlib.sha256(rng.randbytes(8)).hexdigest() for _ in range(lookups // 10)]
+    index = FeedIndex(directory)
+
+    start = time.perf_counter()
+    hits = sum(index.contains_ip(address) for address in addresses)
+    ip_rate = len(addresses) / (time.perf_counter() - start)
+    start = time.perf_counter()
+    hits += sum(index.contains_hash(value) for value in hashes)
+    hash_rate = len(hashes) / (time.perf_counter() - start)
+    results.put((ip_rate, hash_rate, hits, _peak_rss_mb()))
+
+
+def _in_child(target, *args):
+    ctx = multiprocessing.get_context("spawn")
+    results = ctx.Queue()
+    child = ctx.Process(target=target, args=(*args, results))
+    child.start()
+    result = results.get()
+    child.join()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--entries", type=int, default=10_000_000)
+    parser.add_argument("--lookups", type=int, default=200_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        added, added_rss, built, build_rss = _in_child(_build, directory, args.entries)
+        print(
+            f"build   {args.entries:,} entries: add {added:.1f} s (peak RSS {added_rss:,.0f} MB), "
+            f"build {built:.1f} s (peak RSS {build_rss:,.0f} MB)"
+        )
+        ip_rate, hash_rate, hits, lookup_rss = _in_child(_lookup, directory, args.lookups)
+        print(
+            f"lookup  {ip_rate:,.0f} IPs/s, {hash_rate:,.0f} hashes/s ({hits:,} hits), "
+            f"peak RSS {lookup_rss:,.0f} MB"
+        )
+
+
+if __name__ == "__main__":
+    main()
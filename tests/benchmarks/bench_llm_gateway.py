@@ -0,0 +1,119 @@
+"""
+LLM latency under a burst of requests, with and without the gateway
+
+A burst of background generations hits the mock Ollama server, followed
+shortly by interactive ones. Without the gateway every request reaches
+the server at once; with it at most ``--in-flight`` do and interactive
+requests jump the queue. Reports p50/p99 per priority and timeouts:
+
+    python -m tests.benchmarks.bench_llm_gateway --background 60 --interactive 10
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+from config.settings import Settings, configure
+from llm.client import OllamaClient
+from llm.gateway import LLMGateway, Priority
+from tests.fixtures import mock_ollama
+
+
+async def _timed(call) -> float:
+    start = time.perf_counter()
+    try:
+        await call()
+    except Exception:
+        return float("inf")
+    return time.perf_counter() - start
+
+
+async def _burst(generate, background: int, interactive: int, delay: float):
+    async def later(call):
+        await asyncio.sleep(delay)
+        return await _timed(call)
+
+    tasks = [
+        asyncio.create_task(_timed(lambda i=i: generate(f"enrich {i}", Priority.BACKGROUND)))
+        for i in range(background)
+    ]
+    tasks += [
+        asyncio.create_task(later(lambda i=i: generate(f"triage {i}", Priority.INTERACTIVE)))
+        for i in range(interactive)
+    ]
+    start = time.perf_counter()
+    latencies = await asyncio.gather(*tasks)
+    return latencies[:background], latencies[background:], time.perf_counter() - start
+
+
+def _summary(name: str, latencies):
+    done = sorted(latency for latency in latencies if latency != float("inf"))
+    failed = len(latencies) - len(done)
+    if len(done) < 2:
+        return f"{name:<12} {failed} of {len(latencies)} timed out"
+    cuts = statistics.quantiles(done, n=100)
+    return (
+        f"{name:<12} p50 {cuts[49]:>6.2f} s   p99 {cuts[98]:>6.2f} s"
+        f"   timed out {failed}/{len(latencies)}"
+    )
+
+
+async def _wait_idle(url: str):
+    """Let generations abandoned by timed-out clients drain before the next phase"""
+    async with httpx.AsyncClient() as http:
+        while (await http.get(f"{url}/stats")).json()["active"]:
+            await asyncio.sleep(0.1)
+
+
+async def run(url: str, args):
+    client = OllamaClient(base_url=url, model="mock")
+
+    async def direct(prompt, priority):
+        return await client.generate(prompt)
+
+    gateway = LLMGateway(client, max_in_flight=args.in_flight, max_queued=1000)
+
+    async def governed(prompt, priority):
+        return await gateway.generate(prompt, priority=priority)
+
+    delay = args.interactive_delay_ms / 1000
+    for name, generate in (("ungoverned", direct), ("gateway", governed)):
+        await _wait_idle(url)
+        background, interactive, wall = await _burst(
+            generate, args.background, args.interactive, delay
+        )
+        print(f"{name} ({wall:.1f} s total)")
+        print("  " + _summary("interactive", interactive))
+        print("  " + _summary("background", background))
+    await gateway.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--background", type=int, default=60)
+    parser.add_argument("--interactive", type=int, default=10)
+    parser.add_argument("--interactive-delay-ms", type=float, default=200.0)
+    parser.add_argument("--in-flight", type=int, default=2)
+    parser.add_argument("--timeout", type=float, default=30.0, help="Client request timeout")
+    parser.add_argument("--token-ms", type=float, default=10.0)
+    parser.add_argument("--tokens", type=int, default=20)
+    parser.add_argument("--contention", type=float, default=0.05)
+    args = parser.parse_args()
+
+    configure(Settings(ollama_timeout=args.timeout))
+    with mock_ollama.serve(
+        token_ms=args.token_ms, tokens=args.tokens, contention=args.contention
+    ) as url:
+        print(
+            f"{args.background} background + {args.interactive} interactive requests, "
+            f"{args.tokens} tokens at {args.token_ms:.0f} ms each when alone, "
+            f"{args.timeout:.0f} s timeout"
+        )
+        asyncio.run(run(url, args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+Log feature extraction throughput against the equivalent pure-Python loop
+
+Feeds ``--events`` synthetic Elasticsearch hits, in pages of ``--page-size``,
+to ``LogFeatureExtractor`` and to a Counter-based loop computing the same
+summary (per-IP and per-user counts, rare values, z-score outliers and a
+per-minute histogram with spike flags). Pages are generated outside the
+timed sections, and both summaries are checked to agree:
+
+    python -m tests.benchmarks.bench_log_features
+    python -m tests.benchmarks.bench_log_features --events 1000000 --page-size 1000
+"""
+
+import argparse
+import random
+import statistics
+import time
+from collections import Counter
+from datetime import datetime, timezone
+
+import numpy as np
+
+from agents.log_features import LogFeatureExtractor
+
+# Events fall within one day from this epoch time
+BASE_MS = 1_767_225_600_000
+
+
+class PurePythonExtractor:
+    """Per-event dict processing, as a log investigator would write it without NumPy"""
+
+    def __init__(self, bucket_seconds=60, top_k=10, rare_threshold=1, zscore_threshold=3.0):
+        self.bucket_ms = bucket_seconds * 1000
+        self.top_k = top_k
+        self.rare_threshold = rare_threshold
+        self.zscore_threshold = zscore_threshold
+        self.event_count = 0
+        self.ips, self.users, self.buckets = Counter(), Counter(), Counter()
+
+    def add_page(self, events):
+        for event in events:
+            source = event.get("_source", event)
+            ip = (source.get("source") or {}).get("ip")
+            user = (source.get("user") or {}).get("name")
+            timestamp = source.get("@timestamp")
+            if ip:
+                self.ips[ip] += 1
+            if user:
+                self.users[user] += 1
+            if timestamp:
+                parsed = datetime.fromisoformat(timestamp)
+                if parsed.tzinfo is None:
+                    parsed = parsed.replace(tzinfo=timezone.utc)
+                self.buckets[int(parsed.timestamp() * 1000) // self.bucket_ms] += 1
+        self.event_count += len(events)
+
+    def _flagged(self, counts):
+        if len(counts) < 2:
+            return []
+        mean, std = statistics.fmean(counts), statistics.pstdev(counts)
+        if not std:
+            return []
+        return [i for i, count in enumerate(counts) if (count - mean) / std > self.zscore_threshold]
+
+    def _value_stats(self, counts: Counter):
+        totals = list(counts.values())
+        outliers = sorted(
+            (list(counts)[i] for i in self._flagged(totals)), key=lambda v: -counts[v]
+        )
+        return {
+            "distinct": len(counts),
+            "top": [{"value": v, "count": c} for v, c in counts.most_common(self.top_k)],
+            "rare": [v for v, c in counts.items() if c <= self.rare_threshold][:self.top_k],
+            "outliers": [{"value": v, "count": counts[v]} for v in outliers[:self.top_k]],
+        }
+
+    def summary(self):
+        first, last = min(self.buckets), max(self.buckets)
+        dense = [self.buckets.get(bucket, 0) for bucket in range(first, last + 1)]
+        return {
+            "event_count": self.event_count,
+            "ips": self._value_stats(self.ips),
+            "users": self._value_stats(self.users),
+            "timeline": {"counts": dense, "anomalies": self._flagged(dense)},
+        }
+
+
+def _pages(events: int, page_size: int, seed: int):
+    """Nested hits: a few thousand IPs, a few hundred users and one noisy address"""
+    rng = random.Random(seed)
+    ips = [f"10.{i >> 8 & 255}.{i & 255}.{rng.randrange(1, 255)}" for i in range(5000)]
+    users = [f"user{i}" for i in range(500)]
+    for start in range(0, events, page_size):
+        page = []
+        for _ in range(min(page_size, events - start)):
+            moment = BASE_MS + rng.randrange(86_400_000)
+            ip = "203.0.113.9" if rng.random() < 0.01 else rng.choice(ips)
+            page.append({"_source": {
+                "@timestamp": datetime.fromtimestamp(moment / 1000, timezone.utc)
+                .isoformat(timespec="milliseconds").replace("+00:00", "Z"),
+                "source": {"ip": ip},
+                "user": {"name": rng.choice(users)},
+            }})
+        yield page
+
+
+def run(events: int, page_size: int, seed: int):
+    vectorized, pure = LogFeatureExtractor(), PurePythonExtractor()
+    elapsed = {"vectorized": 0.0, "pure": 0.0}
+    extractors = [("vectorized", vectorized), ("pure", pure)]
+    for page in _pages(events, page_size, seed):
+        # Alternate who runs first, so neither always finds the fresh page in cache
+        extractors.reverse()
+        for name, extractor in extractors:
+            start = time.perf_counter()
+            extractor.add_page(page)
+            elapsed[name] += time.perf_counter() - start
+
+    summaries = {}
+    for name, extractor in (("vectorized", vectorized), ("pure", pure)):
+        start = time.perf_counter()
+        summaries[name] = extractor.summary()
+        elapsed[name] += time.perf_counter() - start
+
+    expected, actual = summaries["pure"], summaries["vectorized"]
+    # Ties may be ordered differently, so compare the counts
+    for field in ("ips", "users"):
+        assert [top["count"] for top in actual[field]["top"]] == [
+            top["count"] for top in expected[field]["top"]
+        ]
+        assert actual[field]["outliers"] == expected[field]["outliers"]
+    assert actual["users"]["distinct"] == expected["users"]["distinct"]
+    assert actual["timeline"]["counts"] == expected["timeline"]["counts"]
+    assert np.array_equal(
+        [anomaly["count"] for anomaly in actual["timeline"]["anomalies"]],
+        [expected["timeline"]["counts"][i] for i in expected["timeline"]["anomalies"]],
+    )
+
+    print(f"{events:,} events in pages of {page_size:,}")
+    for name, seconds in elapsed.items():
+        print(f"{name:>10}: {seconds:6.2f} s  ({events / seconds:,.0f} events/s)")
+    print(f"   speedup: {elapsed['pure'] / elapsed['vectorized']:.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--events", type=int, default=1_000_000)
+    parser.add_argument("--page-size", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    run(args.events, args.page_size, args.seed)
+
+
+if __name__ == "__main__":
+    main()
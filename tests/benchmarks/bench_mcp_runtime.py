@@ -0,0 +1,93 @@
+"""
+MCP tool runtime calls/sec and cold-versus-warm latency for summarize_logs
+
+Times the first call on a fresh runtime (tool set-up, process-pool start
+and NumPy warm-up included), a warm call with new arguments, and a cached
+repeat, each on a page of ``--events`` log events. Then reports calls/sec
+for ``--calls`` distinct calls run ``--concurrency`` at a time, and for the
+same calls answered from the result cache, along with the argument JSON
+size and the mean cache key size. Runs in-process:
+
+    python -m tests.benchmarks.bench_mcp_runtime
+    python -m tests.benchmarks.bench_mcp_runtime --events 5000 --processes 4
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+from mcp_servers.runtime import ToolRuntime
+from mcp_servers.tools.logs import LogSummaryTool
+
+BASE_MS = 1_767_225_600_000
+
+
+def _arguments(seed: int, events: int) -> dict:
+    return {
+        "events": [
+            {
+                "_source": {
+                    "@timestamp": BASE_MS + (seed * 7919 + i) * 1000,
+                    "source": {"ip": f"10.0.{seed % 256}.{i % 250}"},
+                    "user": {"name": f"user{i % 40}"},
+                }
+            }
+            for i in range(events)
+        ]
+    }
+
+
+async def _timed(call) -> float:
+    start = time.perf_counter()
+    await call
+    return time.perf_counter() - start
+
+
+async def _rate(runtime: ToolRuntime, calls, concurrency: int) -> float:
+    """Calls/sec running ``calls`` with at most ``concurrency`` in flight"""
+    limit = asyncio.Semaphore(concurrency)
+
+    async def one(arguments):
+        async with limit:
+            await runtime.call("summarize_logs", arguments)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(arguments) for arguments in calls))
+    return len(calls) / (time.perf_counter() - start)
+
+
+async def run(events: int, calls: int, concurrency: int, processes: int):
+    runtime = ToolRuntime([LogSummaryTool()], processes=processes)
+    cold = await _timed(runtime.call("summarize_logs", _arguments(0, events)))
+    warm = await _timed(runtime.call("summarize_logs", _arguments(1, events)))
+    cached = await _timed(runtime.call("summarize_logs", _arguments(1, events)))
+    print(f"{events:,} events per call, {processes} worker processes")
+    print(f"cold (start-up + call) {cold * 1000:>9.1f} ms")
+    print(f"warm                   {warm * 1000:>9.1f} ms")
+    print(f"cached                 {cached * 1000:>9.1f} ms")
+
+    distinct = [_arguments(seed, events) for seed in range(2, calls + 2)]
+    uncached = await _rate(runtime, distinct, concurrency)
+    hits = await _rate(runtime, distinct, concurrency)
+    print(f"uncached  {uncached:>9,.0f} calls/s  (concurrency {concurrency})")
+    print(f"cached    {hits:>9,.0f} calls/s")
+    argument_bytes = len(json.dumps(distinct[0], sort_keys=True, separators=(",", ":")))
+    key_bytes = sum(len(key) for key in runtime.cache._data) / len(runtime.cache)
+    print(f"argument JSON {argument_bytes / 1024:,.0f} KiB per call, cache key {key_bytes:,.0f} B")
+    print(runtime.stats())
+    await runtime.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--events", type=int, default=5000)
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--processes", type=int, default=2)
+    args = parser.parse_args()
+    asyncio.run(run(args.events, args.calls, args.concurrency, args.processes))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Concurrent investigations/sec and p99 latency, async store against sync store
+
+Each simulated investigation interleaves memory calls with short awaits
+standing in for agent and LLM work, the way agents share the
+orchestrator's event loop. Runs against an in-process fakeredis server
+with a simulated network round trip unless a Redis host is given:
+
+    python -m tests.benchmarks.bench_memory_concurrency --concurrency 50 --rtt-ms 0.5
+    python -m tests.benchmarks.bench_memory_concurrency --host localhost
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+
+import fakeredis
+import redis.asyncio as aioredis
+
+from config.settings import Settings, configure
+from memory.redis_store import AsyncRedisMemoryStore, RedisMemoryStore
+from tests.fixtures import fake_redis
+
+STEPS = 4
+
+
+def _finding(step: int) -> dict:
+    return {"type": "ioc", "agent": f"agent-{step}", "severity": "high", "indicator": "10.0.0.1"}
+
+
+async def _investigate_async(store: AsyncRedisMemoryStore, think: float) -> float:
+    start = time.perf_counter()
+    investigation = uuid.uuid4().hex
+    await store.set_metadata(investigation, {"query": "bench", "status": "running"})
+    for step in range(STEPS):
+        await asyncio.sleep(think)
+        await store.store_findings_bulk(investigation, [_finding(step)] * 3)
+        await store.add_timeline_event(investigation, {"type": "agent_completed", "step": step})
+        await store.get_context(investigation)
+    return time.perf_counter() - start
+
+
+async def _investigate_sync(store: RedisMemoryStore, think: float) -> float:
+    # Same calls, but every one blocks the event loop until Redis answers
+    start = time.perf_counter()
+    investigation = uuid.uuid4().hex
+    store.set_metadata(investigation, {"query": "bench", "status": "running"})
+    for step in range(STEPS):
+        await asyncio.sleep(think)
+        store.store_findings_bulk(investigation, [_finding(step)] * 3)
+        store.add_timeline_event(investigation, {"type": "agent_completed", "step": step})
+        store.get_context(investigation)
+    return time.perf_counter() - start
+
+
+async def _measure(investigate, store, concurrency: int, total: int, think: float):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one() -> float:
+        async with semaphore:
+            return await investigate(store, think)
+
+    start = time.perf_counter()
+    latencies = await asyncio.gather(*(one() for _ in range(total)))
+    elapsed = time.perf_counter() - start
+    return total / elapsed, statistics.quantiles(latencies, n=100)
+
+
+def _report(name: str, rate: float, percentiles):
+    print(
+        f"{name:<6} {rate:>8.1f} investigations/s"
+        f"   p50 {percentiles[49] * 1000:>7.1f} ms   p99 {percentiles[98] * 1000:>7.1f} ms"
+    )
+
+
+async def run(async_store, sync_store, concurrency: int, total: int, think: float):
+    print(f"{total} investigations, {concurrency} concurrent, {think * 1000:.0f} ms think time")
+    _report("async", *await _measure(_investigate_async, async_store, concurrency, total, think))
+    _report("sync", *await _measure(_investigate_sync, sync_store, concurrency, total, think))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", help="Redis host; in-process fakeredis is used if omitted")
+    parser.add_argument("--port", type=int, default=6379)
+    parser.add_argument("--rtt-ms", type=float, default=0.5,
+                        help="Simulated round trip to fakeredis")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--investigations", type=int, default=500)
+    parser.add_argument("--think-ms", type=float, default=20.0)
+    args = parser.parse_args()
+
+    configure(Settings(archive_enabled=False))
+    if args.host:
+        async_pool = aioredis.ConnectionPool(host=args.host, port=args.port)
+        sync_pool = aioredis.ConnectionPool(host=args.host, port=args.port)
+    else:
+        server, rtt = fakeredis.FakeServer(), args.rtt_ms / 1000
+        async_pool = fake_redis.async_pool(server, rtt=rtt)
+        # The sync store runs its own event loop, so it needs its own pool
+        sync_pool = fake_redis.async_pool(server, rtt=rtt)
+        print(f"fakeredis with {args.rtt_ms} ms simulated round trip")
+    sync_store = RedisMemoryStore(pool=sync_pool, archive=None)
+    try:
+        asyncio.run(run(
+            AsyncRedisMemoryStore(pool=async_pool, archive=None),
+            sync_store,
+            args.concurrency,
+            args.investigations,
+            args.think_ms / 1000,
+        ))
+    finally:
+        sync_store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Findings/sec for single and bulk writes through RedisMemoryStore
+
+Runs against a fakeredis server over TCP unless a Redis host is given:
+
+    python -m tests.benchmarks.bench_memory_writes
+    python -m tests.benchmarks.bench_memory_writes --host localhost --port 6379
+"""
+
+import argparse
+import contextlib
+import time
+import uuid
+
+from config.settings import Settings, configure
+from memory.redis_store import RedisMemoryStore
+from tests.fixtures import fake_redis
+
+
+def _finding(i: int) -> dict:
+    return {
+        "type": "ioc",
+        "agent": "threat_intel",
+        "severity": ("low", "medium", "high")[i % 3],
+        "indicator": f"10.0.{i // 256 % 256}.{i % 256}",
+        "mitre_techniques": ["T1110"],
+        "summary": "Repeated failed logins from a known brute-force source",
+    }
+
+
+def _rate(count: int, seconds: float) -> str:
+    return f"{count / seconds:>10,.0f} findings/s"
+
+
+def run(host: str, port: int, findings: int, batch: int):
+    store = RedisMemoryStore(host, port, max_findings=None)
+
+    investigation = uuid.uuid4().hex
+    start = time.perf_counter()
+    for i in range(findings):
+        store.store_finding(investigation, _finding(i))
+    single = time.perf_counter() - start
+
+    investigation = uuid.uuid4().hex
+    start = time.perf_counter()
+    for offset in range(0, findings, batch):
+        store.store_findings_bulk(
+            investigation, [_finding(i) for i in range(offset, min(offset + batch, findings))]
+        )
+    bulk = time.perf_counter() - start
+
+    start = time.perf_counter()
+    context = store.get_context(investigation)
+    read = time.perf_counter() - start
+    assert len(context["findings"]) == findings
+
+    print(f"single store_finding      {_rate(findings, single)}")
+    print(f"store_findings_bulk({batch:<4}) {_rate(findings, bulk)}  ({single / bulk:.1f}x)")
+    print(f"get_context               {read * 1000:>10.1f} ms for {findings} findings")
+    store.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", help="Redis host; a fakeredis TCP server is started if omitted")
+    parser.add_argument("--port", type=int, default=6379)
+    parser.add_argument("--findings", type=int, default=5000)
+    parser.add_argument("--batch", type=int, default=100)
+    args = parser.parse_args()
+
+    configure(Settings(archive_enabled=False))
+    with contextlib.ExitStack() as stack:
+        host, port = args.host, args.port
+        if host is None:
+            host, port = stack.enter_context(fake_redis.tcp_server())
+        run(host, port, args.findings, args.batch)
+
+
+if __name__ == "__main__":
+    main()
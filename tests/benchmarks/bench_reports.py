@@ -0,0 +1,169 @@
+"""
+Report throughput in reports/min for streamed HTML and queued PDF conversion
+
+Creates ``--investigations`` investigations of ``--findings`` findings and
+``--events`` timeline events, then times the HTML route's work (collect the
+report data and render it) for each one, and the PDF route's work (collect,
+render HTML and convert it in the worker pool) for all of them at once.
+Every investigation differs, so no section fragment is reused. It then
+refreshes each HTML report after a new timeline event, and again after a
+new finding, and compares the render time with rendering from scratch. Uses
+WeasyPrint unless ``--stub-renderer`` is given, in which case the PDF rate
+is only the queue and process-pool overhead. Runs against a fakeredis
+server over TCP unless a Redis host is given:
+
+    python -m tests.benchmarks.bench_reports
+    python -m tests.benchmarks.bench_reports --processes 4 --host localhost
+    python -m tests.benchmarks.bench_reports --stub-renderer
+"""
+
+import argparse
+import asyncio
+import contextlib
+import tempfile
+import time
+import uuid
+
+import redis.asyncio as aioredis
+
+from config.settings import Settings, configure
+from memory.redis_store import AsyncRedisMemoryStore
+from reports.builder import ReportBuilder
+from reports.formatters.pdf import PDFJobQueue, render_pdf
+from tests.fixtures import fake_redis, stub_pdf
+
+BASE = 1_767_225_600
+
+
+def _finding(seed: int, i: int) -> dict:
+    return {
+        "type": "ioc",
+        "agent": "threat_intel",
+        "severity": ("low", "medium", "high", "critical")[i % 4],
+        "indicator": f"10.{seed % 256}.{i // 256 % 256}.{i % 256}",
+        "summary": "Repeated failed logins from a known brute-force source",
+        "recommendation": f"Block 10.{seed % 256}.0.{i % 8}",
+    }
+
+
+async def _populate(store: AsyncRedisMemoryStore, ids, findings: int, events: int):
+    for seed, investigation in enumerate(ids):
+        await store.set_metadata(
+            investigation, {"query": f"brute force #{seed}", "started_at": BASE}
+        )
+        await store.store_findings_bulk(investigation, [_finding(seed, i) for i in range(findings)])
+        await asyncio.gather(*(
+            store.add_timeline_event(investigation, {
+                "timestamp": BASE + i, "type": "auth", "description": f"Failed login #{seed}",
+            })
+            for i in range(events)
+        ))
+
+
+async def _pdf(builder: ReportBuilder, pdf: PDFJobQueue, store, investigation: str):
+    report = await builder.collect(store, investigation)
+    html = await asyncio.to_thread(builder.render, report, "html")
+    return await pdf.wait(pdf.submit(investigation, html, key=builder.fingerprint(report)))
+
+
+async def _refresh(builder: ReportBuilder, store, ids, change) -> tuple:
+    """
+    Apply ``change``, if any, to each investigation and re-render its HTML report
+
+    Returns:
+        Mean seconds for collecting and for rendering, and sections rendered
+    """
+    collect = render = 0.0
+    rendered = builder.rendered_sections
+    for investigation in ids:
+        if change is not None:
+            await change(investigation)
+        start = time.perf_counter()
+        report = await builder.collect(store, investigation)
+        collected = time.perf_counter()
+        builder.render(report, "html")
+        render += time.perf_counter() - collected
+        collect += collected - start
+    return collect / len(ids), render / len(ids), builder.rendered_sections - rendered
+
+
+async def run(host, port, count, findings, events, processes, stub):
+    pool = aioredis.BlockingConnectionPool(host=host, port=port, max_connections=16)
+    store = AsyncRedisMemoryStore(pool=pool, archive=None)
+    ids = [uuid.uuid4().hex for _ in range(count)]
+    await _populate(store, ids, findings, events)
+    builder = ReportBuilder()
+
+    start = time.perf_counter()
+    for investigation in ids:
+        report = await builder.collect(store, investigation)
+        size = sum(len(chunk) for chunk in builder.stream(report, "html"))
+    html = time.perf_counter() - start
+    print(f"{count} investigations, {findings} findings and {events} events each")
+    print(f"html  {count / html * 60:>10,.0f} reports/min  ({html / count * 1000:.1f} ms, "
+          f"{size / 1024:.0f} KiB each)")
+
+    async def new_event(investigation):
+        await store.add_timeline_event(
+            investigation, {"timestamp": BASE + events, "type": "dns", "description": "Lookup"}
+        )
+
+    async def new_finding(investigation):
+        await store.store_finding(investigation, _finding(count, findings))
+
+    # A fresh builder renders every section cold; each refresh reuses what it cached
+    builder = ReportBuilder()
+    rows = [("cold", await _refresh(builder, store, ids, None))]
+    rows.append(("timeline event", await _refresh(builder, store, ids, new_event)))
+    rows.append(("finding", await _refresh(builder, store, ids, new_finding)))
+    print(f"{'refresh':<14} {'collect ms':>10} {'render ms':>10} {'speedup':>8} {'sections':>9}")
+    for label, (collect, render, sections) in rows:
+        print(f"{label:<14} {collect * 1000:>10.2f} {render * 1000:>10.2f} "
+              f"{rows[0][1][1] / render:>7.1f}x {sections / count:>9.1f}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        pdf = PDFJobQueue(
+            processes=processes, queue_size=count, output_dir=directory,
+            renderer=stub_pdf.render if stub else render_pdf,
+        )
+        await pdf.start()
+        # Pay worker start-up and renderer warm-up outside the timing
+        await pdf.wait(pdf.submit("warm-up", "<p>warm-up</p>"))
+        builder = ReportBuilder()
+        start = time.perf_counter()
+        jobs = await asyncio.gather(*(_pdf(builder, pdf, store, i) for i in ids))
+        elapsed = time.perf_counter() - start
+        await pdf.stop()
+    failed = sum(job.status != "completed" for job in jobs)
+    print(f"pdf   {count / elapsed * 60:>10,.0f} reports/min  ({processes} processes"
+          f"{', stub renderer' if stub else ''}{f', {failed} failed' if failed else ''})")
+    await pool.disconnect()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", help="Redis host; a fakeredis TCP server is started if omitted")
+    parser.add_argument("--port", type=int, default=6379)
+    parser.add_argument("--investigations", type=int, default=50)
+    parser.add_argument("--findings", type=int, default=200)
+    parser.add_argument("--events", type=int, default=200)
+    parser.add_argument("--processes", type=int, default=2)
+    parser.add_argument(
+        "--stub-renderer", action="store_true",
+        help="Write fake PDFs instead of running WeasyPrint",
+    )
+    args = parser.parse_args()
+
+    configure(Settings(archive_enabled=False))
+    with contextlib.ExitStack() as stack:
+        host, port = args.host, args.port
+        if host is None:
+            host, port = stack.enter_context(fake_redis.tcp_server())
+        asyncio.run(run(
+            host, port, args.investigations, args.findings, args.events, args.processes,
+            args.stub_renderer,
+        ))
+
+
+if __name__ == "__main__":
+    main()
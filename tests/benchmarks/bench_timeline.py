@@ -0,0 +1,111 @@
+"""
+Timeline append and read latency as an investigation grows to 1M events
+
+The timeline is grown in steps; at each checkpoint the benchmark times
+single ``add_timeline_event`` calls, a 50-event time-range read from the
+middle of the timeline, a 50-event tail read, ``count_timeline`` and a
+50-event page at an offset of half the timeline. Runs against a fakeredis
+server over TCP unless a Redis host is given:
+
+    python -m tests.benchmarks.bench_timeline
+    python -m tests.benchmarks.bench_timeline --host localhost --sizes 1000 100000 1000000
+"""
+
+import argparse
+import contextlib
+import time
+import uuid
+
+import redis
+
+from config.settings import Settings, configure
+from memory.redis_store import RedisMemoryStore, _queue_timeline_event
+from tests.fixtures import fake_redis
+
+# Events are one second apart from this epoch time
+BASE = 1_767_225_600
+
+
+def _event(i: int) -> dict:
+    return {
+        "timestamp": BASE + i,
+        "type": ("process_start", "dns_query", "net_connect")[i % 3],
+        "description": f"event {i} on host-{i % 40}",
+    }
+
+
+def _grow(
+    client: redis.Redis, store: RedisMemoryStore, investigation: str, start: int, end: int,
+    batch: int = 5000,
+):
+    """Append events in pipelined batches, outside the timed section"""
+    for offset in range(start, end, batch):
+        pipe = client.pipeline(transaction=False)
+        for i in range(offset, min(offset + batch, end)):
+            _queue_timeline_event(pipe, investigation, _event(i), store.serializer)
+        pipe.execute()
+
+
+def _mean_us(call, samples: int) -> float:
+    start = time.perf_counter()
+    for i in range(samples):
+        call(i)
+    return (time.perf_counter() - start) / samples * 1e6
+
+
+def run(host: str, port: int, sizes, samples: int):
+    client = redis.Redis(host=host, port=port)
+    store = RedisMemoryStore(host, port)
+    investigation = uuid.uuid4().hex
+    print(f"{'events':>9} {'append':>9} {'range 50':>9} {'tail 50':>9} {'count':>9} "
+          f"{'page@n/2':>9}   (mean us per call)")
+
+    size = 0
+    for target in sizes:
+        _grow(client, store, investigation, size, target)
+        size = target
+        middle = BASE + size // 2
+
+        append = _mean_us(
+            lambda i, size=size: store.add_timeline_event(investigation, _event(size + i)),
+            samples,
+        )
+        size += samples
+        ranged = _mean_us(
+            lambda i, middle=middle: store.get_timeline(investigation, middle + i, middle + i + 49),
+            samples,
+        )
+        tail = _mean_us(lambda i: store.get_timeline_tail(investigation, 50), samples)
+        count = _mean_us(
+            lambda i, middle=middle: store.count_timeline(investigation, middle, middle + 3600),
+            samples,
+        )
+        page = _mean_us(
+            lambda i, size=size: store.get_timeline(investigation, offset=size // 2, limit=50),
+            max(1, samples // 10),
+        )
+        assert len(store.get_timeline(investigation, middle, middle + 49)) == 50
+        print(f"{size:>9,} {append:>9.0f} {ranged:>9.0f} {tail:>9.0f} {count:>9.0f} {page:>9.0f}")
+    store.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", help="Redis host; a fakeredis TCP server is started if omitted")
+    parser.add_argument("--port", type=int, default=6379)
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000, 1_000_000]
+    )
+    parser.add_argument("--samples", type=int, default=500)
+    args = parser.parse_args()
+
+    configure(Settings(archive_enabled=False))
+    with contextlib.ExitStack() as stack:
+        host, port = args.host, args.port
+        if host is None:
+            host, port = stack.enter_context(fake_redis.tcp_server())
+        run(host, port, args.sizes, args.samples)
+
+
+if __name__ == "__main__":
+    main()
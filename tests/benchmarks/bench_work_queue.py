@@ -0,0 +1,128 @@
+"""
+Alerts/sec through the Redis Streams work queue at 1, 4 and 8 workers
+
+Each alert runs a synthetic investigation that burns ``--cpu-ms`` of CPU
+and waits ``--io-ms`` on I/O, standing in for agent and LLM calls.
+``--workers`` sets worker coroutines per process and ``--processes``
+worker processes, all sharing one consumer group. Runs against a
+fakeredis server over TCP unless a Redis host is given:
+
+    python -m tests.benchmarks.bench_work_queue --workers 1 4 8
+    python -m tests.benchmarks.bench_work_queue --processes 4 --workers 8 --host localhost
+"""
+
+import argparse
+import asyncio
+import contextlib
+import multiprocessing
+import time
+import uuid
+
+import redis
+import redis.asyncio as aioredis
+
+from config.settings import Settings, configure
+from core.work_queue import RedisStreamWorkQueue, WorkerPool
+from tests.fixtures import fake_redis
+
+
+class SyntheticOrchestrator:
+    """Investigates by spinning the CPU and then waiting, like an agent run"""
+
+    def __init__(self, cpu: float, io: float):
+        self.cpu = cpu
+        self.io = io
+
+    async def investigate(self, query: str, investigation_id: str = None):
+        deadline = time.perf_counter() + self.cpu
+        while time.perf_counter() < deadline:
+            pass
+        await asyncio.sleep(self.io)
+
+
+def _queue(host: str, port: int, stream: str) -> RedisStreamWorkQueue:
+    client = aioredis.Redis(host=host, port=port, decode_responses=True)
+    return RedisStreamWorkQueue(stream=stream, group="bench", client=client, max_backlog=10**9)
+
+
+def _worker_process(host, port, stream, workers, cpu, io, ready, go):
+    configure(Settings(archive_enabled=False))
+
+    async def run():
+        queue = _queue(host, port, stream)
+        # Unique consumer per process even when PIDs are reused across runs
+        queue.consumer = uuid.uuid4().hex
+        await queue._ensure_group()
+        ready.set()
+        await asyncio.to_thread(go.wait)
+        await WorkerPool(SyntheticOrchestrator(cpu, io), queue, concurrency=workers).run()
+
+    asyncio.run(run())
+
+
+def measure(host: str, port: int, processes: int, workers: int, alerts: int, cpu: float, io: float):
+    stream = f"bench:{uuid.uuid4().hex}"
+    ctx = multiprocessing.get_context("spawn")
+    go = ctx.Event()
+    started = []
+    children = []
+    for _ in range(processes):
+        ready = ctx.Event()
+        child = ctx.Process(
+            target=_worker_process, args=(host, port, stream, workers, cpu, io, ready, go)
+        )
+        child.start()
+        started.append(ready)
+        children.append(child)
+    for ready in started:
+        ready.wait()
+
+    client = redis.Redis(host=host, port=port)
+    pipe = client.pipeline(transaction=False)
+    for i in range(alerts):
+        pipe.xadd(stream, {"payload": f'{{"query": "alert {i}"}}', "attempts": 0})
+    pipe.execute()
+
+    start = time.perf_counter()
+    go.set()
+    # Acknowledged jobs are deleted, so an empty stream means every alert finished
+    while client.xlen(stream):
+        time.sleep(0.01)
+    elapsed = time.perf_counter() - start
+
+    for child in children:
+        child.terminate()
+        child.join()
+    client.delete(stream)
+    return alerts / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", help="Redis host; a fakeredis TCP server is started if omitted")
+    parser.add_argument("--port", type=int, default=6379)
+    parser.add_argument("--processes", type=int, default=1)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--alerts", type=int, default=200)
+    parser.add_argument("--cpu-ms", type=float, default=2.0)
+    parser.add_argument("--io-ms", type=float, default=50.0)
+    args = parser.parse_args()
+
+    with contextlib.ExitStack() as stack:
+        host, port = args.host, args.port
+        if host is None:
+            host, port = stack.enter_context(fake_redis.tcp_server())
+        print(
+            f"{args.alerts} alerts, {args.processes} process(es), "
+            f"{args.cpu_ms:.0f} ms CPU + {args.io_ms:.0f} ms I/O per investigation"
+        )
+        for workers in args.workers:
+            rate = measure(
+                host, port, args.processes, workers, args.alerts,
+                args.cpu_ms / 1000, args.io_ms / 1000,
+            )
+            print(f"{workers:>3} workers/process {rate:>8.1f} alerts/s")
+
+
+if __name__ == "__main__":
+    main()
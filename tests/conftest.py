@@ -0,0 +1,44 @@
+"""
+Shared pytest fixtures
+"""
+
+import fakeredis
+import pytest
+
+from config.settings import Settings, configure
+from memory.redis_store import RedisMemoryStore
+from tests.fixtures import fake_redis
+
+
+@pytest.fixture(autouse=True, scope="session")
+def test_settings():
+    """Settings for the whole run, without an archive written under the working tree"""
+    snapshot = Settings(archive_enabled=False)
+    configure(snapshot)
+    return snapshot
+
+
+@pytest.fixture
+def redis_server() -> fakeredis.FakeServer:
+    """Fresh in-memory Redis server per test"""
+    return fakeredis.FakeServer()
+
+
+@pytest.fixture
+def async_pool(redis_server):
+    """Async binary connection pool on the test's Redis server"""
+    return fake_redis.async_pool(redis_server)
+
+
+@pytest.fixture
+def make_sync_store(redis_server):
+    """Factory for sync memory stores on the test's Redis server, closed after the test"""
+    stores = []
+
+    def make(**kwargs) -> RedisMemoryStore:
+        stores.append(RedisMemoryStore(pool=fake_redis.async_pool(redis_server), **kwargs))
+        return stores[-1]
+
+    yield make
+    for store in stores:
+        store.close()
@@ -0,0 +1,107 @@
+"""
+In-memory and TCP Redis stand-ins built on fakeredis
+"""
+
+import asyncio
+import contextlib
+import socket
+import subprocess
+import sys
+import time
+from typing import Iterator, Tuple
+
+import fakeredis
+import fakeredis.aioredis
+import redis
+
+# Runs a fakeredis server on its own interpreter so benchmarks pay real
+# socket round trips without sharing the client's GIL
+_SERVER_SCRIPT = """
+import sys
+import fakeredis
+from fakeredis._clients._tcp_server import TCPFakeRequestHandler
+# Replies are written one at a time; without this Nagle stalls every pipeline
+TCPFakeRequestHandler.disable_nagle_algorithm = True
+server = fakeredis.TcpFakeServer(("127.0.0.1", int(sys.argv[1])), server_type="redis")
+server.daemon_threads = True
+server.serve_forever()
+"""
+
+
+def async_pool(
+    server: fakeredis.FakeServer = None, decode_responses: bool = False, rtt: float = 0.0
+):
+    """
+    Async connection pool on a fakeredis server, as taken by the memory stores
+
+    Args:
+        server: Server to share between pools; a new one if omitted
+        decode_responses: Return text instead of bytes
+        rtt: Seconds added to every round trip, to stand in for the network
+    """
+    client = fakeredis.aioredis.FakeRedis(
+        server=server or fakeredis.FakeServer(), decode_responses=decode_responses
+    )
+    pool = client.connection_pool
+    if rtt:
+        base = pool.connection_class
+
+        class DelayedConnection(base):
+            async def send_packed_command(self, command, check_health=True):
+                await asyncio.sleep(rtt)
+                return await super().send_packed_command(command, check_health)
+
+        pool.connection_class = DelayedConnection
+    return pool
+
+
+def sync_pool(
+    server: fakeredis.FakeServer = None, decode_responses: bool = False, rtt: float = 0.0
+):
+    """Sync connection pool on a fakeredis server; arguments as for ``async_pool``"""
+    client = fakeredis.FakeRedis(
+        server=server or fakeredis.FakeServer(), decode_responses=decode_responses
+    )
+    pool = client.connection_pool
+    if rtt:
+        base = pool.connection_class
+
+        class DelayedConnection(base):
+            def send_packed_command(self, command, check_health=True):
+                time.sleep(rtt)
+                return super().send_packed_command(command, check_health)
+
+        pool.connection_class = DelayedConnection
+    return pool
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextlib.contextmanager
+def tcp_server(timeout: float = 10.0) -> Iterator[Tuple[str, int]]:
+    """
+    Run a fakeredis server reachable over TCP in a child process
+
+    Yields:
+        (host, port) to connect to
+    """
+    port = _free_port()
+    process = subprocess.Popen([sys.executable, "-c", _SERVER_SCRIPT, str(port)])
+    try:
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                redis.Redis(port=port, socket_connect_timeout=0.2).ping()
+                break
+            except redis.ConnectionError:
+                if time.monotonic() > deadline or process.poll() is not None:
+                    raise RuntimeError("fakeredis TCP server did not start")
+                time.sleep(0.05)
+        yield "127.0.0.1", port
+    finally:
+        process.terminate()
+        process.wait()
@@ -0,0 +1,150 @@
+"""
+Mock Ollama HTTP server that slows down as concurrent generations pile up
+
+Generations share the "GPU": every token takes ``token_ms`` multiplied by
+the number of generations running at that moment, plus a ``contention``
+penalty per extra generation for the cache thrashing a real model server
+suffers. Flooding it therefore slows every request down at once, as a
+single local Ollama instance does.
+
+Run standalone with ``python -m tests.fixtures.mock_ollama --port 11434``.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import hashlib
+import json
+import random
+import socket
+import subprocess
+import sys
+import time
+from typing import Iterator
+
+import httpx
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+
+
+def create_app(
+    token_ms: float = 5.0,
+    tokens: int = 20,
+    contention: float = 0.05,
+    embed_ms: float = 20.0,
+    dimensions: int = 16,
+) -> FastAPI:
+    """Build the mock server app"""
+    app = FastAPI()
+    state = {"active": 0, "peak": 0, "generate_calls": 0, "embed_calls": 0, "embed_texts": 0}
+
+    def token_delay() -> float:
+        active = state["active"]
+        return token_ms / 1000 * active * (1 + contention * (active - 1))
+
+    async def generation(request: Request, model: str):
+        state["active"] += 1
+        state["peak"] = max(state["peak"], state["active"])
+        state["generate_calls"] += 1
+        try:
+            for i in range(tokens):
+                await asyncio.sleep(token_delay())
+                # Like Ollama, stop generating for clients that gave up
+                if await request.is_disconnected():
+                    return
+                yield {"model": model, "response": f"t{i} ", "done": False}
+        finally:
+            state["active"] -= 1
+        yield {"model": model, "response": "", "done": True, "done_reason": "stop"}
+
+    @app.post("/api/generate")
+    async def generate(request: Request):
+        body = await request.json()
+        parts = generation(request, body.get("model", ""))
+        if body.get("stream"):
+            async def lines():
+                async for part in parts:
+                    yield json.dumps(part) + "\n"
+
+            return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+        text = [part["response"] async for part in parts]
+        return {"model": body.get("model", ""), "response": "".join(text), "done": True}
+
+    @app.post("/api/embed")
+    async def embed(request: Request):
+        body = await request.json()
+        texts = body["input"] if isinstance(body["input"], list) else [body["input"]]
+        state["embed_calls"] += 1
+        state["embed_texts"] += len(texts)
+        await asyncio.sleep(embed_ms / 1000)
+        embeddings = []
+        for text in texts:
+            seed = int.from_bytes(hashlib.sha256(text.encode()).digest()[:8], "big")
+            rng = random.Random(seed)
+            embeddings.append([rng.uniform(-1, 1) for _ in range(dimensions)])
+        return {"model": body.get("model", ""), "embeddings": embeddings}
+
+    @app.get("/stats")
+    async def stats():
+        return state
+
+    return app
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextlib.contextmanager
+def serve(timeout: float = 15.0, **options) -> Iterator[str]:
+    """
+    Run the mock server in a child process
+
+    Args:
+        options: Arguments for ``create_app``
+
+    Yields:
+        Base URL of the server
+    """
+    port = _free_port()
+    args = [sys.executable, "-m", "tests.fixtures.mock_ollama", "--port", str(port)]
+    for name, value in options.items():
+        args += [f"--{name.replace('_', '-')}", str(value)]
+    process = subprocess.Popen(args, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    url = f"http://127.0.0.1:{port}"
+    try:
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                httpx.get(f"{url}/stats", timeout=0.5)
+                break
+            except httpx.TransportError:
+                if time.monotonic() > deadline or process.poll() is not None:
+                    raise RuntimeError("Mock Ollama server did not start")
+                time.sleep(0.1)
+        yield url
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Mock Ollama HTTP server")
+    parser.add_argument("--port", type=int, default=11434)
+    parser.add_argument("--token-ms", type=float, default=5.0)
+    parser.add_argument("--tokens", type=int, default=20)
+    parser.add_argument("--contention", type=float, default=0.05)
+    parser.add_argument("--embed-ms", type=float, default=20.0)
+    parser.add_argument("--dimensions", type=int, default=16)
+    args = parser.parse_args()
+    app = create_app(args.token_ms, args.tokens, args.contention, args.embed_ms, args.dimensions)
+    uvicorn.run(app, host="127.0.0.1", port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+"""
+Elasticsearch-compatible stub server for log repository tests
+
+Serves a synthetic log index of ``docs`` events, one second apart, through
+the endpoints ``ElasticLogRepository`` uses: point-in-time open and close,
+``_search`` with ``search_after``, ``_count`` and ``terms`` and
+``date_histogram`` aggregations. Queries support ``match_all`` and
+``term``. ``GET /_stub/stats`` reports search requests, the largest page
+asked for and the point-in-times still open.
+
+Run standalone with ``python -m tests.fixtures.stub_elastic --port 9299``.
+"""
+
+import argparse
+import contextlib
+import datetime
+import socket
+import subprocess
+import sys
+import time
+import uuid
+from collections import Counter
+from typing import Dict, Any, Iterator, List
+
+import httpx
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+START = datetime.datetime(2026, 1, 1, tzinfo=datetime.timezone.utc)
+ACTIONS = ("login", "logout", "failed_login")
+
+
+def document(i: int) -> Dict[str, Any]:
+    """The i-th log event of the synthetic index"""
+    return {
+        "@timestamp": (START + datetime.timedelta(seconds=i)).isoformat().replace("+00:00", "Z"),
+        "source.ip": f"10.0.0.{i % 7}",
+        "event.action": ACTIONS[i % 3],
+        "message": f"event {i} " + "x" * 200,
+    }
+
+
+def _millis(i: int) -> int:
+    return int((START + datetime.timedelta(seconds=i)).timestamp() * 1000)
+
+
+def _matches(query: Dict[str, Any], doc: Dict[str, Any]) -> bool:
+    if not query or "match_all" in query:
+        return True
+    if "term" in query:
+        field, value = next(iter(query["term"].items()))
+        value = value["value"] if isinstance(value, dict) else value
+        return doc.get(field) == value
+    raise ValueError(f"Unsupported stub query: {query}")
+
+
+def create_app(docs: int = 10000) -> FastAPI:
+    """Build the stub server app"""
+    app = FastAPI()
+    pits: Dict[str, str] = {}
+    stats = {"searches": 0, "largest_page": 0, "pits_opened": 0}
+
+    @app.middleware("http")
+    async def product_header(request: Request, call_next):
+        # The official client refuses to talk to servers without this header
+        response = await call_next(request)
+        response.headers["X-Elastic-Product"] = "Elasticsearch"
+        return response
+
+    def matching(query: Dict[str, Any], start: int = 0) -> Iterator[int]:
+        return (i for i in range(start, docs) if _matches(query, document(i)))
+
+    def aggregate(query: Dict[str, Any], aggs: Dict[str, Any]) -> Dict[str, Any]:
+        results = {}
+        for name, spec in aggs.items():
+            if "terms" in spec:
+                field, size = spec["terms"]["field"], spec["terms"].get("size", 10)
+                counts = Counter(document(i)[field] for i in matching(query))
+                results[name] = {"buckets": [
+                    {"key": key, "doc_count": count} for key, count in counts.most_common(size)
+                ]}
+            elif "date_histogram" in spec:
+                seconds = int(spec["date_histogram"]["fixed_interval"].rstrip("m")) * 60
+                counts = Counter(i // seconds for i in matching(query))
+                results[name] = {"buckets": [
+                    {
+                        "key": _millis(bucket * seconds),
+                        "key_as_string": document(bucket * seconds)["@timestamp"],
+                        "doc_count": counts[bucket],
+                    }
+                    for bucket in sorted(counts)
+                ]}
+            else:
+                raise ValueError(f"Unsupported stub aggregation: {spec}")
+        return results
+
+    def hits(query: Dict[str, Any], size: int, search_after: List[int]) -> List[Dict[str, Any]]:
+        start = search_after[-1] + 1 if search_after else 0
+        page = []
+        for i in matching(query, start):
+            if len(page) == size:
+                break
+            page.append({"_id": str(i), "_source": document(i), "sort": [_millis(i), i]})
+        return page
+
+    @app.post("/{index}/_pit")
+    async def open_pit(index: str, keep_alive: str):
+        pit_id = uuid.uuid4().hex
+        pits[pit_id] = index
+        stats["pits_opened"] += 1
+        return {"id": pit_id}
+
+    @app.delete("/_pit")
+    async def close_pit(request: Request):
+        freed = pits.pop((await request.json())["id"], None) is not None
+        return {"succeeded": freed, "num_freed": int(freed)}
+
+    @app.post("/_search")
+    async def pit_search(request: Request):
+        body = await request.json()
+        if body["pit"]["id"] not in pits:
+            return JSONResponse({"error": "search_context_missing_exception"}, status_code=404)
+        stats["searches"] += 1
+        stats["largest_page"] = max(stats["largest_page"], body["size"])
+        page = hits(body.get("query", {}), body["size"], body.get("search_after"))
+        return {"pit_id": body["pit"]["id"], "hits": {"hits": page}}
+
+    @app.post("/{index}/_search")
+    async def index_search(index: str, request: Request):
+        body = await request.json()
+        query = body.get("query", {})
+        response: Dict[str, Any] = {"hits": {"total": {"value": sum(1 for _ in matching(query))}}}
+        if "aggs" in body:
+            response["aggregations"] = aggregate(query, body["aggs"])
+        return response
+
+    @app.post("/{index}/_count")
+    async def count(index: str, request: Request):
+        query = (await request.json()).get("query", {})
+        return {"count": sum(1 for _ in matching(query))}
+
+    @app.get("/_stub/stats")
+    async def get_stats():
+        return {**stats, "pits_open": len(pits)}
+
+    return app
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextlib.contextmanager
+def serve(docs: int = 10000, timeout: float = 15.0) -> Iterator[str]:
+    """
+    Run the stub server in a child process
+
+    Yields:
+        Base URL of the server
+    """
+    port = _free_port()
+    args = [sys.executable, "-m", "tests.fixtures.stub_elastic", "--port", str(port),
+            "--docs", str(docs)]
+    process = subprocess.Popen(args, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    url = f"http://127.0.0.1:{port}"
+    try:
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                httpx.get(f"{url}/_stub/stats", timeout=0.5)
+                break
+            except httpx.TransportError:
+                if time.monotonic() > deadline or process.poll() is not None:
+                    raise RuntimeError("Stub Elasticsearch server did not start")
+                time.sleep(0.1)
+        yield url
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Elasticsearch-compatible stub server")
+    parser.add_argument("--port", type=int, default=9299)
+    parser.add_argument("--docs", type=int, default=10000)
+    args = parser.parse_args()
+    uvicorn.run(create_app(args.docs), host="127.0.0.1", port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
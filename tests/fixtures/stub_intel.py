@@ -0,0 +1,182 @@
+"""
+Stub threat intel HTTP server for provider tests and benchmarks
+
+Serves AbuseIPDB ``/abuseipdb/check``, ThreatFox ``/threatfox/`` and a
+generic bulk endpoint ``/bulk/lookup`` with deterministic verdicts. Each
+route's latency and HTTP status can be changed at runtime through
+``POST /config`` so one server can play a fast, slow or failing provider:
+
+    {"abuseipdb": {"delay_ms": 300, "status": 200}}
+
+``GET /stats`` reports requests per route and the number of distinct client
+connections seen, which shows whether keep-alive pooling is working.
+
+Run standalone with ``python -m tests.fixtures.stub_intel --port 8099``.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import hashlib
+import socket
+import subprocess
+import sys
+import time
+from typing import Dict, Any, Iterator, List
+
+import httpx
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+from intelligence.providers.base import ThreatIntelProvider
+
+ROUTES = ("abuseipdb", "threatfox", "bulk")
+
+
+def score(value: str) -> int:
+    """Deterministic 0-100 abuse score for an indicator"""
+    return hashlib.sha256(value.encode()).digest()[0] * 100 // 255
+
+
+class StubBulkProvider(ThreatIntelProvider):
+    """Provider for the stub's ``/bulk/lookup`` endpoint, which takes whole batches"""
+
+    name = "stub_bulk"
+    supported_types = frozenset({"ipv4", "ipv6", "domain", "md5", "sha1", "sha256"})
+    max_batch_size = 500
+
+    def _result(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "found": True,
+            "malicious": data["score"] >= 50,
+            "score": data["score"],
+            "details": data,
+        }
+
+    async def lookup(
+        self, indicator_type: str, value: str, client: httpx.AsyncClient
+    ) -> Dict[str, Any]:
+        return (await self.lookup_many(indicator_type, [value], client))[value]
+
+    async def lookup_many(
+        self, indicator_type: str, values: List[str], client: httpx.AsyncClient
+    ) -> Dict[str, Dict[str, Any]]:
+        response = await client.post(
+            f"{self.base_url}/bulk/lookup", json={"values": values}, timeout=self.timeout
+        )
+        response.raise_for_status()
+        return {value: self._result(data) for value, data in response.json()["results"].items()}
+
+
+def create_app() -> FastAPI:
+    """Build the stub server app"""
+    app = FastAPI()
+    config = {route: {"delay_ms": 0.0, "status": 200} for route in ROUTES}
+    stats: Dict[str, Any] = {"requests": {route: 0 for route in ROUTES}, "connections": set()}
+
+    async def respond(route: str, request: Request, body: Dict[str, Any]):
+        stats["requests"][route] += 1
+        stats["connections"].add((request.client.host, request.client.port))
+        await asyncio.sleep(config[route]["delay_ms"] / 1000)
+        status = config[route]["status"]
+        if status != 200:
+            return JSONResponse({"error": f"stub {route} error"}, status_code=status)
+        return body
+
+    @app.get("/abuseipdb/check")
+    async def abuseipdb(request: Request, ipAddress: str):
+        value = score(ipAddress)
+        return await respond("abuseipdb", request, {
+            "data": {
+                "ipAddress": ipAddress,
+                "abuseConfidenceScore": value,
+                "totalReports": value // 10,
+            }
+        })
+
+    @app.post("/threatfox/")
+    async def threatfox(request: Request):
+        term = (await request.json())["search_term"]
+        value = score(term)
+        if value < 50:
+            return await respond("threatfox", request, {
+                "query_status": "no_result", "data": "Your search did not yield any results"
+            })
+        return await respond("threatfox", request, {
+            "query_status": "ok",
+            "data": [{"ioc": term, "confidence_level": value, "threat_type": "botnet_cc"}],
+        })
+
+    @app.post("/bulk/lookup")
+    async def bulk(request: Request):
+        values = (await request.json())["values"]
+        return await respond("bulk", request, {
+            "results": {value: {"score": score(value)} for value in values}
+        })
+
+    @app.post("/config")
+    async def configure(request: Request):
+        for route, options in (await request.json()).items():
+            config[route].update(options)
+        return config
+
+    @app.post("/reset")
+    async def reset():
+        for route in ROUTES:
+            config[route] = {"delay_ms": 0.0, "status": 200}
+            stats["requests"][route] = 0
+        stats["connections"].clear()
+        return config
+
+    @app.get("/stats")
+    async def get_stats():
+        return {"requests": stats["requests"], "connections": len(stats["connections"])}
+
+    return app
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextlib.contextmanager
+def serve(timeout: float = 15.0) -> Iterator[str]:
+    """
+    Run the stub server in a child process
+
+    Yields:
+        Base URL of the server
+    """
+    port = _free_port()
+    args = [sys.executable, "-m", "tests.fixtures.stub_intel", "--port", str(port)]
+    process = subprocess.Popen(args, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    url = f"http://127.0.0.1:{port}"
+    try:
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                httpx.get(f"{url}/stats", timeout=0.5)
+                break
+            except httpx.TransportError:
+                if time.monotonic() > deadline or process.poll() is not None:
+                    raise RuntimeError("Stub intel server did not start")
+                time.sleep(0.1)
+        yield url
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Stub threat intel HTTP server")
+    parser.add_argument("--port", type=int, default=8099)
+    args = parser.parse_args()
+    uvicorn.run(create_app(), host="127.0.0.1", port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,21 @@
+"""
+Stand-in PDF renderer for report tests and benchmarks
+
+WeasyPrint needs Pango and its fonts, which test machines may not have.
+``render`` has the same signature and is importable from the spawned
+worker processes; it writes the HTML behind a PDF header, and raises for
+documents containing ``FAIL`` so failed jobs can be exercised.
+"""
+
+import os
+
+FAIL = "<!-- stub_pdf: fail -->"
+
+
+def render(html: str, path: str) -> int:
+    """Write ``html`` to ``path`` as a fake PDF, returning its size in bytes"""
+    if FAIL in html:
+        raise ValueError("unsupported markup")
+    with open(path, "wb") as f:
+        f.write(b"%PDF-1.7\n" + html.encode())
+    return os.path.getsize(path)
@@ -0,0 +1,88 @@
+"""
+Elasticsearch log repository against the ES-compatible stub server
+"""
+
+import tracemalloc
+
+import httpx
+import pytest
+import pytest_asyncio
+from elasticsearch import AsyncElasticsearch
+
+from data.repositories.elastic_repository import ElasticLogRepository
+from tests.fixtures import stub_elastic
+
+pytestmark = pytest.mark.asyncio
+
+DOCS = 20000
+
+
+@pytest.fixture(scope="module")
+def elastic_url():
+    with stub_elastic.serve(docs=DOCS) as url:
+        yield url
+
+
+@pytest_asyncio.fixture
+async def repository(elastic_url):
+    repository = ElasticLogRepository(AsyncElasticsearch(elastic_url), page_size=500)
+    yield repository
+    await repository.close()
+
+
+async def _stats(url):
+    async with httpx.AsyncClient() as http:
+        return (await http.get(f"{url}/_stub/stats")).json()
+
+
+async def test_search_streams_every_hit_in_pages(repository, elastic_url):
+    before = await _stats(elastic_url)
+    seen = 0
+    expected = 0
+    tracemalloc.start()
+    async for hit in repository.search("logs-*", {"match_all": {}}):
+        assert hit["_id"] == str(expected)
+        expected += 1
+        seen += 1
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    after = await _stats(elastic_url)
+
+    assert seen == DOCS
+    assert after["searches"] - before["searches"] == DOCS // 500 + 1
+    assert after["largest_page"] <= 500
+    assert after["pits_open"] == 0
+    # All 20k hits would be several MB; only a page or two is ever held
+    assert peak < 3 * 1024 * 1024
+
+
+async def test_abandoned_search_closes_its_point_in_time(repository, elastic_url):
+    pages = repository.search_pages("logs-*", {"term": {"event.action": "login"}})
+    first = await anext(pages)
+    await pages.aclose()
+
+    assert len(first) == 500
+    assert {hit["_source"]["event.action"] for hit in first} == {"login"}
+    assert (await _stats(elastic_url))["pits_open"] == 0
+
+
+async def test_max_hits_limits_the_last_page(repository):
+    hits = [hit async for hit in repository.search("logs-*", {}, max_hits=750)]
+
+    assert len(hits) == 750
+    assert hits[-1]["_id"] == "749"
+
+
+async def test_counting_is_pushed_down(repository, elastic_url):
+    before = await _stats(elastic_url)
+    total = await repository.count("logs-*", {"term": {"source.ip": "10.0.0.3"}})
+    top = await repository.top_terms("logs-*", {"match_all": {}}, "event.action", size=2)
+    timeline = await repository.histogram("logs-*", {"match_all": {}}, interval="60m")
+    after = await _stats(elastic_url)
+
+    assert total == len(range(3, DOCS, 7))
+    assert top == [{"value": "login", "count": 6667}, {"value": "logout", "count": 6667}]
+    assert sum(bucket["count"] for bucket in timeline) == DOCS
+    assert timeline[0] == {"timestamp": "2026-01-01T00:00:00Z", "count": 3600}
+    # No raw hits were paged through to compute any of these
+    assert after["searches"] == before["searches"]
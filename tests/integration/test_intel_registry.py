@@ -0,0 +1,96 @@
+"""
+Threat intel provider registry against the stub intel HTTP server
+"""
+
+import time
+
+import httpx
+import pytest
+import pytest_asyncio
+
+from intelligence.providers.abuseipdb import AbuseIPDBProvider
+from intelligence.providers.threatfox import ThreatFoxProvider
+from intelligence.registry import ProviderRegistry
+from tests.fixtures import stub_intel
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture(scope="module")
+def intel_url():
+    with stub_intel.serve() as url:
+        yield url
+
+
+@pytest_asyncio.fixture
+async def stub(intel_url):
+    """Client for configuring the stub, reset before every test"""
+    async with httpx.AsyncClient(base_url=intel_url) as client:
+        await client.post("/reset")
+        yield client
+
+
+@pytest_asyncio.fixture
+async def registry(intel_url):
+    registry = ProviderRegistry([
+        AbuseIPDBProvider(base_url=f"{intel_url}/abuseipdb", timeout=0.5, rate_limit=1000),
+        ThreatFoxProvider(base_url=f"{intel_url}/threatfox", timeout=0.5, rate_limit=1000),
+    ])
+    yield registry
+    await registry.close()
+
+
+async def test_lookup_merges_every_provider(registry, stub):
+    enriched = await registry.lookup(" 203.0.113.7 ")
+
+    assert enriched["indicator"] == "203.0.113.7"
+    assert enriched["type"] == "ipv4"
+    assert set(enriched["results"]) == {"abuseipdb", "threatfox"}
+    assert enriched["results"]["abuseipdb"]["score"] == stub_intel.score("203.0.113.7")
+    assert enriched["errors"] == {}
+
+
+async def test_slow_and_failing_providers_give_partial_results(registry, stub):
+    await stub.post("/config", json={"abuseipdb": {"delay_ms": 2000}})
+    start = time.perf_counter()
+    slow = await registry.lookup("203.0.113.7")
+    elapsed = time.perf_counter() - start
+
+    assert slow["errors"] == {"abuseipdb": "timeout"}
+    assert set(slow["results"]) == {"threatfox"}
+    assert elapsed < 1.0
+
+    await stub.post("/config", json={"abuseipdb": {"delay_ms": 0}, "threatfox": {"status": 503}})
+    failing = await registry.lookup("203.0.113.7")
+
+    assert set(failing["results"]) == {"abuseipdb"}
+    assert "503" in failing["errors"]["threatfox"]
+
+
+async def test_latency_is_the_slowest_provider_not_the_sum(registry, stub):
+    await stub.post("/config", json={
+        "abuseipdb": {"delay_ms": 300}, "threatfox": {"delay_ms": 300},
+    })
+
+    start = time.perf_counter()
+    enriched = await registry.lookup("example.com")
+    domain_elapsed = time.perf_counter() - start
+    start = time.perf_counter()
+    enriched_ip = await registry.lookup("198.51.100.1")
+    ip_elapsed = time.perf_counter() - start
+
+    # ThreatFox alone handles domains; IPs go to both providers at once
+    assert set(enriched["results"]) == {"threatfox"}
+    assert set(enriched_ip["results"]) == {"abuseipdb", "threatfox"}
+    assert 0.3 <= ip_elapsed < 0.5
+    assert ip_elapsed - domain_elapsed < 0.1
+
+
+async def test_providers_share_keep_alive_connections(registry, stub):
+    for i in range(20):
+        await registry.lookup(f"198.51.100.{i}")
+
+    stats = (await stub.get("/stats")).json()
+    assert stats["requests"]["abuseipdb"] == stats["requests"]["threatfox"] == 20
+    # The stub's own config client holds one connection
+    assert stats["connections"] <= 3
@@ -0,0 +1,42 @@
+"""
+LLM gateway against the mock Ollama HTTP server
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from llm.client import OllamaClient
+from llm.gateway import LLMGateway, Priority
+from tests.fixtures import mock_ollama
+
+
+@pytest.fixture(scope="module")
+def ollama_url():
+    with mock_ollama.serve(token_ms=2, tokens=5) as url:
+        yield url
+
+
+@pytest.mark.asyncio
+async def test_gateway_caps_requests_reaching_the_server(ollama_url):
+    gateway = LLMGateway(OllamaClient(base_url=ollama_url, model="mock"), max_in_flight=2)
+    async with httpx.AsyncClient() as http:
+        before = (await http.get(f"{ollama_url}/stats")).json()
+
+        results = await asyncio.gather(
+            *(gateway.generate(f"p{i}") for i in range(8)),
+            gateway.generate("urgent", priority=Priority.INTERACTIVE),
+        )
+        tokens = [token async for token in gateway.stream("streamed")]
+        vectors = await asyncio.gather(gateway.embed(["a", "b"]), gateway.embed(["c"]))
+
+        after = (await http.get(f"{ollama_url}/stats")).json()
+    await gateway.close()
+
+    assert all(result["response"] == "t0 t1 t2 t3 t4 " for result in results)
+    assert "".join(tokens) == "t0 t1 t2 t3 t4 "
+    assert [len(batch) for batch in vectors] == [2, 1]
+    assert after["generate_calls"] - before["generate_calls"] == 10
+    assert after["peak"] <= 2
+    assert after["embed_calls"] - before["embed_calls"] == 1
@@ -0,0 +1,83 @@
+"""
+Consistency of the incrementally maintained finding summary
+"""
+
+import random
+
+import pytest
+
+from memory.aggregates import summarize_findings
+from memory.redis_store import AsyncRedisMemoryStore
+
+SEVERITIES = ["critical", "HIGH", "medium", "low", "info", None, ""]
+AGENTS = ["threat_intel", "log_investigator", "correlation", None]
+TYPES = ["ioc_match", "brute_force", "c2_beacon", "lateral_movement", None]
+TECHNIQUES = ["T1110", "T1071", "T1021", "T1059"]
+INDICATORS = [f"10.0.0.{i}" for i in range(12)] + ["evil.example", "a" * 64]
+
+
+def _finding(rng: random.Random) -> dict:
+    finding = {
+        "severity": rng.choice(SEVERITIES),
+        "agent": rng.choice(AGENTS),
+        "type": rng.choice(TYPES),
+        "score": rng.random(),
+    }
+    # Scalar and list forms, repeats within a finding and missing fields
+    if rng.random() < 0.7:
+        finding["indicator"] = rng.choice(INDICATORS)
+    if rng.random() < 0.5:
+        finding["indicators"] = rng.choices(INDICATORS, k=rng.randrange(4))
+    if rng.random() < 0.4:
+        finding["mitre_technique"] = rng.choice(TECHNIQUES)
+    if rng.random() < 0.4:
+        finding["mitre_techniques"] = rng.choices(TECHNIQUES, k=rng.randrange(3))
+    return {key: value for key, value in finding.items() if value is not None}
+
+
+def _batches(rng: random.Random, findings: list) -> list:
+    """Split findings into single writes and bulk writes of varying size"""
+    batches, i = [], 0
+    while i < len(findings):
+        size = rng.choice([1, 1, 1, rng.randrange(2, 40)])
+        batches.append(findings[i:i + size])
+        i += size
+    return batches
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_sync_summary_matches_recomputation(make_sync_store, seed):
+    rng = random.Random(seed)
+    store = make_sync_store(max_findings=50)
+    findings = [_finding(rng) for _ in range(300)]
+
+    for batch in _batches(rng, findings):
+        if len(batch) == 1:
+            store.store_finding("inv", batch[0])
+        else:
+            store.store_findings_bulk("inv", batch)
+
+    # The stream is capped at about 50 entries, but the summary covers every finding
+    for top_k in (3, 10, 100):
+        assert store.get_summary("inv", top_k=top_k) == summarize_findings(findings, top_k)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("seed", range(5))
+async def test_async_summary_matches_recomputation(async_pool, seed):
+    rng = random.Random(seed)
+    store = AsyncRedisMemoryStore(pool=async_pool)
+    findings = [_finding(rng) for _ in range(300)]
+
+    for batch in _batches(rng, findings):
+        if len(batch) == 1:
+            await store.store_finding("inv", batch[0])
+        else:
+            await store.store_findings_bulk("inv", batch)
+
+    for top_k in (3, 10, 100):
+        assert await store.get_summary("inv", top_k=top_k) == summarize_findings(findings, top_k)
+
+
+def test_empty_investigation_summary(make_sync_store):
+    assert make_sync_store().get_summary("missing") == summarize_findings([])
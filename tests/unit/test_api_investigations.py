@@ -0,0 +1,88 @@
+"""
+Tests for investigation submission and its progress events
+"""
+
+import asyncio
+
+import httpx
+import pytest
+import redis.asyncio as aioredis
+from fastapi import FastAPI
+
+from api.routes import investigations
+from memory.events import EventBroker
+from tests.fixtures import fake_redis
+
+pytestmark = pytest.mark.asyncio
+
+
+class FastWorkerQueue:
+    """Queue whose worker reports progress before ``put`` returns, as a busy one can"""
+
+    def __init__(self, events: EventBroker):
+        self.events = events
+        self.jobs = []
+
+    async def put(self, payload):
+        self.jobs.append(payload)
+        await self.events.publish(payload["investigation_id"], "status", {"status": "running"})
+        await asyncio.sleep(0.01)
+        return str(len(self.jobs))
+
+
+class FullQueue:
+    """Queue whose backlog never drains"""
+
+    async def put(self, payload):
+        await asyncio.Event().wait()
+
+
+@pytest.fixture
+def events(redis_server):
+    pool = fake_redis.async_pool(redis_server, decode_responses=True)
+    return EventBroker(client=aioredis.Redis(connection_pool=pool))
+
+
+@pytest.fixture
+def app(events):
+    app = FastAPI()
+    app.include_router(investigations.router)
+    app.state.events = events
+    app.state.queue = FastWorkerQueue(events)
+    return app
+
+
+async def _submit(app):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://api") as client:
+        return await client.post("/investigations", json={"query": "beaconing from 10.0.0.5"})
+
+
+async def _event_data(events, investigation_id):
+    return [event["data"] async for event in events.subscribe(investigation_id)]
+
+
+async def test_queued_is_published_before_the_worker_can_report(app, events):
+    response = await _submit(app)
+
+    assert response.status_code == 202
+    investigation_id = response.json()["investigation_id"]
+    assert app.state.queue.jobs[0]["investigation_id"] == investigation_id
+    # The stream has no terminal status yet, so only replay it
+    history = await events._history(investigation_id, None)
+    assert [event["data"]["status"] for event in history] == ["queued", "running"]
+
+
+async def test_full_queue_ends_the_stream_with_a_failure(app, events):
+    app.state.queue = FullQueue()
+
+    response = await _submit(app)
+
+    assert response.status_code == 503
+    [investigation_id] = [
+        key.split(":")[1] for key in await events.client.keys("investigation:*:events")
+    ]
+    assert await asyncio.wait_for(_event_data(events, investigation_id), 1) == [
+        {"status": "queued"},
+        {"status": "failed", "error": "Investigation queue is full"},
+    ]
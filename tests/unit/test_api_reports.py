@@ -0,0 +1,95 @@
+"""
+Tests for the report streaming and PDF endpoints
+"""
+
+import httpx
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI
+
+from api.routes import reports
+from memory.redis_store import AsyncRedisMemoryStore
+from reports.builder import ReportBuilder
+from reports.formatters.pdf import PDFJobQueue
+from tests.fixtures import stub_pdf
+
+pytestmark = pytest.mark.asyncio
+
+BASE = 1_767_225_600
+
+
+@pytest_asyncio.fixture
+async def memory(async_pool):
+    store = AsyncRedisMemoryStore(pool=async_pool, archive=None)
+    await store.set_metadata("inv", {"query": "beaconing from 10.0.0.5", "status": "completed"})
+    await store.store_findings_bulk(
+        "inv", [{"type": "ioc", "severity": "high", "indicator": "10.0.0.5"}]
+    )
+    await store.add_timeline_event("inv", {"timestamp": BASE, "type": "dns"})
+    return store
+
+
+@pytest_asyncio.fixture
+async def pdf(tmp_path):
+    queue = PDFJobQueue(
+        processes=1, queue_size=1, output_dir=str(tmp_path), renderer=stub_pdf.render
+    )
+    yield queue
+    await queue.stop()
+
+
+@pytest_asyncio.fixture
+async def client(memory, pdf):
+    app = FastAPI()
+    app.include_router(reports.router)
+    app.state.memory = memory
+    app.state.reports = ReportBuilder()
+    app.state.pdf = pdf
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://api") as client:
+        yield client
+
+
+async def test_report_streams_in_the_requested_format(client):
+    markdown = await client.get("/investigations/inv/report")
+    html = await client.get("/investigations/inv/report", params={"format": "html"})
+
+    assert markdown.headers["content-type"].startswith("text/markdown")
+    assert "10.0.0.5" in markdown.text
+    assert html.headers["content-type"].startswith("text/html")
+    assert "<html" in html.text and "10.0.0.5" in html.text
+    assert (await client.get("/investigations/missing/report")).status_code == 404
+
+
+async def test_pdf_is_queued_polled_and_downloaded(client, pdf):
+    await pdf.start()
+
+    response = await client.post("/investigations/inv/report/pdf")
+    assert response.status_code == 202
+    job_id = response.json()["job_id"]
+    assert response.json()["poll"] == f"/reports/{job_id}"
+    # Unchanged content reuses the job instead of converting again
+    repeat = await client.post("/investigations/inv/report/pdf")
+    assert repeat.json()["job_id"] == job_id
+
+    await pdf.wait(pdf.get(job_id), timeout=30)
+    status = (await client.get(f"/reports/{job_id}")).json()
+    assert status["status"] == "completed"
+    assert status["download"] == f"/reports/{job_id}/pdf"
+
+    download = await client.get(status["download"])
+    assert download.status_code == 200
+    assert download.headers["content-type"] == "application/pdf"
+    assert download.content.startswith(b"%PDF") and b"10.0.0.5" in download.content
+
+
+async def test_pdf_endpoints_report_missing_and_full(client, memory):
+    assert (await client.post("/investigations/missing/report/pdf")).status_code == 404
+    assert (await client.get("/reports/unknown")).status_code == 404
+    assert (await client.get("/reports/unknown/pdf")).status_code == 404
+
+    # Not started, so the first job stays queued and fills the queue
+    queued = await client.post("/investigations/inv/report/pdf")
+    assert (await client.get(f"/reports/{queued.json()['job_id']}/pdf")).status_code == 404
+    await memory.set_metadata("other", {"query": "dns tunnelling"})
+    assert (await client.post("/investigations/other/report/pdf")).status_code == 503
@@ -0,0 +1,157 @@
+"""
+Reads and writes on investigations moved to the disk archive
+"""
+
+import asyncio
+import time
+
+import pytest
+import pytest_asyncio
+
+from memory.archive import InvestigationArchive
+from memory.codecs import Serializer
+from memory.redis_store import ACTIVE_KEY, AsyncRedisMemoryStore
+
+pytestmark = pytest.mark.asyncio
+
+BASE = 1_767_225_600
+
+
+@pytest.fixture
+def archive(tmp_path):
+    archive = InvestigationArchive(str(tmp_path))
+    yield archive
+    archive.close()
+
+
+@pytest_asyncio.fixture
+async def store(async_pool, archive):
+    store = AsyncRedisMemoryStore(pool=async_pool, archive=archive)
+    await store.store_findings_bulk(
+        "inv", [{"n": i, "severity": "high", "indicator": f"10.0.0.{i % 3}"} for i in range(6)]
+    )
+    for second in range(5):
+        await store.add_timeline_event("inv", {"timestamp": BASE + second, "n": second})
+    await store.set_metadata("inv", {"query": "beaconing"})
+    await store.attach_alert("inv", {"alert": 1})
+    return store
+
+
+async def _archive(store):
+    """Back-date the investigation and sweep it out of Redis"""
+    await store.client.zadd(ACTIVE_KEY, {"inv": time.time() - 3600})
+    assert await store.archive_idle(idle_seconds=60) == 1
+    assert not await store.client.exists("investigation:inv:meta")
+
+
+READS = {
+    "metadata": lambda store: store.get_metadata("inv"),
+    "summary": lambda store: store.get_summary("inv"),
+    "timeline": lambda store: store.get_timeline("inv", BASE + 1, BASE + 3),
+    "tail": lambda store: store.get_timeline_tail("inv", 2),
+    "recent": lambda store: store.get_recent_findings("inv", 2),
+    "count": lambda store: store.count_timeline("inv"),
+}
+
+
+@pytest.mark.parametrize("name", READS)
+async def test_every_read_restores_an_archived_investigation(store, archive, name):
+    expected = await READS[name](store)
+    await _archive(store)
+
+    assert await READS[name](store) == expected
+    assert archive.load("inv") is None
+
+
+async def test_concurrent_reads_restore_once(store):
+    context = await store.get_context("inv")
+    await _archive(store)
+
+    await asyncio.gather(*(read(store) for read in READS.values()))
+
+    assert await store.get_context("inv") == context
+    assert (await store.get_summary("inv"))["total"] == 6
+
+
+async def test_write_to_archived_investigation_extends_it(store, archive):
+    await _archive(store)
+
+    await store.attach_alert("inv", {"alert": 2})
+    await store.store_finding("inv", {"n": 6, "severity": "low"})
+    await _archive(store)
+
+    context = archive.load("inv")["context"]
+    assert [finding["n"] for finding in context["findings"]] == list(range(7))
+    assert len(context["timeline"]) == 5
+    assert context["related_alerts"] == [{"alert": 1}, {"alert": 2}]
+    assert context["metadata"] == {"query": "beaconing", "duplicate_count": 2}
+
+
+async def test_sweep_merges_a_partial_copy_into_the_archive(store, archive, make_sync_store):
+    await _archive(store)
+    # A writer that does not restore first, e.g. one racing the sweep
+    unaware = make_sync_store()
+    unaware.store_finding("inv", {"n": 6, "severity": "low", "indicator": "10.0.0.0"})
+    unaware.add_timeline_event("inv", {"timestamp": BASE - 1, "n": -1})
+    unaware.attach_alert("inv", {"alert": 2})
+    await _archive(store)
+
+    context = await store.get_context("inv")
+    summary = await store.get_summary("inv")
+    assert [finding["n"] for finding in context["findings"]] == list(range(7))
+    assert [event["n"] for event in context["timeline"]] == [-1, 0, 1, 2, 3, 4]
+    assert context["metadata"] == {"query": "beaconing", "duplicate_count": 2}
+    assert summary["total"] == 7
+    assert summary["severity"] == {"high": 6, "low": 1}
+    assert summary["top_indicators"][0] == {"value": "10.0.0.0", "count": 3}
+
+
+async def test_sync_store_restores_archived_investigations(store, make_sync_store, archive):
+    await _archive(store)
+    sync_store = make_sync_store(archive=archive)
+
+    assert sync_store.get_metadata("inv") == {"query": "beaconing", "duplicate_count": 1}
+    sync_store.store_finding("inv", {"n": 6})
+    assert [finding["n"] for finding in sync_store.get_context("inv")["findings"]] == list(
+        range(7)
+    )
+
+
+async def test_writes_check_the_archive_once_per_investigation(async_pool, archive, monkeypatch):
+    store = AsyncRedisMemoryStore(pool=async_pool, archive=archive)
+    zscores, lookups, rehydrations = [], [], []
+    zscore, contains = store.client.zscore, archive.contains
+    monkeypatch.setattr(store.client, "zscore", lambda *args: zscores.append(args) or zscore(*args))
+    monkeypatch.setattr(archive, "contains", lambda *args: lookups.append(args) or contains(*args))
+    monkeypatch.setattr(store, "rehydrate", lambda *args: rehydrations.append(args))
+
+    for n in range(5):
+        await store.store_finding("new", {"n": n})
+        await store.add_timeline_event("new", {"timestamp": BASE + n})
+        await store.set_metadata("new", {"step": n})
+
+    assert len(zscores) == len(lookups) == 1
+    assert rehydrations == []
+
+
+async def test_archive_stores_zstd_records_without_a_second_layer(tmp_path):
+    serializer = Serializer(codec="msgpack", compress_threshold=64)
+    archive = InvestigationArchive(str(tmp_path), serializer=serializer)
+    record = {"context": {"metadata": {}, "findings": [{"n": n} for n in range(100)]}}
+
+    archive.write("inv", record)
+
+    data = (tmp_path / "segment-000001.bin").read_bytes()
+    assert data == serializer.encode(record)
+    assert archive.load("inv") == record
+    archive.close()
+
+
+async def test_archive_zlib_compresses_records_the_serializer_did_not(tmp_path, archive):
+    record = {"context": {"metadata": {"query": "beaconing"}}}
+
+    archive.write("inv", record)
+
+    # The same zlib stream around the blob that every record used to be
+    assert (tmp_path / "segment-000001.bin").read_bytes()[0] == 0x78
+    assert archive.load("inv") == record
@@ -0,0 +1,45 @@
+"""
+Tests that the CLI stays light until a command actually runs
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from main import cli
+
+ROOT = Path(__file__).resolve().parents[2]
+
+# Dependencies only a running command should pay for
+HEAVY = {"fastapi", "redis", "jinja2", "numpy", "httpx", "elasticsearch"}
+
+
+def _imported(*args: str) -> set:
+    """Top-level packages imported by ``main.py`` with the given arguments"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "main.py", *args],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    assert result.returncode == 0, result.stderr
+    return {
+        line.rsplit("|", 1)[1].strip().split(".")[0]
+        for line in result.stderr.splitlines()
+        if line.startswith("import time:") and "[us]" not in line
+    }
+
+
+@pytest.mark.parametrize(
+    "args",
+    [[], *([name] for name in sorted(cli.commands))],
+    ids=lambda args: args[0] if args else "warden",
+)
+def test_help_imports_no_heavy_dependencies(args):
+    imported = _imported(*args, "--help")
+
+    assert "click" in imported
+    assert not imported & HEAVY
@@ -0,0 +1,80 @@
+"""
+Tests for the framed, pluggable memory serializer
+"""
+
+import json
+
+import pytest
+
+from memory.codecs import CODECS, FLAG_ZSTD, FORMAT_VERSION, MAGIC, Serializer, _HEADER
+
+FINDING = {
+    "type": "ioc_match",
+    "severity": "high",
+    "indicator": "198.51.100.7",
+    "score": 87.5,
+    "tags": ["c2", "beacon"],
+    "details": {"ports": [443, 8443], "seen": None, "blocked": False},
+}
+
+
+def _header(blob: bytes):
+    return _HEADER.unpack_from(blob)
+
+
+@pytest.mark.parametrize("codec", sorted(CODECS))
+def test_each_codec_round_trips(codec):
+    serializer = Serializer(codec=codec, compress_threshold=0)
+
+    blob = serializer.encode(FINDING)
+
+    assert _header(blob) == (MAGIC, FORMAT_VERSION, CODECS[codec].codec_id, 0)
+    assert serializer.decode(blob) == FINDING
+
+
+@pytest.mark.parametrize("codec", sorted(CODECS))
+def test_blobs_stay_readable_after_the_codec_changes(codec):
+    blob = Serializer(codec=codec, compress_threshold=0).encode(FINDING)
+
+    for reader in sorted(CODECS):
+        assert Serializer(codec=reader, compress_threshold=0).decode(blob) == FINDING
+
+
+@pytest.mark.parametrize("legacy", [json.dumps(FINDING), json.dumps(FINDING).encode()])
+def test_legacy_headerless_json_still_decodes(legacy):
+    assert Serializer(codec="msgpack", compress_threshold=0).decode(legacy) == FINDING
+
+
+def test_payloads_over_the_threshold_are_zstd_compressed():
+    serializer = Serializer(codec="json", compress_threshold=256)
+    large = {**FINDING, "events": [FINDING] * 50}
+
+    small_blob, large_blob = serializer.encode(FINDING), serializer.encode(large)
+
+    assert _header(small_blob)[3] & FLAG_ZSTD == 0
+    assert _header(large_blob)[3] & FLAG_ZSTD
+    assert len(large_blob) < len(json.dumps(large))
+    assert serializer.decode(large_blob) == large
+    # Readers decompress whatever their own threshold is
+    assert Serializer(codec="json", compress_threshold=0).decode(large_blob) == large
+
+
+def test_newer_format_versions_are_refused():
+    blob = bytearray(Serializer(codec="json", compress_threshold=0).encode(FINDING))
+    blob[1] = FORMAT_VERSION + 1
+
+    with pytest.raises(ValueError, match="newer than supported"):
+        Serializer(codec="json", compress_threshold=0).decode(bytes(blob))
+
+
+def test_unknown_codec_ids_are_refused():
+    blob = bytearray(Serializer(codec="json", compress_threshold=0).encode(FINDING))
+    blob[2] = 0x7F
+
+    with pytest.raises(ValueError, match="Unknown codec ID"):
+        Serializer(codec="json", compress_threshold=0).decode(bytes(blob))
+
+
+def test_unknown_codec_names_are_refused():
+    with pytest.raises(ValueError, match="Unknown codec"):
+        Serializer(codec="pickle")
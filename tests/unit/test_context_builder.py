@@ -0,0 +1,78 @@
+"""
+Tests for the token-budgeted prompt context builder
+"""
+
+from llm.context_builder import ContextBuilder, estimate_tokens
+
+
+def _event(minute, kind="dns_query"):
+    return {"timestamp": f"2026-01-01T{minute // 60:02d}:{minute % 60:02d}:00Z", "type": kind}
+
+
+def _context(timeline, findings=()):
+    return {
+        "investigation_id": "inv-1",
+        "metadata": {"query": "beaconing from 10.0.0.5"},
+        "findings": list(findings),
+        "timeline": timeline,
+    }
+
+
+def _builder(**kwargs):
+    options = {"default_budget": 2000, "recent_events": 5, "segment_size": 10}
+    return ContextBuilder(**{**options, **kwargs})
+
+
+def test_back_dated_events_reach_segment_summaries():
+    builder = _builder()
+    timeline = [_event(minute) for minute in range(40)]
+    assert "EXPLOIT" not in builder.build(_context(timeline))
+
+    # A late-arriving event sorts into the first segment and shifts the rest
+    timeline.insert(3, _event(2, kind="EXPLOIT"))
+    text = builder.build(_context(timeline))
+
+    assert text == _builder().build(_context(timeline))
+    assert "EXPLOIT x1" in text
+
+
+def test_duplicate_findings_collapse_and_rank_by_severity():
+    findings = [
+        {"id": i, "type": "ioc_match", "severity": "low", "indicator": "198.51.100.7"}
+        for i in range(3)
+    ] + [{"id": 9, "type": "c2_beacon", "severity": "critical", "indicator": "10.0.0.5"}]
+
+    text = _builder().build(_context([], findings))
+
+    lines = text.splitlines()
+    assert lines[1] == "Findings (2 of 2 shown):"
+    assert lines[2].startswith("- [critical] c2_beacon 10.0.0.5")
+    assert lines[3].endswith("(x3)")
+
+
+def test_output_stays_within_budget():
+    findings = [
+        {"type": "ioc_match", "severity": "high", "indicator": f"203.0.113.{i}"}
+        for i in range(200)
+    ]
+    timeline = [_event(minute % 1440) for minute in range(2000)]
+
+    text = _builder(default_budget=300).build(_context(timeline, findings))
+
+    assert estimate_tokens(text) <= 300
+    assert "lower-priority findings omitted" in text
+
+
+def test_only_segments_that_fit_the_budget_are_summarized(monkeypatch):
+    summarized = []
+    summarize = ContextBuilder._segment_summary
+    monkeypatch.setattr(
+        ContextBuilder, "_segment_summary",
+        staticmethod(lambda events: summarized.append(events) or summarize(events)),
+    )
+    timeline = [_event(minute % 1440) for minute in range(20_000)]
+
+    text = _builder(default_budget=300).build(_context(timeline))
+
+    # The one summary that did not fit stops the timeline section
+    assert len(summarized) == text.count(" events (") + 1 < len(timeline) // 10
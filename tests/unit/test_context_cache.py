@@ -0,0 +1,74 @@
+"""
+Tests for the local context cache in front of Redis
+"""
+
+import asyncio
+
+import pytest
+
+from memory.context_cache import CachedMemoryStore
+from memory.redis_store import AsyncRedisMemoryStore
+
+pytestmark = pytest.mark.asyncio
+
+
+class GatedStore:
+    """Store whose reads return the version current at call time, once released"""
+
+    def __init__(self):
+        self.version = 0
+        self.reads = 0
+        self.gates = []
+
+    async def get_context(self, investigation_id):
+        self.reads += 1
+        version = self.version
+        gate = asyncio.Event()
+        self.gates.append(gate)
+        await gate.wait()
+        return {"investigation_id": investigation_id, "version": version}
+
+    async def set_metadata(self, investigation_id, metadata):
+        self.version += 1
+
+
+async def test_repeated_reads_are_served_locally(async_pool):
+    cached = CachedMemoryStore(AsyncRedisMemoryStore(pool=async_pool), ttl=60)
+    await cached.set_metadata("inv", {"query": "q"})
+
+    first = await cached.get_context("inv")
+    second = await cached.get_context("inv")
+
+    assert first is second
+    assert cached.stats()["hits"] == 1
+
+
+async def test_write_invalidates_cached_context(async_pool):
+    cached = CachedMemoryStore(AsyncRedisMemoryStore(pool=async_pool), ttl=60)
+    await cached.set_metadata("inv", {"status": "running"})
+    await cached.get_context("inv")
+
+    await cached.set_metadata("inv", {"status": "completed"})
+
+    assert (await cached.get_context("inv"))["metadata"]["status"] == "completed"
+
+
+async def test_read_started_before_a_write_is_not_cached():
+    store = GatedStore()
+    cached = CachedMemoryStore(store, ttl=60)
+
+    stale = asyncio.create_task(cached.get_context("inv"))
+    await asyncio.sleep(0)
+    await cached.set_metadata("inv", {"status": "completed"})
+    # A second reader starting after the write must not make the first one look fresh
+    fresh = asyncio.create_task(cached.get_context("inv"))
+    await asyncio.sleep(0)
+
+    store.gates[0].set()
+    assert (await stale)["version"] == 0
+    store.gates[1].set()
+    assert (await fresh)["version"] == 1
+
+    assert (await cached.get_context("inv"))["version"] == 1
+    assert store.reads == 2
+    assert not cached._inflight
@@ -0,0 +1,145 @@
+"""
+Tests for alert deduplication and coalescing
+"""
+
+import asyncio
+
+import pytest
+import redis.asyncio as aioredis
+
+from core.dedup import DEDUP_KEY, AlertDeduplicator
+from core.work_queue import InMemoryWorkQueue, WorkerPool
+from tests.fixtures import fake_redis
+
+pytestmark = pytest.mark.asyncio
+
+ALERT = {"source_ip": "10.0.0.5", "rule": "ssh-brute-force", "host": "web-1"}
+
+
+def _deduplicator(server, **kwargs):
+    client = aioredis.Redis(connection_pool=fake_redis.async_pool(server, decode_responses=True))
+    return AlertDeduplicator(
+        key_fields=["source_ip", "rule", "host"], window_seconds=60, client=client, **kwargs
+    )
+
+
+async def test_first_claim_wins(redis_server):
+    dedup = _deduplicator(redis_server)
+
+    assert await dedup.claim(ALERT, "first") is None
+    assert await dedup.claim({**ALERT, "query": "other text"}, "second") == "first"
+    # The owner's own retry is not a duplicate of itself
+    assert await dedup.claim(ALERT, "first") is None
+    assert dedup.duplicates == 1
+
+
+async def test_concurrent_claims_across_workers_agree(redis_server):
+    workers = [_deduplicator(redis_server) for _ in range(5)]
+
+    results = await asyncio.gather(
+        *(dedup.claim(ALERT, f"investigation-{i}") for i, dedup in enumerate(workers))
+    )
+
+    winners = [f"investigation-{i}" for i, result in enumerate(results) if result is None]
+    assert len(winners) == 1
+    assert [result for result in results if result is not None] == winners * 4
+
+
+async def test_local_entries_expire_with_the_shared_claim(redis_server):
+    owner, other = _deduplicator(redis_server), _deduplicator(redis_server)
+    await owner.claim(ALERT, "first")
+    key = DEDUP_KEY.format(fingerprint=owner.fingerprint(ALERT))
+    await owner.client.pexpire(key, 50)
+
+    assert await other.claim(ALERT, "second") == "first"
+    await asyncio.sleep(0.1)
+
+    # Answered locally before the window ended, but not after it
+    assert await other.claim(ALERT, "third") is None
+    assert await owner.client.get(key) == "third"
+
+
+async def test_alerts_without_key_fields_are_never_coalesced(redis_server):
+    dedup = _deduplicator(redis_server)
+
+    assert dedup.fingerprint({"query": "no keys"}) is None
+    assert await dedup.claim({"query": "no keys"}, "first") is None
+    assert await dedup.claim({"query": "no keys"}, "second") is None
+    assert await dedup.client.keys("dedup:*") == []
+
+
+async def test_release_only_drops_the_owners_claim(redis_server):
+    dedup = _deduplicator(redis_server)
+    await dedup.claim(ALERT, "first")
+
+    await dedup.release(ALERT, "someone-else")
+    assert await dedup.claim(ALERT, "second") == "first"
+
+    await dedup.release(ALERT, "first")
+    assert await dedup.claim(ALERT, "second") is None
+
+
+class RecordingMemory:
+    def __init__(self):
+        self.attached = []
+        self.events = []
+
+    async def attach_alert(self, investigation_id, alert):
+        self.attached.append((investigation_id, alert["query"]))
+
+    async def publish_event(self, investigation_id, event_type, data):
+        self.events.append((investigation_id, data))
+
+
+class RecordingOrchestrator:
+    def __init__(self, fail_queries=()):
+        self.memory = RecordingMemory()
+        self.started = []
+        self.fail_queries = set(fail_queries)
+
+    async def investigate(self, query, investigation_id=None):
+        self.started.append((investigation_id, query))
+        if query in self.fail_queries:
+            raise RuntimeError(f"{query} failed")
+
+
+async def _run(pool, until):
+    runner = asyncio.create_task(pool.run())
+    async with asyncio.timeout(5):
+        while not until():
+            await asyncio.sleep(0.01)
+    pool.stop()
+    await asyncio.wait_for(runner, 5)
+
+
+async def test_worker_pool_coalesces_duplicate_alerts(redis_server):
+    queue = InMemoryWorkQueue(max_backlog=10)
+    orchestrator = RecordingOrchestrator()
+    pool = WorkerPool(orchestrator, queue, concurrency=1, deduplicator=_deduplicator(redis_server))
+    for query in ("first", "repeat", "repeat again"):
+        await queue.put({**ALERT, "query": query})
+
+    await _run(pool, lambda: pool.processed + pool.coalesced == 3)
+
+    [(investigation_id, query)] = orchestrator.started
+    assert query == "first"
+    assert orchestrator.memory.attached == [
+        (investigation_id, "repeat"),
+        (investigation_id, "repeat again"),
+    ]
+    assert [data for _, data in orchestrator.memory.events] == [
+        {"status": "merged", "investigation_id": investigation_id}
+    ] * 2
+
+
+async def test_failed_investigation_releases_its_claim(redis_server):
+    queue = InMemoryWorkQueue(max_backlog=10, max_retries=0)
+    orchestrator = RecordingOrchestrator(fail_queries={"first"})
+    pool = WorkerPool(orchestrator, queue, concurrency=1, deduplicator=_deduplicator(redis_server))
+    await queue.put({**ALERT, "query": "first"})
+    await queue.put({**ALERT, "query": "resent"})
+
+    await _run(pool, lambda: pool.failed == 1 and pool.processed == 1)
+
+    assert [query for _, query in orchestrator.started] == ["first", "resent"]
+    assert orchestrator.memory.attached == []
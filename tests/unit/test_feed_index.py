@@ -0,0 +1,67 @@
+"""
+Tests for the offline threat-feed index
+"""
+
+import json
+
+from intelligence.feed_index import CURRENT_FILE, META, FeedIndex, FeedIndexBuilder
+
+
+def _build(directory, values):
+    builder = FeedIndexBuilder(str(directory))
+    builder.add_many(values)
+    return builder.build()
+
+
+def test_ipv4_ranges_are_merged_and_matched(tmp_path):
+    version = _build(tmp_path, [
+        "10.0.0.0/24", "10.0.0.128/25", "10.0.1.0/24",  # overlapping and adjacent
+        "192.0.2.7", "192.0.2.7:8080", "255.255.255.255", "not an ip/99",
+    ])
+    index = FeedIndex(str(tmp_path))
+
+    meta = json.loads((version / META).read_text())
+    assert meta["ipv4_ranges"] == 3
+    assert meta["skipped"] == 1
+    assert index.contains_ip("10.0.1.255")
+    assert index.contains_ip("192.0.2.7")
+    assert index.contains_ip("255.255.255.255")
+    assert not index.contains_ip("10.0.2.0")
+    assert not index.contains_ip("192.0.2.8")
+    index.close()
+
+
+def test_ipv6_domains_and_hashes(tmp_path):
+    sha = "a" * 64
+    _build(tmp_path, [
+        "2001:db8::/64", "2001:db8:0:1::/64", "2001:db8:ffff::1", "::",
+        "evil.example", "MALWARE.test.", sha.upper(),
+    ])
+    index = FeedIndex(str(tmp_path))
+
+    assert index.match("ipv6", "2001:db8::ffff")
+    assert index.match("ipv6", "2001:db8:0:1::5")
+    assert index.match("ipv6", "2001:db8:ffff::1")
+    assert index.match("ipv6", "::")
+    assert not index.match("ipv6", "2001:db8:0:2::")
+    assert index.match("domain", "cdn.evil.example")
+    assert index.match("domain", "malware.test")
+    assert not index.match("domain", "example")
+    assert index.match("sha256", sha)
+    assert not index.match("md5", "b" * 32)
+    index.close()
+
+
+def test_readers_switch_to_a_new_version(tmp_path):
+    _build(tmp_path, ["192.0.2.1"])
+    index = FeedIndex(str(tmp_path), refresh_interval=0)
+    assert index.contains_ip("192.0.2.1")
+
+    for _ in range(3):
+        latest = _build(tmp_path, ["198.51.100.1"])
+
+    assert index.contains_ip("198.51.100.1")
+    assert not index.contains_ip("192.0.2.1")
+    assert (tmp_path / CURRENT_FILE).read_text() == latest.name
+    assert len(list(tmp_path.glob("index-*"))) == 2
+    index.close()
@@ -0,0 +1,87 @@
+"""
+Tests for the indicator enrichment cache
+"""
+
+import asyncio
+
+import pytest
+import redis.asyncio as aioredis
+
+from intelligence.cache import EnrichmentCache
+from tests.fixtures import fake_redis
+
+pytestmark = pytest.mark.asyncio
+
+
+class CountingFetch:
+    """Upstream stand-in that counts calls and returns a fixed outcome"""
+
+    def __init__(self, outcome=({"found": True, "score": 90}, None), seconds=0.0):
+        self.outcome = outcome
+        self.seconds = seconds
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.seconds)
+        return self.outcome
+
+
+def _cache(server, **kwargs):
+    client = aioredis.Redis(connection_pool=fake_redis.async_pool(server))
+    return EnrichmentCache(client=client, ttls={"abuseipdb": 3600}, negative_ttl=60, **kwargs)
+
+
+async def test_concurrent_lookups_share_one_upstream_call(redis_server):
+    cache = _cache(redis_server)
+    fetch = CountingFetch(seconds=0.01)
+
+    outcomes = await asyncio.gather(
+        *(cache.get_or_fetch("abuseipdb", "ipv4", "203.0.113.7", fetch) for _ in range(10))
+    )
+
+    assert fetch.calls == 1
+    assert outcomes == [fetch.outcome] * 10
+
+
+async def test_entries_are_shared_through_redis(redis_server):
+    fetch = CountingFetch()
+    await _cache(redis_server).get_or_fetch("abuseipdb", "ipv4", "203.0.113.7", fetch)
+
+    outcome = await _cache(redis_server).get_or_fetch("abuseipdb", "ipv4", "203.0.113.7", fetch)
+
+    assert fetch.calls == 1
+    assert outcome == fetch.outcome
+
+
+async def test_misses_and_errors_use_the_negative_ttl(redis_server):
+    cache = _cache(redis_server)
+    client = cache.client
+    outcomes = {
+        "203.0.113.7": ({"found": True}, None),
+        "198.51.100.1": ({"found": False}, None),
+        "198.51.100.2": (None, "timeout"),
+    }
+    for value, outcome in outcomes.items():
+        await cache.get_or_fetch("abuseipdb", "ipv4", value, CountingFetch(outcome))
+
+    stale = cache.stale_ttl
+    assert await client.ttl("intel:abuseipdb:ipv4:203.0.113.7") == 3600 + stale
+    assert await client.ttl("intel:abuseipdb:ipv4:198.51.100.1") == 60 + stale
+    assert await client.ttl("intel:abuseipdb:ipv4:198.51.100.2") == 60 + stale
+
+
+async def test_redis_outage_falls_back_to_upstream(redis_server, caplog):
+    cache = _cache(redis_server)
+    fetch = CountingFetch()
+    redis_server.connected = False
+
+    first = await cache.get_or_fetch("abuseipdb", "ipv4", "203.0.113.7", fetch)
+    await cache.store("abuseipdb", "ipv4", "198.51.100.1", fetch.outcome)
+    # The local tier still answers repeat lookups while Redis is down
+    second = await cache.get_or_fetch("abuseipdb", "ipv4", "203.0.113.7", fetch)
+    other = await _cache(redis_server).get_or_fetch("abuseipdb", "ipv4", "203.0.113.7", fetch)
+
+    assert first == second == other == fetch.outcome
+    assert fetch.calls == 2
+    assert "Enrichment cache read failed" in caplog.text
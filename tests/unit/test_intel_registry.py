@@ -0,0 +1,122 @@
+"""
+Tests for bulk enrichment and provider rate limiting
+"""
+
+import asyncio
+import time
+
+import pytest
+from pydantic import ValidationError
+
+from config.settings import Settings
+from intelligence.providers.base import ThreatIntelProvider
+from intelligence.rate_limit import TokenBucket
+from intelligence.registry import ProviderRegistry
+
+pytestmark = pytest.mark.asyncio
+
+
+class FakeProvider(ThreatIntelProvider):
+    """In-process provider that flags addresses ending in .66"""
+
+    name = "fake"
+    supported_types = frozenset({"ipv4"})
+
+    def __init__(self, rate_limit=1000.0, max_batch_size=1):
+        super().__init__(timeout=1.0, rate_limit=rate_limit)
+        self.max_batch_size = max_batch_size
+        self.requests = 0
+
+    def _result(self, value):
+        return {"found": True, "malicious": value.endswith(".66"), "score": 0, "details": {}}
+
+    async def lookup(self, indicator_type, value, client):
+        self.requests += 1
+        return self._result(value)
+
+    async def lookup_many(self, indicator_type, values, client):
+        self.requests += 1
+        return {value: self._result(value) for value in values}
+
+
+class CrashingCache:
+    """Enrichment cache whose peek blows up, failing a bulk provider task"""
+
+    async def peek(self, provider, indicator_type, value):
+        raise RuntimeError("cache exploded")
+
+
+async def _collect(registry, indicators):
+    return [record async for record in registry.enrich_many(indicators)]
+
+
+async def test_enrich_many_normalizes_and_deduplicates():
+    provider = FakeProvider(max_batch_size=2)
+    registry = ProviderRegistry([provider])
+
+    records = await _collect(registry, ["10.0.0.1", " 10.0.0.1", "10.0.0.66", "10.0.0.3", "junk"])
+    await registry.close()
+
+    by_value = {record["indicator"]: record for record in records}
+    assert set(by_value) == {"junk", "10.0.0.1", "10.0.0.66", "10.0.0.3"}
+    assert by_value["junk"]["errors"] == {"*": "invalid"}
+    assert by_value["10.0.0.66"]["results"]["fake"]["malicious"]
+    assert provider.requests == 2
+
+
+async def test_crashed_provider_task_reports_errors_instead_of_hanging():
+    registry = ProviderRegistry([FakeProvider(max_batch_size=10)], cache=CrashingCache())
+
+    records = await asyncio.wait_for(_collect(registry, ["10.0.0.1", "10.0.0.2"]), 2)
+    await registry.close()
+
+    assert [record["errors"] for record in records] == [{"fake": "cache exploded"}] * 2
+
+
+async def test_single_lookup_overtakes_bulk_backlog():
+    provider = FakeProvider(rate_limit=10.0)
+    registry = ProviderRegistry([provider])
+    # 50 queued bulk lookups hold about 5 s worth of tokens
+    bulk = asyncio.create_task(_collect(registry, [f"10.0.1.{i}" for i in range(50)]))
+    await asyncio.sleep(0.05)
+
+    start = time.perf_counter()
+    enriched = await registry.lookup("10.0.0.66")
+    elapsed = time.perf_counter() - start
+    bulk.cancel()
+    await registry.close()
+
+    assert enriched["errors"] == {}
+    assert elapsed < 0.3
+
+
+async def test_token_bucket_paces_requests_and_serves_priority_first():
+    bucket = TokenBucket(rate=20.0, capacity=1.0)
+    order = []
+
+    async def take(name, priority):
+        await bucket.acquire(priority=priority)
+        order.append(name)
+
+    start = time.perf_counter()
+    waiters = [asyncio.create_task(take(f"bulk{i}", 1)) for i in range(4)]
+    await asyncio.sleep(0)
+    waiters.append(asyncio.create_task(take("urgent", 0)))
+    await asyncio.gather(*waiters)
+    elapsed = time.perf_counter() - start
+
+    assert order[:2] == ["bulk0", "urgent"]
+    assert 0.18 <= elapsed < 0.35
+
+
+@pytest.mark.parametrize("rate, capacity", [(0.0, None), (-1.0, None), (5.0, 0.5)])
+async def test_token_bucket_refuses_limits_it_cannot_serve(rate, capacity):
+    with pytest.raises(ValueError):
+        TokenBucket(rate=rate, capacity=capacity)
+
+
+@pytest.mark.parametrize("field", ["intel_rate_limit", "intel_rate_limits"])
+async def test_settings_refuse_non_positive_rate_limits(field):
+    value = 0.0 if field == "intel_rate_limit" else {"abuseipdb": 0.0}
+    with pytest.raises(ValidationError):
+        Settings(**{field: value})
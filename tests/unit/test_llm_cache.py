@@ -0,0 +1,64 @@
+"""
+Tests for the exact and semantic LLM response cache
+"""
+
+import pytest
+import redis.asyncio as aioredis
+
+from llm.cache import LLMCache, VECTORS_KEY
+from tests.fixtures import fake_redis
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture
+def client(redis_server):
+    return aioredis.Redis(connection_pool=fake_redis.async_pool(redis_server, decode_responses=True))
+
+
+async def test_exact_entries_round_trip(client):
+    cache = LLMCache(client=client, ttl=60, max_entries=10)
+    await cache.set("digest", {"response": "ok", "duration_ms": 5.0})
+
+    assert await cache.get("digest") == {"response": "ok", "duration_ms": 5.0}
+    assert await cache.get("other") is None
+
+
+async def test_semantic_match_respects_threshold(client):
+    cache = LLMCache(client=client, ttl=60, max_entries=10, threshold=0.9)
+    await cache.set("near", {"response": "near"}, scope="s", vector=[1.0, 0.1, 0.0])
+    await cache.set("far", {"response": "far"}, scope="s", vector=[0.0, 0.0, 1.0])
+
+    assert (await cache.find_similar("s", [2.0, 0.0, 0.0]))["response"] == "near"
+    assert await cache.find_similar("s", [0.5, 0.0, 0.5]) is None
+    assert await cache.find_similar("other", [1.0, 0.1, 0.0]) is None
+    assert await cache.find_similar("s", [0.0, 0.0, 0.0]) is None
+
+
+async def test_vectors_are_reloaded_from_redis(client):
+    await LLMCache(client=client, ttl=60).set(
+        "d", {"response": "persisted"}, scope="s", vector=[0.3, 0.4]
+    )
+
+    fresh = LLMCache(client=client, ttl=60, threshold=0.99)
+
+    assert (await fresh.find_similar("s", [0.6, 0.8]))["response"] == "persisted"
+
+
+async def test_oldest_vectors_are_dropped_beyond_max_vectors(client):
+    cache = LLMCache(client=client, ttl=60, max_entries=10, threshold=0.99, max_vectors=2)
+    for i, vector in enumerate(([1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0])):
+        await cache.set(f"d{i}", {"response": i}, scope="s", vector=vector)
+
+    assert await cache.find_similar("s", [1.0, 0.0, 0.0]) is None
+    assert (await cache.find_similar("s", [0.0, 0.0, 1.0]))["response"] == 2
+    assert sorted(await client.hkeys(VECTORS_KEY.format(scope="s"))) == ["d1", "d2"]
+
+
+async def test_expired_entries_stop_matching(client):
+    cache = LLMCache(client=client, ttl=60, threshold=0.9)
+    await cache.set("gone", {"response": "gone"}, scope="s", vector=[1.0, 0.0])
+    await client.delete("llm:cache:gone")
+
+    assert await cache.find_similar("s", [1.0, 0.0]) is None
+    assert await client.hkeys(VECTORS_KEY.format(scope="s")) == []
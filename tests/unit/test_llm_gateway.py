@@ -0,0 +1,102 @@
+"""
+Tests for the concurrency-governed LLM gateway
+"""
+
+import asyncio
+
+import pytest
+
+from llm.gateway import LLMGateway, Priority
+
+pytestmark = pytest.mark.asyncio
+
+
+class FakeClient:
+    """Ollama client stand-in that records call order and concurrency"""
+
+    model = "fake"
+
+    def __init__(self, seconds=0.02):
+        self.seconds = seconds
+        self.prompts = []
+        self.embed_calls = []
+        self.running = 0
+        self.peak = 0
+
+    async def generate(self, prompt, model=None, **options):
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        self.prompts.append(prompt)
+        await asyncio.sleep(self.seconds)
+        self.running -= 1
+        if prompt == "fail":
+            raise RuntimeError("model crashed")
+        return {"response": prompt.upper(), "model": model or self.model}
+
+    async def stream(self, prompt, model=None, **options):
+        for token in prompt.split():
+            await asyncio.sleep(0)
+            yield token
+
+    async def embed(self, texts, model=None):
+        self.embed_calls.append(list(texts))
+        return [[float(len(text))] for text in texts]
+
+
+async def test_in_flight_requests_are_capped():
+    client = FakeClient()
+    gateway = LLMGateway(client, max_in_flight=2, max_queued=100)
+
+    results = await asyncio.gather(*(gateway.generate(f"p{i}") for i in range(10)))
+    await gateway.close()
+
+    assert client.peak == 2
+    assert [result["response"] for result in results] == [f"P{i}" for i in range(10)]
+
+
+async def test_interactive_requests_overtake_queued_background():
+    client = FakeClient()
+    gateway = LLMGateway(client, max_in_flight=1, max_queued=100)
+
+    background = [asyncio.create_task(gateway.generate(f"bg{i}")) for i in range(5)]
+    await asyncio.sleep(0.005)
+    await gateway.generate("urgent", priority=Priority.INTERACTIVE)
+    await asyncio.gather(*background)
+    await gateway.close()
+
+    # Only the background request already running finishes before it
+    assert client.prompts.index("urgent") == 1
+
+
+async def test_errors_reach_the_caller_and_free_the_slot():
+    gateway = LLMGateway(FakeClient(), max_in_flight=1, max_queued=10)
+
+    with pytest.raises(RuntimeError, match="model crashed"):
+        await gateway.generate("fail")
+    result = await gateway.generate("next")
+    await gateway.close()
+
+    assert result["response"] == "NEXT"
+    assert gateway.stats() == {"in_flight": 0, "queued": 0}
+
+
+async def test_stream_yields_tokens():
+    gateway = LLMGateway(FakeClient(), max_in_flight=1, max_queued=10)
+
+    tokens = [token async for token in gateway.stream("a b c")]
+    await gateway.close()
+
+    assert tokens == ["a", "b", "c"]
+
+
+async def test_concurrent_embeddings_share_one_call():
+    client = FakeClient()
+    gateway = LLMGateway(
+        client, max_in_flight=1, max_queued=10, embed_batch_size=16, embed_batch_wait_ms=20
+    )
+
+    vectors = await asyncio.gather(gateway.embed(["a", "bb"]), gateway.embed(["ccc"]))
+    await gateway.close()
+
+    assert client.embed_calls == [["a", "bb", "ccc"]]
+    assert vectors == [[[1.0], [2.0]], [[3.0]]]
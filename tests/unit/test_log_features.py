@@ -0,0 +1,104 @@
+"""
+Tests for vectorized log feature extraction
+"""
+
+from agents.log_features import LogFeatureExtractor
+from mcp_servers.tools.logs import LogSummaryTool
+
+BASE_MS = 1_767_225_600_000  # 2026-01-01T00:00:00Z
+
+
+def _event(timestamp, ip="10.0.0.1", user="alice"):
+    event = {"source": {"ip": ip}, "user": {"name": user}}
+    if timestamp is not None:
+        event["@timestamp"] = timestamp
+    return {"_source": event}
+
+
+def test_mixed_timestamp_forms_land_in_the_same_buckets():
+    extractor = LogFeatureExtractor()
+    extractor.add_page([
+        _event(BASE_MS),
+        _event("2026-01-01T00:00:30Z"),
+        _event("2026-01-01T02:00:45+02:00"),
+        _event(str(BASE_MS + 60_000)),
+        _event("2026-01-01T00:01:10"),
+    ])
+
+    timeline = extractor.summary()["timeline"]
+    assert timeline["start"] == "2026-01-01T00:00:00.000Z"
+    assert timeline["counts"] == [3, 2]
+    assert timeline["missing_timestamps"] == 0
+
+
+def test_missing_and_unparseable_timestamps_are_counted_not_bucketed():
+    extractor = LogFeatureExtractor()
+    extractor.add_page([
+        _event(BASE_MS), _event(None), _event(""), _event("yesterday"), _event(float("nan")),
+    ])
+
+    summary = extractor.summary()
+    assert summary["event_count"] == 5
+    assert summary["timeline"]["counts"] == [1]
+    assert summary["timeline"]["missing_timestamps"] == 4
+    assert summary["ips"]["top"] == [{"value": "10.0.0.1", "count": 5}]
+
+
+def test_outlying_timestamps_do_not_stretch_the_histogram():
+    extractor = LogFeatureExtractor(max_buckets=60)
+    extractor.add_page([_event(0), _event(BASE_MS * 100)])
+    extractor.add_page([_event(BASE_MS + i * 1000) for i in range(300)])
+
+    timeline = extractor.summary()["timeline"]
+    assert timeline["counts"] == [60] * 5
+    assert timeline["outside_window"] == 2
+
+
+def test_spikes_and_rare_values_are_flagged():
+    extractor = LogFeatureExtractor(zscore_threshold=2.0)
+    events = [_event(BASE_MS + minute * 60_000) for minute in range(30)]
+    events += [_event(BASE_MS + 10 * 60_000, ip="203.0.113.9", user="mallory")] * 40
+    extractor.add_page(events)
+
+    summary = extractor.summary()
+    assert summary["timeline"]["anomalies"] == [
+        {"start": "2026-01-01T00:10:00.000Z", "count": 41}
+    ]
+    assert summary["users"]["top"][0] == {"value": "mallory", "count": 40}
+
+
+def test_summarize_logs_tool_handles_events_without_timestamps():
+    summary = LogSummaryTool.compute({"events": [_event(None), _event("2026-01-01T00:00:00Z")]})
+
+    assert summary["timeline"]["counts"] == [1]
+    assert summary["timeline"]["missing_timestamps"] == 1
+
+
+def test_counts_merged_in_batches_match_a_single_merge():
+    batched, single = LogFeatureExtractor(), LogFeatureExtractor()
+    batched.ip_counts.merge_rows = 3
+    pages = [
+        [_event(BASE_MS, ip=f"10.0.0.{(page * 7 + i) % 5}") for i in range(4)]
+        for page in range(6)
+    ]
+    for page in pages:
+        batched.add_page(page)
+        single.add_page(page)
+
+    assert batched.summary() == single.summary()
+    assert batched.summary()["ips"]["distinct"] == 5
+
+
+def test_flat_dotted_and_partly_missing_fields_are_read():
+    extractor = LogFeatureExtractor()
+    extractor.add_page([
+        {"source.ip": "10.0.0.1", "user.name": "alice", "@timestamp": BASE_MS},
+        _event(BASE_MS, ip="10.0.0.1", user="bob"),
+        {"source": "not-a-document", "@timestamp": BASE_MS},
+        {"_source": {"user": {"name": ""}, "@timestamp": BASE_MS}},
+    ])
+
+    summary = extractor.summary()
+    assert summary["ips"]["top"] == [{"value": "10.0.0.1", "count": 2}]
+    assert summary["users"]["distinct"] == 2
+    assert summary["timeline"]["counts"] == [4]
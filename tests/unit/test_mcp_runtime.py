@@ -0,0 +1,131 @@
+"""
+Tests for MCP tool runtime start-up
+"""
+
+import asyncio
+import os
+
+import pytest
+
+from mcp_servers.runtime import ToolRuntime
+from mcp_servers.tools.base import Tool
+
+pytestmark = pytest.mark.asyncio
+
+
+class SlowSetupTool(Tool):
+    """I/O tool that needs its client before it can run"""
+
+    name = "slow_setup"
+
+    def __init__(self, fail_setups=0):
+        self.setups = 0
+        self.closes = 0
+        self.fail_setups = fail_setups
+        self.client = None
+
+    async def setup(self):
+        self.setups += 1
+        await asyncio.sleep(0.05)
+        if self.fail_setups:
+            self.fail_setups -= 1
+            raise ConnectionError("backend unavailable")
+        self.client = object()
+
+    async def close(self):
+        self.closes += 1
+        self.client = None
+
+    async def run(self, arguments):
+        assert self.client is not None, "called before setup finished"
+        return arguments["n"]
+
+
+class PidTool(Tool):
+    """CPU-bound tool reporting which process computed it"""
+
+    name = "pid"
+    cpu_bound = True
+
+    @staticmethod
+    def compute(arguments):
+        return os.getpid()
+
+
+class EchoTool(Tool):
+    """Cacheable I/O tool counting how often it actually runs"""
+
+    name = "echo"
+    cacheable = True
+
+    def __init__(self):
+        self.runs = 0
+
+    async def run(self, arguments):
+        self.runs += 1
+        await asyncio.sleep(0.01)
+        return dict(arguments)
+
+
+async def test_concurrent_first_calls_wait_for_one_start():
+    tool = SlowSetupTool()
+    runtime = ToolRuntime([tool], processes=1)
+
+    results = await asyncio.gather(*(runtime.call("slow_setup", {"n": n}) for n in range(5)))
+
+    assert results == list(range(5))
+    assert tool.setups == 1
+    await runtime.close()
+
+
+async def test_register_is_refused_while_starting():
+    runtime = ToolRuntime([SlowSetupTool()], processes=1)
+    starting = asyncio.create_task(runtime.start())
+    await asyncio.sleep(0)
+
+    with pytest.raises(RuntimeError):
+        runtime.register(PidTool())
+    await starting
+    await runtime.close()
+
+
+async def test_failed_start_is_cleaned_up_and_retried():
+    tool = SlowSetupTool(fail_setups=1)
+    runtime = ToolRuntime([tool], processes=1)
+
+    with pytest.raises(ConnectionError):
+        await runtime.call("slow_setup", {"n": 1})
+    assert tool.closes == 1
+
+    assert await runtime.call("slow_setup", {"n": 2}) == 2
+    assert tool.setups == 2
+    await runtime.close()
+
+
+async def test_cpu_calls_during_start_run_in_the_pool():
+    runtime = ToolRuntime([PidTool()], processes=1)
+
+    pids = await asyncio.gather(*(runtime.call("pid") for _ in range(3)))
+
+    # Before the fix, calls racing start() ran on the default thread pool
+    assert os.getpid() not in pids
+    await runtime.close()
+
+
+async def test_cache_keys_are_fixed_size_digests_of_the_arguments():
+    tool = EchoTool()
+    runtime = ToolRuntime([tool], processes=1)
+    events = [{"@timestamp": n, "source": {"ip": "10.0.0.1"}} for n in range(5000)]
+
+    first = await runtime.call("echo", {"events": events, "top_k": 5})
+    reordered = await asyncio.gather(
+        *(runtime.call("echo", {"top_k": 5, "events": events}) for _ in range(3))
+    )
+
+    assert tool.runs == 1
+    assert all(result is first for result in reordered)
+    [key] = runtime.cache._data
+    assert isinstance(key, bytes) and len(key) == 16
+    await runtime.call("echo", {"events": events, "top_k": 6})
+    assert tool.runs == 2
+    await runtime.close()
@@ -0,0 +1,86 @@
+"""
+Tests for the background PDF job queue
+"""
+
+import asyncio
+import os
+
+import pytest
+import pytest_asyncio
+
+from reports.formatters.pdf import PDFJobQueue
+from tests.fixtures import stub_pdf
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest_asyncio.fixture
+async def queue(tmp_path):
+    queue = PDFJobQueue(
+        processes=1, queue_size=4, output_dir=str(tmp_path), renderer=stub_pdf.render
+    )
+    yield queue
+    await queue.stop()
+
+
+async def test_jobs_move_from_queued_to_completed_or_failed(queue):
+    good = queue.submit("inv", "<p>report</p>", key="good")
+    bad = queue.submit("inv", stub_pdf.FAIL, key="bad")
+    assert (good.status, bad.status, queue.backlog) == ("queued", "queued", 2)
+
+    await queue.start()
+    await asyncio.gather(queue.wait(good, timeout=30), queue.wait(bad, timeout=30))
+
+    assert good.status == "completed"
+    assert good.size == os.path.getsize(good.path)
+    assert good.html is None and good.finished_at is not None
+    assert queue.lookup("good") is good
+    assert bad.status == "failed"
+    assert bad.error == "unsupported markup"
+    # A failed conversion is retried rather than reused
+    assert queue.lookup("bad") is None
+    assert (queue.completed, queue.failed, queue.backlog) == (1, 1, 0)
+
+
+async def test_full_queue_refuses_new_jobs(queue):
+    for i in range(4):
+        queue.submit(f"inv-{i}", "<p>report</p>")
+
+    with pytest.raises(asyncio.QueueFull):
+        queue.submit("inv-4", "<p>report</p>")
+
+
+async def test_evicted_jobs_have_their_pdf_deleted(queue):
+    queue.jobs.max_size = 1
+    await queue.start()
+    first = await queue.wait(queue.submit("inv", "<p>first</p>"), timeout=30)
+    assert os.path.exists(first.path)
+
+    second = queue.submit("inv", "<p>second</p>")
+    # Evicted while still queued: deleted by its dispatcher once it is written
+    third = queue.submit("inv", "<p>third</p>")
+    await asyncio.gather(queue.wait(second, timeout=30), queue.wait(third, timeout=30))
+
+    assert queue.get(first.id) is None and not os.path.exists(first.path)
+    assert second.status == "completed" and not os.path.exists(second.path)
+    assert os.path.exists(third.path)
+    assert os.listdir(queue.output_dir) == [os.path.basename(third.path)]
+
+
+async def test_expired_jobs_have_their_pdf_deleted(tmp_path):
+    queue = PDFJobQueue(processes=1, output_dir=str(tmp_path), renderer=stub_pdf.render, job_ttl=1)
+    await queue.start()
+    try:
+        # Start the worker first, so the job finishes well within its TTL
+        await queue.wait(queue.submit("warm-up", "<p>report</p>"), timeout=30)
+        job = await queue.wait(queue.submit("inv", "<p>report</p>", key="k"), timeout=30)
+        assert os.path.exists(job.path)
+        await asyncio.sleep(1)
+
+        queue.prune()
+
+        assert queue.get(job.id) is None and queue.lookup("k") is None
+        assert not os.path.exists(job.path)
+        assert os.listdir(tmp_path) == []
+    finally:
+        await queue.stop()
@@ -0,0 +1,77 @@
+"""
+Tests for the pipelined Redis memory store
+"""
+
+import fakeredis
+
+from config.settings import settings
+from memory.events import EVENTS_KEY
+from memory.redis_store import RedisMemoryStore
+
+
+def test_bulk_and_single_writes_read_back_in_order(make_sync_store):
+    store = make_sync_store()
+    ids = store.store_findings_bulk("inv", [{"n": 0}, {"n": 1}])
+    ids.append(store.store_finding("inv", {"n": 2}))
+    store.set_metadata("inv", {"query": "failed logins"})
+
+    context = store.get_context("inv")
+
+    assert len(set(ids)) == 3
+    assert [f["n"] for f in context["findings"]] == [0, 1, 2]
+    assert context["metadata"] == {"query": "failed logins"}
+
+
+def test_missing_investigation_has_no_context(make_sync_store):
+    assert make_sync_store().get_context("missing") is None
+
+
+def test_stream_is_capped_at_max_findings(make_sync_store):
+    store = make_sync_store(max_findings=10)
+    store.store_findings_bulk("inv", [{"n": i} for i in range(500)])
+
+    findings = store.get_context("inv")["findings"]
+
+    # The cap is approximate (MAXLEN ~), so only bound it
+    assert len(findings) < 500
+    assert findings[-1] == {"n": 499}
+
+
+def test_timeline_range_page_and_tail_reads(make_sync_store):
+    store = make_sync_store()
+    # Appended out of order; reads follow the timestamps
+    for second in [5, 0, 9, 3, 1, 8, 2, 7, 4, 6]:
+        store.add_timeline_event("inv", {"timestamp": 1_767_225_600 + second, "n": second})
+
+    def numbers(events):
+        return [event["n"] for event in events]
+
+    assert numbers(store.get_timeline("inv", "2026-01-01T00:00:02Z", 1_767_225_604)) == [2, 3, 4]
+    assert numbers(store.get_timeline("inv", offset=4, limit=3)) == [4, 5, 6]
+    assert numbers(store.get_timeline("inv", start=1_767_225_603, offset=1, limit=2)) == [4, 5]
+    assert numbers(store.get_timeline("inv", offset=8)) == [8, 9]
+    assert store.get_timeline("inv", limit=0) == []
+    assert numbers(store.get_timeline_tail("inv", 3)) == [7, 8, 9]
+    assert store.count_timeline("inv", end=1_767_225_604) == 5
+
+
+def test_sync_writes_publish_progress_events(make_sync_store, redis_server):
+    store = make_sync_store()
+    store.store_finding("inv", {"n": 0})
+    store.add_timeline_event("inv", {"type": "agent_completed"})
+    store.publish_event("inv", "status", {"status": "completed"})
+
+    entries = fakeredis.FakeRedis(server=redis_server).xrange(
+        EVENTS_KEY.format(investigation_id="inv")
+    )
+
+    assert [fields[b"type"] for _, fields in entries] == [b"finding", b"timeline", b"status"]
+
+
+def test_sync_store_connects_where_settings_point():
+    store = RedisMemoryStore(port=6380)
+    try:
+        connection = store.client.connection_pool.connection_kwargs
+        assert (connection["host"], connection["port"]) == (settings.redis_host, 6380)
+    finally:
+        store.close()
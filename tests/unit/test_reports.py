@@ -0,0 +1,52 @@
+"""
+Tests for the investigation report builder
+"""
+
+from memory.aggregates import summarize_findings
+from reports.builder import TEMPLATE_DIR, ReportBuilder
+
+BASE = 1_767_225_600
+
+
+def _report(builder: ReportBuilder, findings=3, events=4):
+    recent = [
+        {"type": "ioc", "severity": "high", "indicator": f"10.0.0.{i}"}
+        for i in range(findings)
+    ]
+    timeline = [{"timestamp": BASE + i, "type": "dns"} for i in range(events)]
+    return builder.prepare(
+        "inv", {"query": "beaconing"}, summarize_findings(recent), recent, timeline
+    )
+
+
+def test_every_template_is_compiled_when_the_builder_is_created():
+    builder = ReportBuilder()
+    names = {path.relative_to(TEMPLATE_DIR).as_posix() for path in TEMPLATE_DIR.rglob("*.j2")}
+
+    assert {name for _, name in builder.env.cache.keys()} == names
+
+    def no_loading(*args):
+        raise AssertionError("template loaded while rendering")
+
+    builder.env.loader.get_source = no_loading
+    for fmt in ("markdown", "html"):
+        assert "10.0.0.2" in builder.render(_report(builder), fmt)
+
+
+def test_refresh_re_renders_only_the_changed_section():
+    builder = ReportBuilder()
+    report = _report(builder)
+    first = builder.render(report, "html")
+    rendered, hits = builder.rendered_sections, builder.fragments.hits
+    assert rendered == 4
+
+    report["timeline"] = report["timeline"] + [{"timestamp": BASE + 99, "type": "http"}]
+    report["timeline_total"] += 1
+    refreshed = builder.render(report, "html")
+
+    assert builder.rendered_sections == rendered + 1
+    assert builder.fragments.hits == hits + 3
+    assert refreshed != first and "http" in refreshed
+    # The unchanged sections are the very fragments rendered the first time
+    assert builder.render(report, "html") == refreshed
+    assert builder.rendered_sections == rendered + 1
@@ -0,0 +1,85 @@
+"""
+Tests for the parallel agent scheduler
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from agents.base_agent import BaseAgent
+from core.scheduler import AgentScheduler
+
+
+class SleepingAgent(BaseAgent):
+    """Synthetic agent that sleeps for a fixed time and records what it saw"""
+
+    def __init__(self, name, seconds, depends_on=(), max_concurrency=4):
+        super().__init__(name)
+        self.seconds = seconds
+        self.depends_on = tuple(depends_on)
+        self.max_concurrency = max_concurrency
+        self.running = 0
+        self.peak = 0
+
+    async def execute(self, context):
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        await asyncio.sleep(self.seconds)
+        self.running -= 1
+        return {"agent": self.name, "upstream": sorted(context["upstream"])}
+
+
+def _agents(*agents):
+    return {agent.name: agent for agent in agents}
+
+
+@pytest.mark.asyncio
+async def test_wall_time_tracks_critical_path():
+    # Two parallel roots feeding dependent agents; critical path a -> c is 0.4 s of 0.6 s
+    agents = _agents(
+        SleepingAgent("a", 0.2),
+        SleepingAgent("b", 0.1),
+        SleepingAgent("c", 0.2, depends_on=["a"]),
+        SleepingAgent("d", 0.1, depends_on=["a", "b"]),
+    )
+    sequential = sum(agent.seconds for agent in agents.values())
+
+    start = time.perf_counter()
+    results = await AgentScheduler().run(agents, {"investigation_id": "inv"})
+    elapsed = time.perf_counter() - start
+
+    assert 0.4 <= elapsed < 0.5
+    assert elapsed < sequential * 0.85
+    assert results["c"]["upstream"] == ["a"]
+    assert results["d"]["upstream"] == ["a", "b"]
+
+
+@pytest.mark.asyncio
+async def test_agent_type_limit_is_shared_across_investigations():
+    scheduler = AgentScheduler()
+    agent = SleepingAgent("slow", 0.05, max_concurrency=2)
+
+    await asyncio.gather(*(scheduler.run({"slow": agent}, {}) for _ in range(6)))
+
+    assert agent.peak == 2
+
+
+def test_plan_orders_dependencies_first():
+    agents = _agents(
+        SleepingAgent("report", 0, depends_on=["intel", "logs"]),
+        SleepingAgent("intel", 0),
+        SleepingAgent("logs", 0, depends_on=["intel"]),
+    )
+
+    assert AgentScheduler().plan(agents) == ["intel", "logs", "report"]
+
+
+def test_plan_rejects_cycles_and_unknown_dependencies():
+    with pytest.raises(ValueError, match="cycle"):
+        AgentScheduler().plan(_agents(
+            SleepingAgent("a", 0, depends_on=["b"]),
+            SleepingAgent("b", 0, depends_on=["a"]),
+        ))
+    with pytest.raises(ValueError, match="unregistered"):
+        AgentScheduler().plan(_agents(SleepingAgent("a", 0, depends_on=["missing"])))
@@ -0,0 +1,85 @@
+"""
+Tests for loading, installing and reloading settings snapshots
+"""
+
+import pickle
+import threading
+
+import pytest
+from pydantic import ValidationError
+
+import config.settings as settings_module
+from config.settings import configure, get_settings, reload_settings, settings
+
+
+@pytest.fixture(autouse=True)
+def snapshot(monkeypatch, tmp_path, test_settings):
+    """Start from the session snapshot, away from any .env, and restore it afterwards"""
+    monkeypatch.setattr(settings_module, "_current", test_settings)
+    monkeypatch.chdir(tmp_path)
+    return test_settings
+
+
+def test_settings_load_on_first_use(monkeypatch):
+    monkeypatch.setattr(settings_module, "_current", None)
+    monkeypatch.setenv("OLLAMA_MODEL", "from-env")
+
+    loaded = get_settings()
+
+    assert loaded.ollama_model == "from-env"
+    assert get_settings() is loaded
+    assert settings.ollama_model == "from-env"
+
+
+def test_configure_installs_a_snapshot(snapshot):
+    replacement = snapshot.model_copy(update={"ollama_model": "configured"})
+
+    configure(replacement)
+
+    assert get_settings() is replacement
+    assert settings.ollama_model == "configured"
+
+
+def test_reload_swaps_in_a_new_snapshot(monkeypatch, snapshot):
+    monkeypatch.setenv("REPORT_MAX_FINDINGS", "7")
+
+    reloaded = reload_settings()
+
+    assert reloaded is not snapshot
+    assert get_settings() is reloaded and settings.report_max_findings == 7
+
+
+def test_invalid_reload_keeps_the_current_snapshot(monkeypatch, snapshot):
+    monkeypatch.setenv("INTEL_RATE_LIMIT", "0")
+
+    with pytest.raises(ValidationError):
+        reload_settings()
+
+    assert get_settings() is snapshot
+
+
+def test_reload_from_a_handler_interrupting_the_first_load():
+    # A plain SIGHUP handler runs on the main thread, possibly while it holds the lock
+    def interrupted_load():
+        with settings_module._lock:
+            reload_settings()
+
+    thread = threading.Thread(target=interrupted_load, daemon=True)
+    thread.start()
+    thread.join(timeout=5)
+
+    assert not thread.is_alive(), "reload deadlocked on the settings lock"
+
+
+def test_snapshots_survive_pickling(snapshot):
+    # Built sections are cached on the instance and must travel with it
+    _ = snapshot.pools, snapshot.ttls, snapshot.concurrency
+
+    restored = pickle.loads(pickle.dumps(snapshot))
+
+    assert restored == snapshot
+    assert restored.pools == snapshot.pools
+    assert restored.ttls == snapshot.ttls
+    assert restored.concurrency == snapshot.concurrency
+    with pytest.raises(ValidationError):
+        restored.ollama_model = "changed"
@@ -0,0 +1,181 @@
+"""
+Tests for the alert work queue and worker pool
+"""
+
+import asyncio
+
+import pytest
+import redis.asyncio as aioredis
+from redis.exceptions import ConnectionError
+
+from core.work_queue import InMemoryWorkQueue, RedisStreamWorkQueue, WorkerPool
+from tests.fixtures import fake_redis
+
+pytestmark = pytest.mark.asyncio
+
+
+class RecordingOrchestrator:
+    """Orchestrator stand-in that records the queries it investigates"""
+
+    def __init__(self, fail_queries=()):
+        self.queries = []
+        self.fail_queries = set(fail_queries)
+
+    async def investigate(self, query, investigation_id=None):
+        self.queries.append(query)
+        if query in self.fail_queries:
+            raise RuntimeError(f"{query} failed")
+
+
+class FlakyQueue(InMemoryWorkQueue):
+    """In-memory queue whose get and ack fail a set number of times"""
+
+    def __init__(self, get_errors=0, ack_errors=0):
+        super().__init__(max_backlog=100, max_retries=0)
+        self.get_errors = get_errors
+        self.ack_errors = ack_errors
+
+    async def get(self, timeout=1.0):
+        if self.get_errors:
+            self.get_errors -= 1
+            raise ConnectionError("Redis went away")
+        return await super().get(timeout=0.01)
+
+    async def ack(self, job):
+        if self.ack_errors:
+            self.ack_errors -= 1
+            raise ConnectionError("Redis went away")
+        await super().ack(job)
+
+
+def _redis_queue(server, consumer, **kwargs):
+    client = aioredis.Redis(connection_pool=fake_redis.async_pool(server, decode_responses=True))
+    return RedisStreamWorkQueue(
+        stream="alerts", group="workers", consumer=consumer, client=client, **kwargs
+    )
+
+
+async def _drain(pool, until):
+    runner = asyncio.create_task(pool.run())
+    while not until():
+        if runner.done():
+            runner.result()
+        await asyncio.sleep(0.01)
+    pool.stop()
+    await asyncio.wait_for(runner, 5)
+
+
+async def test_worker_survives_queue_errors(monkeypatch):
+    monkeypatch.setattr("core.work_queue.MAX_QUEUE_BACKOFF", 0.01)
+    queue = FlakyQueue(get_errors=3, ack_errors=1)
+    orchestrator = RecordingOrchestrator()
+    pool = WorkerPool(orchestrator, queue, concurrency=1)
+    for query in ("first", "second"):
+        await queue.put({"query": query})
+
+    await _drain(pool, lambda: pool.processed == 2)
+
+    assert orchestrator.queries == ["first", "second"]
+
+
+async def test_failed_jobs_are_retried_then_dead_lettered():
+    queue = InMemoryWorkQueue(max_backlog=10, max_retries=2)
+    orchestrator = RecordingOrchestrator(fail_queries={"bad"})
+    pool = WorkerPool(orchestrator, queue, concurrency=2)
+    await queue.put({"query": "bad"})
+    await queue.put({"query": "good"})
+
+    await _drain(pool, lambda: queue.dead_letters and pool.processed == 1)
+
+    assert orchestrator.queries.count("bad") == 3
+    assert queue.dead_letters[0].attempts == 2
+
+
+async def test_abandoned_jobs_count_as_failed_attempts(redis_server):
+    crashed = [_redis_queue(redis_server, f"worker-{i}", max_retries=1, claim_idle_ms=1)
+               for i in range(3)]
+    await crashed[0].put({"query": "crashes its worker"})
+
+    # Each consumer takes the job and dies without acknowledging it
+    first = await crashed[0].get(timeout=0.01)
+    await asyncio.sleep(0.01)
+    second = await crashed[1].get(timeout=0.01)
+    await asyncio.sleep(0.01)
+    third = await crashed[2].get(timeout=0.01)
+
+    assert (first.attempts, second.attempts) == (0, 1)
+    assert third is None
+    client = crashed[0].client
+    assert await client.xlen("alerts") == 0
+    dead = await client.xrange("alerts:dead")
+    assert len(dead) == 1 and dead[0][1]["attempts"] == "2"
+
+
+async def test_running_jobs_are_not_reclaimed(redis_server):
+    running = _redis_queue(redis_server, "running", claim_idle_ms=50)
+    other = _redis_queue(redis_server, "other", claim_idle_ms=50)
+    await running.put({"query": "slow investigation"})
+    job = await running.get(timeout=0.01)
+
+    for _ in range(5):
+        await asyncio.sleep(0.02)
+        await running.touch(job)
+        assert await other.get(timeout=0.01) is None
+
+
+@pytest.mark.parametrize("payload", [{}, {"query": ""}, {"query": 42}])
+async def test_malformed_payloads_are_refused_at_enqueue(redis_server, payload):
+    for queue in (InMemoryWorkQueue(max_backlog=10), _redis_queue(redis_server, "producer")):
+        with pytest.raises(ValueError):
+            await queue.put(payload)
+
+
+async def test_malformed_jobs_are_dead_lettered_without_retries(redis_server):
+    queue = _redis_queue(redis_server, "worker", max_retries=3)
+    await queue._ensure_group()
+    # Written by something that bypassed put(), e.g. an older producer
+    await queue.client.xadd("alerts", {"payload": '{"alert": "no query"}', "attempts": 0})
+    orchestrator = RecordingOrchestrator()
+    pool = WorkerPool(orchestrator, queue, concurrency=1)
+
+    await _drain(pool, lambda: pool.failed == 1)
+
+    dead = await queue.client.xrange("alerts:dead")
+    assert orchestrator.queries == []
+    assert len(dead) == 1 and "query" in dead[0][1]["error"]
+    assert await queue.client.xlen("alerts") == 0
+
+
+async def test_concurrent_producers_do_not_overshoot_the_backlog(redis_server):
+    producers = [_redis_queue(redis_server, f"producer-{i}", max_backlog=5) for i in range(4)]
+    puts = [
+        asyncio.create_task(producer.put({"query": f"alert {i}"}))
+        for i, producer in enumerate(producers * 5)
+    ]
+
+    done, waiting = await asyncio.wait(puts, timeout=0.3)
+    for task in waiting:
+        task.cancel()
+
+    assert len(done) == 5
+    assert await producers[0].client.xlen("alerts") == 5
+
+
+async def test_stale_jobs_are_reclaimed_on_an_interval(redis_server):
+    queue = _redis_queue(redis_server, "worker", claim_idle_ms=200)
+    sweeps = 0
+    xautoclaim = queue.client.xautoclaim
+
+    async def counting_xautoclaim(*args, **kwargs):
+        nonlocal sweeps
+        sweeps += 1
+        return await xautoclaim(*args, **kwargs)
+
+    queue.client.xautoclaim = counting_xautoclaim
+    for _ in range(10):
+        await queue.get(timeout=0.001)
+    assert sweeps == 1
+
+    await asyncio.sleep(queue.reclaim_interval)
+    await queue.get(timeout=0.001)
+    assert sweeps == 2
@@ -0,0 +1,97 @@
+"""
+Bounded in-process LRU cache with TTL expiry
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class LRUTTLCache:
+    """
+    Least-recently-used cache whose entries also expire after a TTL
+
+    ``on_remove`` is called with the key and value of every entry the cache
+    drops by itself, through eviction or expiry, but not for ``pop`` or
+    ``clear``. Not thread-safe; intended for use from a single event loop.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 1024,
+        ttl: float = 30.0,
+        on_remove: Optional[Callable[[Hashable, Any], None]] = None,
+    ):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.on_remove = on_remove
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        entry = self._data.get(key)
+        return entry is not None and entry[0] > time.monotonic()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return a live entry and mark it most recently used"""
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            self.expirations += 1
+            self.misses += 1
+            if self.on_remove is not None:
+                self.on_remove(key, value)
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """Insert or replace an entry, evicting the least recently used if full"""
+        self._data[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            evicted, (_, old) = self._data.popitem(last=False)
+            self.evictions += 1
+            if self.on_remove is not None:
+                self.on_remove(evicted, old)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove an entry, returning its value if present"""
+        entry = self._data.pop(key, None)
+        return default if entry is None else entry[1]
+
+    def purge_expired(self) -> int:
+        """Drop every expired entry now rather than when it is next read"""
+        now = time.monotonic()
+        expired = [key for key, (expires_at, _) in self._data.items() if expires_at <= now]
+        for key in expired:
+            _, value = self._data.pop(key)
+            self.expirations += 1
+            if self.on_remove is not None:
+                self.on_remove(key, value)
+        return len(expired)
+
+    def clear(self):
+        """Drop every entry, keeping the counters"""
+        self._data.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss/eviction counters"""
+        return {
+            "size": len(self._data),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }